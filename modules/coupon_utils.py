@@ -3,7 +3,7 @@
 쿠폰 파싱, 시간 계산 등의 공통 로직을 제공합니다.
 """
 import re
-from typing import Optional
+from typing import Mapping, Optional
 
 
 def parse_coupon_name(content: str) -> Optional[str]:
@@ -45,6 +45,22 @@ def extract_minutes_from_coupon(coupon_name: str) -> int:
     return int(match.group(1)) if match else 0
 
 
+def total_minutes(counts: Mapping[str, int]) -> int:
+    """쿠폰명별 장수의 총 시간(분)
+    
+    Args:
+        counts: {쿠폰명: 장수} (dict 또는 쿠폰명 인덱스의 Series)
+    
+    Returns:
+        각 쿠폰명의 분 x 장수 합계
+        
+    Examples:
+        >>> total_minutes({"게임쿠폰 20분": 3, "보너스쿠폰": 1})
+        60
+    """
+    return sum(extract_minutes_from_coupon(str(name)) * int(qty) for name, qty in counts.items())
+
+
 def format_minutes(total_minutes: int) -> str:
     """분을 읽기 쉬운 형식으로 변환
     
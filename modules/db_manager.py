@@ -1,127 +1,452 @@
 import streamlit as st
-from streamlit_gsheets import GSheetsConnection
 import pandas as pd
+from contextlib import contextmanager
 from datetime import datetime
+import threading
 import time
-import random
+import uuid
 import modules.time_utils as time_utils
+import modules.wallet as wallet
+from modules.storage import (create_backend, diff_frames, WorksheetCache, SnapshotStore, get_storage_config,
+                             InstrumentedBackend, metrics_registry)
+from modules.storage import partition
+from modules.storage.base import cell_str
+from modules.storage.snapshot import DEFAULT_SNAPSHOT_DIR
+
+class _WriteBatch:
+    """Mutations collected by DataManager.batch(), flushed per worksheet when it exits."""
+
+    def __init__(self, background=False):
+        self.background = background
+        self.frames = {}      # worksheet -> working frame, seen by reads inside the batch
+        self.rewrites = set() # worksheets changed by update_data (flushed as one delta/rewrite)
+        self.appends = {}     # worksheet -> DataFrames appended since the last rewrite
+        self.order = []       # worksheets in the order they were first touched
+        self.ok = True        # False if any flush failed (unknown until a background flush ends)
+
+    def touch(self, worksheet_name):
+        if worksheet_name not in self.order:
+            self.order.append(worksheet_name)
+
 
 class DataManager:
-    def __init__(self):
-        # Establish connection using st-gsheets-connection
-        # This looks for [connections.gsheets] in secrets.toml
-        self.use_fallback = False
-        self.client = None
-        self.spreadsheet_url = None
+    # Primary key column of each worksheet; used to diff writes row by row.
+    # Monthly shards (e.g. Logs_202609) use the key of their worksheet.
+    WORKSHEET_KEYS = partition.PartitionedKeys({
+        "Missions": "mission_id",
+        "MissionDefinitions": "def_id",
+        "Praise": "praise_id",
+        "Calendar": "event_id",
+        "WeeklySchedule": "schedule_id",
+        "Reading": "reading_id",
+        "Users": "username",
+        "Balances": "User",
+        "Logs": "log_id",
+        partition.PARTITION_SHEET: "sheet",
+    })
+
+    def __init__(self, backend=None, snapshots=None):
+        """
+        Args:
+            backend: StorageBackend to use (default: chosen by [storage] in secrets.toml,
+                Google Sheets unless configured otherwise).
+            snapshots: SnapshotStore persisting cached frames across restarts. Defaults to
+                [storage] snapshot_dir for the configured backend; none for an injected one.
+        """
+        if backend is None:
+            backend = create_backend(key_columns=self.WORKSHEET_KEYS)
+            if snapshots is None:
+                snapshot_dir = get_storage_config().get("snapshot_dir", DEFAULT_SNAPSHOT_DIR)
+                snapshots = SnapshotStore(snapshot_dir) if snapshot_dir else None
+        # Every backend call is timed and counted in the process-wide metrics registry
+        self.metrics = metrics_registry
+        self.backend = InstrumentedBackend(backend, self.metrics)
         
+        # Last frame read from / written to each worksheet (process-wide, keyed per
+        # spreadsheet). Writes install their result here instead of clearing every cache.
+        self.cache = WorksheetCache(store=snapshots)
+
+        # Frames restored from disk are served right away but count as unverified:
+        # the first read revalidates them in the background whatever their age.
+        self._unverified = set()
+        if snapshots is not None:
+            self._load_snapshots(snapshots)
+
+        # Stale-while-revalidate bookkeeping: worksheets with a background refresh
+        # in flight, and the last refresh error per worksheet (for freshness()).
+        self._refreshing = set()
+        self._refresh_errors = {}
+        self._refresh_lock = threading.Lock()
+
+        # Remote change marker of the frame we hold per worksheet, and when it was last
+        # actually downloaded. Revalidation skips the download while the marker is
+        # unchanged, but edits made by hand in the spreadsheet do not move the marker,
+        # so a full download still happens at least once per HARD_TTL.
+        self._revisions = {}
+        self._downloaded_at = {}
+
+        # Write-behind: the open batch of the current script thread, worksheets whose
+        # flush has not finished yet (kept out of background refreshes), and a lock
+        # that keeps flushes in order.
+        self._local = threading.local()
+        self._pending = set()
+        self._flush_lock = threading.Lock()
+        self._flush_threads = []
+
+        # {id: row position} per worksheet, tagged with the cache version it was built from
+        self._id_maps = {}
+        # Serializes the id check + append of insert_missing within this process
+        self._insert_lock = threading.Lock()
+
+    def _load_snapshots(self, snapshots):
+        namespace = self.backend.namespace
         try:
-            self.conn = st.connection("gsheets", type=GSheetsConnection)
-        except Exception as e:
-            print(f"Streamlit Connection unavailable, trying fallback: {e}")
-            self.setup_fallback()
-            
-    def setup_fallback(self):
-        try:
-            import gspread
-            from google.oauth2.service_account import Credentials
-            import toml
-            
-            self.use_fallback = True
-            
-            # Load secrets
-            secrets_path = ".streamlit/secrets.toml"
-            with open(secrets_path, "r", encoding="utf-8") as f:
-                config = toml.load(f)
-            
-            gs_config = config.get("connections", {}).get("gsheets", {})
-            self.spreadsheet_url = gs_config.get("spreadsheet")
-            
-            if "project_id" in gs_config:
-                 creds = Credentials.from_service_account_info(
-                     gs_config, 
-                     scopes=["https://www.googleapis.com/auth/spreadsheets"]
-                 )
-            else:
-                 pass
-                 
-            self.client = gspread.authorize(creds)
-            print("✅ Fallback (gspread) connected.")
-            
+            restored = snapshots.load_all(namespace)
         except Exception as e:
-            print(f"❌ Fallback Setup Failed: {e}")
-            self.conn = None
+            print(f"Snapshot Load Error: {e}")
+            return
+        for name, (df, loaded_at) in restored.items():
+            self.cache.put(namespace, name, df, loaded_at=loaded_at)
+            self._unverified.add(name)
+
+    def _cached(self, worksheet_name, ttl=None):
+        return self.cache.get(self.backend.namespace, worksheet_name, ttl)
 
-    def _retry_operation(self, operation, max_retries=3, delay=2):
+    def _snapshot(self, worksheet_name):
+        """Last known frame of a worksheet regardless of age (base for diffs/appends)."""
+        entry = self.cache.entry(self.backend.namespace, worksheet_name)
+        return entry[0] if entry is not None else None
+
+    def _remember_frame(self, worksheet_name, df):
+        self.cache.put(self.backend.namespace, worksheet_name, df)
+
+    def quota_status(self):
+        """Remaining per-minute API budget of the backend, or None if it has no quota."""
+        return self.backend.quota_status()
+
+    def invalidate(self, worksheet_name=None):
+        """Drop the cached frame of one worksheet (or all of them) so the next read refetches."""
+        self.cache.invalidate(self.backend.namespace, worksheet_name)
+        if worksheet_name is None:
+            self._unverified.clear()
+        else:
+            self._unverified.discard(worksheet_name)
+
+    # Frames older than the soft TTL are still served, but refreshed in the background;
+    # past the hard TTL the read blocks on the backend again.
+    HARD_TTL = 3600
+
+    def get_data(self, worksheet_name, ttl=300, hard_ttl=None):
         """
-        Retries an operation if it hits a quota error.
+        Read a worksheet, serving the cached frame when possible.
+        
+        Args:
+            ttl: Soft TTL in seconds. A cached frame younger than this is returned as is;
+                an older one (up to hard_ttl) is returned immediately while a background
+                thread refetches it. ttl=0 forces a synchronous read.
+            hard_ttl: Maximum age of a frame that may be served (default HARD_TTL).
         """
-        last_exception = None
-        for i in range(max_retries):
-            try:
-                return operation()
-            except Exception as e:
-                error_str = str(e)
-                if "Quota exceeded" in error_str or "429" in error_str:
-                    wait_time = delay * (2 ** i) + random.uniform(0, 1)
-                    print(f"⚠️ Quota hit. Retrying in {wait_time:.1f}s... (Attempt {i+1}/{max_retries})")
-                    time.sleep(wait_time)
-                    last_exception = e
+        pending = self._batch_frame(worksheet_name)
+        if pending is not None:
+            return pending
+
+        if ttl:
+            unverified = worksheet_name in self._unverified
+            if unverified:
+                hard_ttl = None
+            else:
+                hard_ttl = self.HARD_TTL if hard_ttl is None else max(hard_ttl, ttl)
+            cached = self._cached(worksheet_name, hard_ttl)
+            if cached is not None:
+                info = self.cache.freshness(self.backend.namespace, worksheet_name)
+                if unverified or (info and info["age"] > ttl):
+                    self.metrics.record_cache(worksheet_name, "stale")
+                    self._refresh_async([worksheet_name])
                 else:
-                    raise e
-        print("❌ Max retries reached.")
-        if last_exception:
-            raise last_exception
-        return None
+                    self.metrics.record_cache(worksheet_name, "hit")
+                return cached
 
-    # @st.cache_data(ttl=300) # Increased TTL for static fetch
-    # def _fetch_data_static(self_dummy, worksheet_name):
-    #    pass
+        self.metrics.record_cache(worksheet_name, "miss")
 
-    # Standalone cached function for performance
-    @staticmethod
-    @st.cache_data(ttl=300)
-    def _cached_read_gsheets(worksheet_name):
         try:
-            conn = st.connection("gsheets", type=GSheetsConnection)
-            # Use ttl=0 to bypass connection-level cache since we manage caching via @st.cache_data wrapper
-            return conn.read(worksheet=worksheet_name, ttl=0)
+            df = self.backend.read(worksheet_name)
         except Exception as e:
-            raise e
-
-    def get_data(self, worksheet_name, ttl=300):
-        def _read():
-            if not self.use_fallback:
-                try:
-                    # Attempt cached read first
-                    return self._cached_read_gsheets(worksheet_name)
-                except Exception as e:
-                    print(f"Cached GSheets read failed: {e}. Switching to fallback.")
-                    self.setup_fallback()
-                    if not self.use_fallback: raise e
-                    
-            if self.use_fallback and self.client:
-                return self._cached_fallback_read(worksheet_name)
+            print(f"Final Read Error ({worksheet_name}): {e}")
             return pd.DataFrame()
 
+        if df is None:
+            df = pd.DataFrame()
+        # Empty (or not yet created) worksheets are cached too, so they cost no call per render
+        self._remember_frame(worksheet_name, df)
+        self._unverified.discard(worksheet_name)
+        self._revisions.pop(worksheet_name, None)
+        self._downloaded_at[worksheet_name] = time.time()
+        return df
+
+    def _revalidate(self, worksheet_names, versions=None):
+        """
+        Bring cached worksheets up to date, downloading only those whose remote
+        change marker moved (or that have no usable marker).
+        
+        Args:
+            worksheet_names: Worksheets to check.
+            versions: Cache versions seen before the check; a frame is only installed
+                if no write replaced the entry meanwhile.
+        
+        Returns:
+            dict of worksheet name -> freshly downloaded DataFrame
+        """
+        namespace = self.backend.namespace
+        # A frame whose write is still being flushed is newer than the remote copy
+        worksheet_names = [name for name in worksheet_names if name not in self._pending]
+        if not worksheet_names:
+            return {}
         try:
-            return self._retry_operation(_read)
+            markers = self.backend.revisions(worksheet_names)
         except Exception as e:
-            print(f"Final Read Error ({worksheet_name}): {e}")
-            return pd.DataFrame()
+            print(f"Revision Check Error: {e}")
+            markers = {}
 
-    @st.cache_data(ttl=300)
-    def _cached_fallback_read(_self, worksheet_name):
-        # Explicit caching for fallback client
-        if _self.client:
+        now = time.time()
+        unchanged = [
+            name for name in worksheet_names
+            if markers.get(name)
+            and markers[name] == self._revisions.get(name)
+            and now - self._downloaded_at.get(name, 0) < self.HARD_TTL
+        ]
+        for name in unchanged:
+            if self.cache.touch(namespace, name):
+                self._unverified.discard(name)
+
+        download = [name for name in worksheet_names if name not in unchanged]
+        frames = self.backend.read_many(download) if download else {}
+        for name, df in frames.items():
+            if df is None:
+                df = pd.DataFrame()
+            if_version = versions.get(name) if versions else None
+            if self.cache.put(namespace, name, df, if_version=if_version):
+                self._unverified.discard(name)
+                self._downloaded_at[name] = now
+                if markers.get(name):
+                    self._revisions[name] = markers[name]
+                else:
+                    self._revisions.pop(name, None)
+        return frames
+
+    def _note_write(self, worksheet_name):
+        """Adopt the change marker our own write left, so it does not trigger a re-download."""
+        marker = self.backend.last_written_revision(worksheet_name)
+        if marker:
+            self._revisions[worksheet_name] = marker
+        else:
+            self._revisions.pop(worksheet_name, None)
+
+    def _refresh_async(self, worksheet_names):
+        """Refetch stale worksheets on a daemon thread (one in flight per worksheet)."""
+        with self._refresh_lock:
+            names = [n for n in worksheet_names if n not in self._refreshing]
+            self._refreshing.update(names)
+        if not names:
+            return
+        namespace = self.backend.namespace
+        versions = {n: self.cache.version(namespace, n) for n in names}
+
+        def _run():
             try:
-                sh = _self.client.open_by_url(_self.spreadsheet_url)
-                ws = sh.worksheet(worksheet_name)
-                data = ws.get_all_records()
-                return pd.DataFrame(data)
+                # Skips frames a write replaced while we were reading
+                self._revalidate(names, versions=versions)
+                for name in names:
+                    self._refresh_errors.pop(name, None)
             except Exception as e:
-                print(f"Fallback read error: {e}")
+                print(f"Background Refresh Error ({', '.join(names)}): {e}")
+                for name in names:
+                    self._refresh_errors[name] = str(e)
+            finally:
+                with self._refresh_lock:
+                    self._refreshing.difference_update(names)
+
+        threading.Thread(target=_run, name="db-refresh", daemon=True).start()
+
+    def freshness(self, worksheet_name=None):
+        """
+        Cache freshness per worksheet: {name: {"loaded_at", "age", "version",
+        "verified", "refreshing", "error"}}. verified is False for frames restored
+        from a disk snapshot that have not been re-read yet. Only cached worksheets
+        are listed.
+        """
+        namespace = self.backend.namespace
+        names = [worksheet_name] if worksheet_name else self.cache.names(namespace)
+        result = {}
+        for name in names:
+            info = self.cache.freshness(namespace, name)
+            if info is None:
+                continue
+            info["verified"] = name not in self._unverified
+            info["refreshing"] = name in self._refreshing
+            info["error"] = self._refresh_errors.get(name)
+            result[name] = info
+        return result
+
+    def prefetch(self, worksheet_names, ttl=300):
+        """
+        Load every worksheet a page needs in one backend round trip.
+        Worksheets that are already cached and fresh are skipped; stale ones are
+        revalidated in the background; the rest are fetched together (values.batchGet
+        on Google Sheets) and cached, so the page's later get_data calls are
+        served from memory.
+        """
+        ages = {}
+        for name in dict.fromkeys(worksheet_names):
+            info = self.cache.freshness(self.backend.namespace, name)
+            ages[name] = info["age"] if info else None
+        missing = [name for name, age in ages.items()
+                   if age is None or (age > self.HARD_TTL and name not in self._unverified)]
+        stale = [name for name, age in ages.items()
+                 if name not in missing and (age > ttl or name in self._unverified)]
+        for name in ages:
+            outcome = "miss" if name in missing else "stale" if name in stale else "hit"
+            self.metrics.record_cache(name, outcome)
+        if stale:
+            self._refresh_async(stale)
+        if not missing:
+            return
+        try:
+            self._revalidate(missing)
+        except Exception as e:
+            print(f"Prefetch Error ({', '.join(missing)}): {e}")
+
+    def _select(self, worksheet_name, **filters):
+        """
+        Rows matching column == value filters (list values mean IN).
+        Local backends answer from their indexes; remote ones filter the cached frame.
+        """
+        filters = {k: v for k, v in filters.items() if v is not None}
+        if self.backend.name == "sqlite" and self._batch_frame(worksheet_name) is None:
+            try:
+                return self.backend.read_where(worksheet_name, filters)
+            except Exception as e:
+                print(f"Final Read Error ({worksheet_name}): {e}")
                 return pd.DataFrame()
-        return pd.DataFrame()
+
+        df = self.get_data(worksheet_name)
+        for col, value in filters.items():
+            if df.empty or col not in df.columns:
+                continue
+            if isinstance(value, (list, tuple, set)):
+                df = df[df[col].isin(list(value))]
+            else:
+                df = df[df[col] == value]
+        return df
+
+    # --- Id lookups ---
+    @staticmethod
+    def _positions(df, key):
+        """{id: position of its first row} (a later row with the same id is a duplicate)"""
+        if df.empty or key not in df.columns:
+            return {}
+        positions = {}
+        for i, k in enumerate(df[key].map(cell_str)):
+            if k and k not in positions:
+                positions[k] = i
+        return positions
+
+    @staticmethod
+    def _unique_ids(df, key):
+        """
+        df without the later rows of a repeated id. Two processes racing through
+        insert_missing can both append the same deterministic id; readers see it once.
+        """
+        if df.empty or key not in df.columns:
+            return df
+        ids = df[key].map(cell_str)
+        return df[(ids == "") | ~ids.duplicated()]
+
+    def _indexed(self, worksheet_name):
+        """
+        (frame, {id: row position}) of a worksheet. The map is kept per cache version,
+        so lookups stay O(1) per id until the worksheet is written or refreshed.
+        """
+        key = self.WORKSHEET_KEYS.get(worksheet_name)
+        pending = self._batch_frame(worksheet_name)
+        if pending is not None:
+            return pending, self._positions(pending, key)
+
+        namespace = self.backend.namespace
+        version = self.cache.version(namespace, worksheet_name)
+        df = self.get_data(worksheet_name)
+        unchanged = self.cache.version(namespace, worksheet_name) == version
+        cached = self._id_maps.get(worksheet_name)
+        if unchanged and cached is not None and cached[0] == version:
+            return df, cached[1]
+        positions = self._positions(df, key)
+        if unchanged:
+            self._id_maps[worksheet_name] = (version, positions)
+        return df, positions
+
+    def get_rows_by_id(self, worksheet_name, ids):
+        """Rows with the given ids, indexed by id (unknown ids are skipped)."""
+        df, positions = self._indexed(worksheet_name)
+        ids = [cell_str(i) for i in ids]
+        found = [i for i in ids if i in positions]
+        rows = df.iloc[[positions[i] for i in found]]
+        return rows.set_axis(pd.Index(found, name=self.WORKSHEET_KEYS.get(worksheet_name)), axis=0)
+
+    def update_by_id(self, worksheet_name, changes):
+        """
+        Set cells of rows addressed by their id, written as one update.
+        Args:
+            changes: {id: {column: new value}}
+        Returns:
+            bool: True if saved; False if none of the ids exist (or the write failed)
+        """
+        df, positions = self._indexed(worksheet_name)
+        hits = {positions[cell_str(i)]: values for i, values in changes.items() if cell_str(i) in positions}
+        if not hits:
+            return False
+        for col in dict.fromkeys(c for values in hits.values() for c in values):
+            rows = [pos for pos, values in hits.items() if col in values]
+            df[col] = df[col].astype(object) if col in df.columns else ""
+            df.iloc[rows, df.columns.get_loc(col)] = [hits[pos][col] for pos in rows]
+        return self.update_data(worksheet_name, df)
+
+    def insert_missing(self, worksheet_name, rows):
+        """
+        Append the rows whose id is not in the worksheet yet (insert-if-absent upsert).
+        With deterministic ids this makes repeated inserts idempotent: rows that already
+        exist are left as they are (their edited status is kept). The id column is checked
+        against the remote change marker first, so rows another process (app, scheduler
+        thread, cron) appended meanwhile are seen; two appends racing inside that window
+        can still double an id, which readers drop (_unique_ids).
+        Args:
+            rows: list of dicts (or DataFrame) carrying the worksheet's id column
+        Returns:
+            int: number of rows appended (0 if all existed), or -1 if the append failed
+        """
+        new_df = rows if isinstance(rows, pd.DataFrame) else pd.DataFrame(list(rows))
+        if new_df.empty:
+            return 0
+        key = self.WORKSHEET_KEYS.get(worksheet_name)
+        with self._insert_lock:
+            if self._batch_frame(worksheet_name) is None:
+                self._revalidate([worksheet_name])
+            _, positions = self._indexed(worksheet_name)
+            ids = new_df[key].map(cell_str)
+            new_df = new_df[~ids.isin(positions.keys()) & ~ids.duplicated()]
+            if new_df.empty:
+                return 0
+            return len(new_df) if self.append_rows(worksheet_name, new_df) else -1
+
+    def delete_by_id(self, worksheet_name, ids):
+        """
+        Remove rows by id, written as one update.
+        Returns:
+            bool: True if saved; False if none of the ids exist (or the write failed)
+        """
+        df, positions = self._indexed(worksheet_name)
+        drop = [positions[cell_str(i)] for i in ids if cell_str(i) in positions]
+        if not drop:
+            return False
+        return self.update_data(worksheet_name, df.drop(index=df.index[drop]))
 
     def _preprocess_dates_for_save(self, df):
         """
@@ -156,113 +481,644 @@ class DataManager:
         return df_copy
 
     def update_data(self, worksheet_name, df):
-        def _update():
-            # Preprocess dates to ensure consistent format before saving
-            df_to_save = self._preprocess_dates_for_save(df)
-            
-            if not self.use_fallback:
-                try:
-                    if self.conn:
-                        self.conn.clear(worksheet=worksheet_name) # Clear first to avoid zombies
-                        self.conn.update(worksheet=worksheet_name, data=df_to_save)
-                        st.cache_data.clear() # Clear ALL cache to ensure fresh data on next load
-                        return True
-                except Exception as e:
-                    print(f"st.connection update failed: {e}. Switching to fallback.")
-                    self.setup_fallback()
-                    if not self.use_fallback: raise e
+        # Preprocess dates to ensure consistent format before saving
+        df_to_save = self._preprocess_dates_for_save(df)
 
-            if self.use_fallback and self.client:
-                sh = self.client.open_by_url(self.spreadsheet_url)
-                try:
-                    ws = sh.worksheet(worksheet_name)
-                except:
-                    # Worksheet might not exist, try creating it
-                    try:
-                        ws = sh.add_worksheet(title=worksheet_name, rows=1000, cols=20)
-                        print(f"Created new worksheet: {worksheet_name}")
-                    except Exception as create_err:
-                        print(f"Failed to create worksheet {worksheet_name}: {create_err}")
-                        raise create_err
-
-                ws.clear()
-                update_values = [df_to_save.columns.values.tolist()] + df_to_save.astype(str).values.tolist()
-                ws.update(update_values)
-                st.cache_data.clear() # Clear cache on fallback update too
+        batch = self._current_batch()
+        if batch is not None:
+            # Supersedes earlier changes to this worksheet in the batch, like a rewrite would
+            batch.touch(worksheet_name)
+            batch.frames[worksheet_name] = df_to_save
+            batch.rewrites.add(worksheet_name)
+            batch.appends[worksheet_name] = []
+            return True
+
+        return self._write_frame(worksheet_name, df_to_save, self._snapshot(worksheet_name))
+
+    def _write_frame(self, worksheet_name, df_to_save, snapshot):
+        """Store a whole frame, sending only its difference from snapshot when possible."""
+        # Delta path: only changed cells / inserted / deleted rows travel
+        key = self.WORKSHEET_KEYS.get(worksheet_name)
+        delta = diff_frames(snapshot, df_to_save, key) if key and snapshot is not None else None
+        if delta is not None:
+            if not (delta.changed_cells or delta.deleted_rows or delta.inserted):
                 return True
-            return False
-            
+            try:
+                matched = self.backend.apply_delta(worksheet_name, delta)
+                if matched is False:
+                    # Another writer changed the worksheet too: refetch instead of caching our view
+                    self.invalidate(worksheet_name)
+                else:
+                    self._remember_frame(worksheet_name, delta.result)
+                self._note_write(worksheet_name)
+                return True
+            except Exception as e:
+                print(f"Delta update failed ({worksheet_name}): {e}. Rewriting whole sheet.")
+
         try:
-            return self._retry_operation(_update)
+            self.backend.write(worksheet_name, df_to_save)
         except Exception as e:
             print(f"Final Update Error ({worksheet_name}): {e}")
             return False
+        self._remember_frame(worksheet_name, df_to_save)
+        self._note_write(worksheet_name)
+        return True
+
+    def append_rows(self, worksheet_name, rows):
+        """
+        Append rows to the end of a worksheet without rewriting it.
+        Only the new rows travel to the backend, and the cached frame of the
+        worksheet is extended in place so the next read costs no API call.
+
+        Args:
+            worksheet_name: target worksheet (e.g. 'Logs')
+            rows: list of dicts or a DataFrame holding the new rows
+        Returns:
+            bool: True if the rows were appended (or queued in a batch)
+        """
+        new_df = rows if isinstance(rows, pd.DataFrame) else pd.DataFrame(list(rows))
+        if new_df.empty:
+            return True
+        new_df = self._preprocess_dates_for_save(new_df)
+
+        batch = self._current_batch()
+        if batch is not None:
+            batch.touch(worksheet_name)
+            batch.appends.setdefault(worksheet_name, []).append(new_df)
+            base = batch.frames.get(worksheet_name)
+            if base is None:
+                base = self._cached(worksheet_name)
+            if base is not None:
+                batch.frames[worksheet_name] = self._extended(base, new_df)
+            return True
+
+        snapshot = self._snapshot(worksheet_name)
+        header = list(snapshot.columns) if snapshot is not None else None
+        return self._append_frame(worksheet_name, new_df, header)
+
+    @staticmethod
+    def _extended(df, new_df, columns=None):
+        """df with new_df's rows appended (columns: target order, default union of both)."""
+        if columns is None:
+            columns = list(df.columns) + [c for c in new_df.columns if c not in df.columns]
+        return pd.concat([df.reindex(columns=columns), new_df.reindex(columns=columns)],
+                         ignore_index=True)
+
+    def _append_frame(self, worksheet_name, new_df, header, update_cache=True):
+        try:
+            sheet_header = self.backend.append(worksheet_name, new_df, header=header)
+        except Exception as e:
+            print(f"Final Append Error ({worksheet_name}): {e}")
+            return False
+
+        if update_cache:
+            self.cache.update(
+                self.backend.namespace, worksheet_name,
+                lambda cached: self._extended(cached, new_df, sheet_header)
+            )
+        self._note_write(worksheet_name)
+        return True
+
+    # --- Write-behind batches ---
+    def _current_batch(self):
+        return getattr(self._local, "batch", None)
+
+    def _batch_frame(self, worksheet_name):
+        """Working copy of a worksheet changed in the current thread's open batch, if any."""
+        batch = self._current_batch()
+        if batch is not None and worksheet_name in batch.frames:
+            return batch.frames[worksheet_name].copy()
+        return None
+
+    @contextmanager
+    def batch(self, background=False):
+        """
+        Collect writes and flush them as the fewest backend requests per worksheet.
+        
+        Inside the block update_data / append_rows (and the helpers built on them)
+        only record the change and return True; reads in the same thread already
+        see it. On exit each touched worksheet is written once: a single append for
+        append-only worksheets, otherwise one delta (or rewrite) of the final frame.
+        Writes made before an exception are still flushed, as they would have been
+        without a batch. Nested blocks join the outermost one.
+        
+        Args:
+            background: Flush on a daemon thread so the caller returns immediately.
+                The new frames are installed in the cache right away; a failed flush
+                drops them so the next read refetches.
+        
+        Yields:
+            _WriteBatch whose .ok tells whether the (foreground) flush succeeded.
+        """
+        current = self._current_batch()
+        if current is not None:
+            yield current
+            return
+
+        batch = _WriteBatch(background)
+        self._local.batch = batch
+        try:
+            yield batch
+        finally:
+            self._local.batch = None
+            if batch.order:
+                if background:
+                    bases = self._install_batch(batch)
+                    thread = threading.Thread(target=self._flush_batch, args=(batch, bases),
+                                              name="db-flush", daemon=True)
+                    self._flush_threads = [t for t in self._flush_threads if t.is_alive()] + [thread]
+                    thread.start()
+                else:
+                    self._flush_batch(batch)
+
+    def _install_batch(self, batch):
+        """Publish a batch's frames before a background flush; returns the pre-batch snapshots."""
+        namespace = self.backend.namespace
+        bases = {}
+        with self._refresh_lock:
+            self._pending.update(batch.order)
+        for name in batch.order:
+            bases[name] = self._snapshot(name)
+            if name in batch.rewrites:
+                self.cache.put(namespace, name, batch.frames[name])
+            else:
+                new_df = pd.concat(batch.appends[name], ignore_index=True)
+                self.cache.update(namespace, name, lambda cached: self._extended(cached, new_df))
+        return bases
+
+    def _flush_batch(self, batch, bases=None):
+        with self._flush_lock:
+            for name in batch.order:
+                base = bases[name] if bases is not None else self._snapshot(name)
+                try:
+                    if name in batch.rewrites:
+                        ok = self._write_frame(name, batch.frames[name], base)
+                    else:
+                        new_df = pd.concat(batch.appends[name], ignore_index=True)
+                        header = list(base.columns) if base is not None else None
+                        ok = self._append_frame(name, new_df, header, update_cache=bases is None)
+                except Exception as e:
+                    print(f"Batch Flush Error ({name}): {e}")
+                    ok = False
+                finally:
+                    with self._refresh_lock:
+                        self._pending.discard(name)
+                if not ok:
+                    batch.ok = False
+                    self.invalidate(name)
+
+    def flush_pending(self, timeout=None):
+        """Wait until background flushes started so far have finished (e.g. before exit)."""
+        for thread in list(self._flush_threads):
+            thread.join(timeout)
+        self._flush_threads = [t for t in self._flush_threads if t.is_alive()]
+
+    def append_row(self, worksheet_name, row):
+        return self.append_rows(worksheet_name, [row])
 
     def get_users(self):
         return self.get_data("Users")
 
-    def get_missions(self, assignee=None):
-        df = self.get_data("Missions")
-        if assignee and not df.empty and "assignee" in df.columns:
-            return df[df["assignee"] == assignee]
-        return df
+    def get_missions(self, assignee=None, date=None, date_range=None, status=None, include_archived=False):
+        """
+        Missions, read from the smallest store that can answer.
+        The Missions worksheet is the active set: the last partition.MISSION_HOT_DAYS days
+        plus every Pending mission; older resolved missions live in the monthly shards
+        (archive_missions). Queries the active set can answer (no date, dates inside the
+        hot window, or only Pending) read just that worksheet; without date/date_range the
+        frame is the one edits are written back to.
+        Args:
+            assignee: child id
+            date: a single day (YYYY-MM-DD)
+            date_range: (start, end), either side None for open-ended
+            status: a status or list of statuses
+            include_archived: without date/date_range, also read every monthly shard
+                (e.g. the full Approved/Rejected history of a child)
+        """
+        if date is not None:
+            date_range = (date, date)
+        elif date_range is None and include_archived:
+            date_range = (None, None)
+        statuses = [status] if isinstance(status, str) else status
+        filters = {"assignee": assignee or None, "status": statuses}
+
+        active = (
+            date_range is None
+            or (statuses is not None and set(statuses) <= set(partition.MISSION_HOT_STATUSES))
+            or (date_range[0] is not None
+                and str(pd.Timestamp(date_range[0]).date()) >= partition.hot_since(time_utils.get_today_str()))
+        )
+        if not active:
+            df = self._read_partitioned("Missions", date_range, **filters)
+        elif any(v is not None for v in filters.values()):
+            df = self._select("Missions", **filters)
+        else:
+            df = self.get_data("Missions")
+        if active and date_range:
+            df = partition.in_range(df, "date", *date_range)
+        return self._unique_ids(df, self.WORKSHEET_KEYS["Missions"])
     
-    def get_logs(self, user_id=None):
-        df = self.get_data("Logs")
-        if user_id and not df.empty and "User" in df.columns:
-            # Note: Logs usually store "Name" (e.g. "큰보물") vs "ID" ("son1").
-            # But 'user_id' passed here will technically be ID "son1".
-            # We need to map ID -> Name if Logs store Name.
-            # db_manager.log_activity uses 'user_name' arg. 
-            # In app.py, log_activity is called with target_child_name ("큰보물").
-            # So Logs store NAMES.
-            # Yet auth_utils.get_target_child_id() returns ID.
-            # This is a mismatch. 
-            # To fix this cleanly: get_logs should accept 'user_name' or we map ID->Name here?
-            # Better: Let the caller pass the correct thing? 
-            # Or: auth_utils provides ID. We should map back to Name here?
-            # Or: just change Logs to store ID? No, data migration is hard.
-            # Helper: We can't easily map ID->Name inside db_manager without auth_utils cyclic import.
-            # DECISION: For get_logs, we'll keep it simple: caller passes name if filtering by name.
-            # BUT implementation plan said "get_target_child_id" returns ID. 
-            # So pages will have ID. 
-            # I will let get_logs accept 'user_name_or_id' and filter by equality?
-            # Or I can just NOT filter here if logic is complex, but user ASKED to centralized.
-            # I'll stick to 'user_id' param name but document it expects what the DB has.
-            # Actually, `Wallet.py` filters by `target_child` (Name).
-            # So I should rename param to `user_name` for clarity or handle both.
-            # Let's use `user_name` for logs since that's what's stored.
-             return df[df["User"] == user_id]
-        return df
+    def get_logs(self, user_id=None, date_range=None):
+        """
+        Logs across all partitions, oldest month first (the full ledger).
+        Args:
+            user_id: value of the User column (Logs store the child's display name)
+            date_range: (start, end) dates, either side None for open-ended; only
+                the monthly shards overlapping the range are read
+        """
+        # Note: Logs store the child's name (e.g. "큰보물"), not the login id ("son1"),
+        # so callers pass the name they logged with.
+        return self._read_partitioned("Logs", date_range or (None, None), User=user_id)
+
+    # --- Monthly partitions ---
+    def get_partitions(self):
+        """Partitions manifest: one row per archived monthly shard."""
+        return self.get_data(partition.PARTITION_SHEET)
+
+    def _read_partitioned(self, base, date_range, **filters):
+        """Rows of a partitioned worksheet from the shards overlapping date_range plus the current partition."""
+        start, end = date_range
+        shards = partition.shards_for(self.get_partitions(), base, start, end)
+        filtered = any(v is not None for v in filters.values())
+        frames = [self._select(name, **filters) if filtered else self.get_data(name)
+                  for name in shards + [base]]
+        df = partition.concat(frames)
+        return partition.in_range(df, partition.PARTITIONED_SHEETS[base], start, end)
+
+    def archive_closed_months(self, base, keep_months=partition.DEFAULT_KEEP_MONTHS, today=None):
+        """
+        Move the rows of closed months out of a partitioned worksheet (Logs, Missions)
+        into its monthly shards, so the current partition only holds recent activity.
+        Pending missions stay in Missions whatever their month.
+        Args:
+            keep_months: months kept in the current partition, counting today's month
+            today: reference date (default: today in KST)
+        Returns:
+            list of shard names written
+        """
+        column = partition.PARTITIONED_SHEETS[base]
+        if base == "Logs":
+            self.ensure_log_ids()
+        current = self.get_data(base, ttl=0)
+        months = partition.closed_months(current, column, today or time_utils.get_today_str(), keep_months)
+        if not months:
+            return []
+        cold = partition.months_of(current[column]).isin(months)
+        if base == "Missions" and "status" in current.columns:
+            cold &= ~current["status"].isin(partition.MISSION_HOT_STATUSES)
+        return self._archive_rows(base, current, cold)
+
+    def archive_missions(self, hot_days=partition.MISSION_HOT_DAYS, today=None):
+        """
+        Shrink Missions to its active set: move missions older than hot_days days that
+        are no longer Pending into the monthly shards.
+        Returns:
+            list of shard names written
+        """
+        current = self.get_data("Missions", ttl=0)
+        cold = partition.cold_missions(current, today or time_utils.get_today_str(), hot_days)
+        if not cold.any():
+            return []
+        return self._archive_rows("Missions", current, cold)
+
+    def _archive_rows(self, base, current, cold):
+        """
+        Move the rows of current (the base worksheet's frame) flagged by cold into their
+        monthly shards. Each month is appended to its shard and recorded in Partitions
+        before its rows are removed from the worksheet; a month whose shard write fails
+        stays put.
+        """
+        month_of = partition.months_of(current[partition.PARTITIONED_SHEETS[base]])
+        cold = cold & (month_of != "")
+        manifest = self.get_partitions()
+        archived, entries = [], []
+        for month in sorted(set(month_of[cold])):
+            shard = partition.shard_name(base, month)
+            rows = current[cold & (month_of == month)]
+            if not self.append_rows(shard, rows.reset_index(drop=True)):
+                print(f"Archive Error ({shard}): shard write failed, rows kept in {base}")
+                continue
+            previous = manifest[manifest["sheet"] == shard] if "sheet" in manifest.columns else manifest
+            count = len(rows) + (int(float(previous.iloc[-1]["rows"])) if not previous.empty else 0)
+            entries.append(partition.manifest_row(base, month, count, time_utils.get_current_time_str()))
+            archived.append(month)
+        if not archived:
+            return []
+        if not self._upsert_rows(partition.PARTITION_SHEET, "sheet", entries):
+            print(f"Archive Error ({base}): Partitions not updated, rows kept in {base}")
+            return []
+        moved = cold & month_of.isin(archived)
+        if not self.update_data(base, current[~moved.values]):
+            print(f"Archive Error ({base}): {base} not trimmed; rows are now in both places")
+            return []
+        return [partition.shard_name(base, m) for m in archived]
     
     def get_settings(self):
         return self.get_data("Settings")
 
-    def log_activity(self, user_name, activity_type, content, reward=0):
-        logs_df = self.get_data("Logs") # Use get_data
-        new_log = {
+    def _new_log_row(self, user_name, activity_type, content, reward=0,
+                     item_kind=None, item_name=None, unit_price=None):
+        return {
+            "log_id": str(uuid.uuid4()),
             "Timestamp": time_utils.get_current_time_str(),
             "User": user_name,
             "Type": activity_type,
             "Content": content,
-            "Reward": reward
+            "Reward": reward,
+            # Structured reward columns; blanks are filled from Type/Content on write
+            "item_kind": item_kind or "",
+            "item_name": item_name or "",
+            "unit_price_at_grant": "" if unit_price is None else unit_price,
         }
-        if logs_df.empty:
-             updated_logs = pd.DataFrame([new_log])
-        else:
-             updated_logs = pd.concat([logs_df, pd.DataFrame([new_log])], ignore_index=True)
-             
-        self.update_data("Logs", updated_logs)
+
+    def log_activity(self, user_name, activity_type, content, reward=0,
+                     item_kind=None, item_name=None, unit_price=None):
+        return self.log_activities([{
+            "user_name": user_name, "activity_type": activity_type, "content": content, "reward": reward,
+            "item_kind": item_kind, "item_name": item_name, "unit_price": unit_price,
+        }])
+
+    def log_activities(self, entries):
+        """
+        Append several log rows in a single request, advancing the writers' Balances rows
+        in the same batch. Each row carries item_kind / item_name / unit_price_at_grant;
+        stamps are priced with the child's Settings at grant time.
+        Args:
+            entries: list of dicts with log_activity keyword arguments
+                     (user_name, activity_type, content, reward[, item_kind, item_name, unit_price])
+        """
+        if not entries:
+            return True
+        rows = pd.DataFrame([self._new_log_row(**e) for e in entries])
+        rows = wallet.annotate_logs(rows, self.get_stamp_resolver).to_dict("records")
+        with self.batch() as batch:
+            # Each Balances row only needs the logs from its last folded log on
+            before = {user: self._logs_so_far(user, self._balance_tail_start(user))
+                      for user in dict.fromkeys(r["User"] for r in rows)}
+            self.append_rows("Logs", rows)
+            self._advance_balances(before, rows)
+        return batch.ok
+
+    def _logs_so_far(self, user_name, start=None):
+        """A child's logs from the start date on (None: all), including rows already queued in the open batch."""
+        logs = self.get_logs(user_id=user_name, date_range=(start, None))
+        batch = self._current_batch()
+        if batch is None or self._batch_frame("Logs") is not None:
+            return logs  # the batch overlay (if any) already holds the queued rows
+        queued = [df[df["User"] == user_name] for df in batch.appends.get("Logs", []) if "User" in df.columns]
+        queued = [df for df in queued if not df.empty]
+        if not queued:
+            return logs
+        return self._extended(logs.reset_index(drop=True), pd.concat(queued, ignore_index=True))
 
     def update_logs(self, df):
-        return self.update_data("Logs", df)
+        """Rewrite Logs (ledger editors) and recompute every Balances row from it."""
+        with self.batch() as batch:
+            self.update_data("Logs", df)
+            self.rebuild_balances()
+        return batch.ok
+
+    # --- Keyed log edits ---
+    def ensure_log_ids(self):
+        """
+        Give log rows written before log_id existed an id.
+        Rewrites Logs once; afterwards every row has an id and this is a no-op.
+        """
+        logs = self.get_data("Logs")
+        if logs.empty:
+            return True
+        ids = logs["log_id"].map(cell_str) if "log_id" in logs.columns else pd.Series("", index=logs.index)
+        missing = (ids == "") | ids.duplicated()
+        if not missing.any():
+            return True
+        logs = logs.copy()
+        logs["log_id"] = ids.where(~missing, [str(uuid.uuid4()) for _ in range(int(missing.sum()))])
+        return self.update_data("Logs", logs)
+
+    def get_logs_for_edit(self, user_name, types):
+        """
+        A child's logs of the given Types for the history editors.
+        Returns:
+            (editable, archived): editable holds the current-partition rows with a log_id
+            (saved through save_log_edits); archived holds the rows of the monthly shards,
+            plus any current row still without an id, and is shown read-only.
+        """
+        types = list(types)
+
+        def of_types(df):
+            if df.empty or "Type" not in df.columns:
+                return pd.DataFrame(columns=["log_id", "Timestamp", "User", "Type", "Content", "Reward"])
+            return df[df["Type"].isin(types)]
+
+        current = of_types(self._select("Logs", User=user_name))
+        if "log_id" in current.columns:
+            keyed = current["log_id"].map(cell_str) != ""
+        else:
+            keyed = pd.Series(False, index=current.index)
+        shards = partition.shards_for(self.get_partitions(), "Logs")
+        archived = partition.concat([of_types(self._select(name, User=user_name)) for name in shards]
+                                    + [current[~keyed]])
+        return current[keyed], archived
+
+    def update_logs_by_id(self, changes):
+        """
+        Edit individual log rows.
+        Args:
+            changes: {log_id: {column: new value}}
+        Returns:
+            bool: True if the edit was saved (only the changed cells travel)
+        """
+        return self._edit_logs(changes=changes)
+
+    def delete_logs_by_id(self, log_ids):
+        """Delete log rows by id (only those rows are removed from the sheet)."""
+        return self._edit_logs(deletes=log_ids)
+
+    def _edit_logs(self, changes=None, deletes=None):
+        changes = {cell_str(k): v for k, v in (changes or {}).items()}
+        deletes = set(cell_str(k) for k in (deletes or []))
+        if not (changes or deletes):
+            return True
+        logs, positions = self._indexed("Logs")
+        if logs.empty or "log_id" not in logs.columns:
+            return True
+
+        affected = set()
+        reannotate = []
+        for log_id, values in changes.items():
+            i = positions.get(log_id)
+            if i is None:
+                continue
+            label = logs.index[i]
+            for col, value in values.items():
+                logs[col] = logs[col].astype(object) if col in logs.columns else ""
+                logs.at[label, col] = value
+            if {"Type", "Content"} & set(values) and not set(wallet.STRUCTURED_COLUMNS) & set(values):
+                # Renamed reward: derive its kind/name/price again from the new text
+                for col in wallet.STRUCTURED_COLUMNS:
+                    if col in logs.columns:
+                        logs.at[label, col] = ""
+                reannotate.append(label)
+            affected.add(logs.at[label, "User"])
+        if reannotate:
+            annotated = wallet.annotate_logs(logs.loc[reannotate], self.get_stamp_resolver)
+            for col in wallet.STRUCTURED_COLUMNS:
+                logs[col] = logs[col].astype(object) if col in logs.columns else ""
+                logs.loc[reannotate, col] = annotated[col]
+
+        gone = logs.index[[positions[i] for i in deletes if i in positions]]
+        affected.update(logs.loc[gone, "User"])
+        logs = logs.drop(index=gone)
+
+        with self.batch() as batch:
+            self.update_data("Logs", logs)
+            self.rebuild_balances(users=affected)
+        return batch.ok
+
+    def save_log_edits(self, original, edited, user_name, default_type):
+        """
+        Save a history editor (st.data_editor over the editable get_logs_for_edit rows) by log_id:
+        changed cells are updated, removed rows deleted and added rows appended,
+        all in one batch.
+        Args:
+            original: rows shown in the editor (must include log_id)
+            edited: the editor's result (log_id empty for added rows)
+            user_name: child the rows belong to
+            default_type: Type of added rows that do not set one
+        """
+        before = original.set_index(original["log_id"].map(cell_str))
+        columns = [c for c in edited.columns if c not in ("log_id", "Timestamp") and c in before.columns]
+
+        changes, kept, added = {}, set(), []
+        for row in edited.to_dict("records"):
+            log_id = cell_str(row.get("log_id"))
+            if log_id in before.index:
+                kept.add(log_id)
+                diff = {c: row[c] for c in columns if cell_str(row[c]) != cell_str(before.at[log_id, c])}
+                if diff:
+                    changes[log_id] = diff
+            elif any(cell_str(row.get(c)) != "" for c in columns):
+                added.append({
+                    "user_name": user_name,
+                    "activity_type": cell_str(row.get("Type")) or default_type,
+                    "content": cell_str(row.get("Content")),
+                    "reward": row.get("Reward") if cell_str(row.get("Reward")) != "" else 0,
+                })
+        deletes = set(before.index) - kept
+
+        with self.batch() as batch:
+            self.ensure_log_ids()  # older rows without an id become editable from the next render
+            if changes or deletes:
+                self._edit_logs(changes=changes, deletes=deletes)
+            if added:
+                self.log_activities(added)
+        return batch.ok
+
+    def _upsert_rows(self, worksheet_name, key, rows):
+        """Replace the rows whose key matches, append the others (one row per key)."""
+        if not rows:
+            return True
+        df = self.get_data(worksheet_name)
+        new_df = pd.DataFrame(rows)
+        if df.empty or key not in df.columns or not df[key].isin(new_df[key]).any():
+            return self.append_rows(worksheet_name, new_df)
+        df = df.set_index(key, drop=False)
+        new_df = new_df.set_index(key, drop=False)
+        for col in new_df.columns:
+            if col not in df.columns:
+                df[col] = ""
+        existing = new_df.index.isin(df.index)
+        df.update(new_df[existing])
+        merged = self._extended(df.reset_index(drop=True), new_df[~existing].reset_index(drop=True))
+        return self.update_data(worksheet_name, merged)
+
+    def _child_id(self, user_name):
+        """Users.username of a display name (Logs store names, Settings.target_child ids)."""
+        users = self.get_users()
+        if users.empty or "name" not in users.columns or "username" not in users.columns:
+            return None
+        match = users[users["name"] == user_name]
+        return None if match.empty else match.iloc[0]["username"]
+
+    def get_stamp_resolver(self, user_name):
+        """Shared stamp price resolver for a child (Settings prices with its target_child overrides)."""
+        return wallet.get_resolver(self.get_settings(), self._child_id(user_name))
+
+    # --- Wallet Balance Methods ---
+    def get_balances(self):
+        return self.get_data("Balances")
+
+    def get_balance(self, user_name):
+        """Balances row (dict) of a child, or None."""
+        df = self.get_balances()
+        if df.empty or "User" not in df.columns:
+            return None
+        rows = df[df["User"] == user_name]
+        return None if rows.empty else rows.iloc[-1].to_dict()
+
+    def _balance_tail_start(self, user_name):
+        """First log date a child's Balances row needs to fold new logs in (None: all logs)."""
+        return wallet.checkpoint.tail_start(wallet.balances.from_row(self.get_balance(user_name)))
+
+    def _advance_balances(self, before, rows):
+        """
+        Fold freshly appended log rows into their writers' Balances rows.
+        Args:
+            before: child name -> its logs before rows (from _balance_tail_start on)
+            rows: the appended log rows, already queued in the open batch
+        """
+        try:
+            new_logs = pd.DataFrame(rows)
+            updated = []
+            for user, user_logs in new_logs.groupby("User", sort=False):
+                resolver = self.get_stamp_resolver(user)
+                row = wallet.balances.advance(
+                    user, self.get_balance(user), before[user], user_logs.reset_index(drop=True), resolver)
+                if row is None:
+                    # The row's last log is gone (edited/deleted): recompute from the whole ledger
+                    row = wallet.balances.rebuild(user, self._logs_so_far(user).reset_index(drop=True), resolver)
+                updated.append(row)
+            self._upsert_rows("Balances", "User", updated)
+        except Exception as e:
+            # Logs stay authoritative; verify_balances()/rebuild_balances() repair the table
+            print(f"Balance update error: {e}")
+
+    def rebuild_balances(self, users=None):
+        """
+        Recompute Balances rows from Logs.
+        Args:
+            users: child names to recompute (default: everyone, rewriting the whole table)
+        """
+        self.ensure_log_ids()  # rows are located by log_id when later logs are folded in
+        logs = self.get_logs()
+        if logs.empty or "User" not in logs.columns:
+            if users is None:
+                return True
+            logs = pd.DataFrame(columns=["User"])
+        names = logs["User"].astype(str)
+        if users is not None:
+            wanted = set(str(u) for u in users)
+            logs, names = logs[names.isin(wanted)], names[names.isin(wanted)]
+        rows = [
+            wallet.balances.rebuild(user, user_logs.reset_index(drop=True), self.get_stamp_resolver(user))
+            for user, user_logs in logs.groupby(names, sort=False)
+        ]
+        if users is not None:
+            # Users whose last log was deleted go back to an empty balance
+            rows += [wallet.balances.rebuild(user, logs.iloc[:0], self.get_stamp_resolver(user))
+                     for user in wanted - set(names)]
+            return self._upsert_rows("Balances", "User", rows)
+        return self.update_data("Balances", pd.DataFrame(rows, columns=wallet.balances.BALANCE_COLUMNS))
+
+    def verify_balances(self):
+        """Balances cells that disagree with a recomputation from Logs (empty frame: all good)."""
+        return wallet.balances.verify(self.get_balances(), self.get_logs(), self.get_stamp_resolver)
 
     # --- Calendar Methods ---
     def get_calendar(self):
         return self.get_data("Calendar")
 
     def add_calendar_event(self, date_str, title, member, event_type):
-        df = self.get_calendar()
         import uuid
         new_event = {
             "event_id": str(uuid.uuid4()),
@@ -271,34 +1127,15 @@ class DataManager:
             "member": member,
             "type": event_type
         }
-        if df.empty:
-            updated_df = pd.DataFrame([new_event])
-        else:
-            updated_df = pd.concat([df, pd.DataFrame([new_event])], ignore_index=True)
-        self.update_data("Calendar", updated_df)
+        return self.append_row("Calendar", new_event)
 
     def update_calendar_event(self, event_id, date_str, title, member, event_type):
-        df = self.get_calendar()
-        if df.empty: return
-        
-        # Convert ID to string for comparison safety
-        df["event_id"] = df["event_id"].astype(str)
-        
-        idx = df[df["event_id"] == str(event_id)].index
-        if not idx.empty:
-            df.at[idx[0], "date"] = date_str
-            df.at[idx[0], "title"] = title
-            df.at[idx[0], "member"] = member
-            df.at[idx[0], "type"] = event_type
-            self.update_data("Calendar", df)
+        return self.update_by_id("Calendar", {
+            event_id: {"date": date_str, "title": title, "member": member, "type": event_type}
+        })
 
     def delete_calendar_event(self, event_id):
-        df = self.get_calendar()
-        if df.empty: return
-        
-        df["event_id"] = df["event_id"].astype(str)
-        updated_df = df[df["event_id"] != str(event_id)]
-        self.update_data("Calendar", updated_df)
+        return self.delete_by_id("Calendar", [event_id])
 
     # --- Weekly Schedule Methods ---
     def get_weekly_schedule(self, assignee=None):
@@ -312,17 +1149,6 @@ class DataManager:
         return df
 
     def add_weekly_schedule(self, title, days, start_time, end_time, assignee="son1"):
-        df = self.get_weekly_schedule() # Get raw, or self.get_data to avoid cycle? Actually method above returns filtered copy, careful.
-        # We need raw data for update usually, but get_data returns copy.
-        # Wait, get_weekly_schedule returns dataframe. add_weekly_schedule calls get_weekly_schedule().
-        # If I filter inside get_weekly_schedule, then add_weekly_schedule might only see subset? 
-        # Actually it calls get_weekly_schedule() without args logic? 
-        # The add function appends to "df". If df is filtered, we lose other data when we concat and save?
-        # YES. MAJOR BUG RISK.
-        # FIX: add_* methods should call self.get_data directly or use a raw getter.
-        # Let's change add_* to use self.get_data("WeeklySchedule") directly to ensure full data.
-        
-        df = self.get_data("WeeklySchedule")
         import uuid
         new_schedule = {
             "schedule_id": str(uuid.uuid4()),
@@ -332,11 +1158,7 @@ class DataManager:
             "end_time": end_time,
             "assignee": assignee
         }
-        if df.empty:
-            updated_df = pd.DataFrame([new_schedule])
-        else:
-            updated_df = pd.concat([df, pd.DataFrame([new_schedule])], ignore_index=True)
-        self.update_data("WeeklySchedule", updated_df)
+        return self.append_row("WeeklySchedule", new_schedule)
     
     def delete_weekly_schedule(self, schedule_id):
         df = self.get_data("WeeklySchedule") # Use get_data
@@ -347,13 +1169,11 @@ class DataManager:
 
     # --- Reading Methods ---
     def get_reading_logs(self, user_id=None):
-        df = self.get_data("Reading")
-        if user_id and not df.empty and "user_name" in df.columns:
-             return df[df["user_name"] == user_id]
-        return df
+        if user_id:
+            return self._select("Reading", user_name=user_id)
+        return self.get_data("Reading")
 
     def add_reading_log(self, read_date, book_type, book_title, author, one_line_review, user_name, pages_read=""):
-        df = self.get_data("Reading") # Use get_data
         import uuid
         new_log = {
             "reading_id": str(uuid.uuid4()),
@@ -365,11 +1185,7 @@ class DataManager:
             "pages_read": pages_read,
             "user_name": user_name
         }
-        if df.empty:
-            updated_df = pd.DataFrame([new_log])
-        else:
-            updated_df = pd.concat([df, pd.DataFrame([new_log])], ignore_index=True)
-        self.update_data("Reading", updated_df)
+        return self.append_row("Reading", new_log)
 
     # --- Praise Methods ---
     def get_praise_logs(self, user_id=None):
@@ -386,7 +1202,6 @@ class DataManager:
         return df
 
     def add_praise_request(self, content, user_name):
-        df = self.get_data("Praise") # Use get_data
         import uuid
         new_praise = {
             "praise_id": str(uuid.uuid4()),
@@ -395,34 +1210,21 @@ class DataManager:
             "content": content,
             "status": "대기 중" 
         }
-        if df.empty:
-            updated_df = pd.DataFrame([new_praise])
-        else:
-            updated_df = pd.concat([df, pd.DataFrame([new_praise])], ignore_index=True)
-        self.update_data("Praise", updated_df)
+        return self.append_row("Praise", new_praise)
 
     def update_praise_status(self, praise_id, new_status):
-        df = self.get_praise_logs()
-        if df.empty: return
-        
-        df["praise_id"] = df["praise_id"].astype(str)
-        idx = df[df["praise_id"] == str(praise_id)].index
-        if not idx.empty:
-            df.at[idx[0], "status"] = new_status
-            self.update_data("Praise", df)
+        return self.update_by_id("Praise", {praise_id: {"status": new_status}})
 
     # --- Mission Definitions Methods ---
     def get_mission_definitions(self, assignee=None):
-        df = self.get_data("MissionDefinitions")
-        if assignee and not df.empty and "assignee" in df.columns:
-            return df[df["assignee"] == assignee]
-        return df
+        if assignee:
+            return self._select("MissionDefinitions", assignee=assignee)
+        return self.get_data("MissionDefinitions")
 
     def update_mission_definitions(self, df):
         return self.update_data("MissionDefinitions", df)
     
     def add_mission_definition(self, title, def_type, frequency, assignee, note=""):
-        df = self.get_data("MissionDefinitions")
         import uuid
         new_def = {
             "def_id": str(uuid.uuid4()),
@@ -433,18 +1235,19 @@ class DataManager:
             "note": note,
             "active": True
         }
-        if df.empty:
-            updated_df = pd.DataFrame([new_def])
-        else:
-            updated_df = pd.concat([df, pd.DataFrame([new_def])], ignore_index=True)
-        self.update_data("MissionDefinitions", updated_df)
+        return self.append_row("MissionDefinitions", new_def)
 
     def get_user_dict(self):
         """
         Read user credentials from 'Users' sheet and return in streamlit-authenticator format.
         Returns: {'usernames': {'dad': {'name': ..., 'password': ..., 'email': ..., 'role': ...}, ...}}
         """
-        users_df = self.get_data("Users", ttl=0)  # Force fresh read, no cache
+        # Credentials must not come from a stale cache (e.g. a password changed by
+        # another process): check the Users change marker first, which downloads
+        # the sheet only when it moved.
+        if self._batch_frame("Users") is None:
+            self._revalidate(["Users"])
+        users_df = self.get_data("Users")
         
         if users_df.empty:
             return {"usernames": {}}
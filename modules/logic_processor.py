@@ -2,6 +2,7 @@ import pandas as pd
 from datetime import datetime
 import modules.time_utils as time_utils
 from modules.db_manager import db_manager
+import modules.wallet as wallet
 
 class LogicProcessor:
     def __init__(self):
@@ -9,24 +10,17 @@ class LogicProcessor:
 
     # --- Mission Logic ---
     def get_todays_missions(self, user_name):
-        df = self.db.get_missions()
-        today_str = time_utils.get_today_str()
-        return df[(df['assignee'] == user_name) & (df['date'] == today_str)]
+        return self.db.get_missions(assignee=user_name, date=time_utils.get_today_str())
 
     def update_mission_status(self, mission_id, new_status, reason=""):
-        df = self.db.get_missions()
-        idx = df[df['mission_id'] == mission_id].index
-        if not idx.empty:
-            df.loc[idx, 'status'] = new_status
-            if reason:
-                df.loc[idx, 'rejection_reason'] = reason
-            return self.db.update_data("Missions", df)
-        return False
+        values = {'status': new_status}
+        if reason:
+            values['rejection_reason'] = reason
+        return self.db.update_by_id("Missions", {mission_id: values})
 
     def check_daily_all_clear(self, child_id, date_str):
-        df = self.db.get_missions()
-        # Filter for child and date
-        child_missions = df[(df['assignee'] == child_id) & (df['date'] == date_str)]
+        # Reads only the store holding that date (the active set for recent days)
+        child_missions = self.db.get_missions(assignee=child_id, date=date_str)
         
         if child_missions.empty:
             return False # No missions to clear
@@ -36,79 +30,60 @@ class LogicProcessor:
         return all_approved
 
     def grant_reward(self, user_name, coupon_item, coupon_qty, stamp_item, stamp_qty):
-        success = True
-        # Log Coupon
-        if coupon_qty > 0:
-            # We don't have separate return values for each log, assumiong DB always works if connected
-            self.db.log_activity(user_name, "보상", f"쿠폰: {coupon_item}", coupon_qty)
-        
-        # Log Stamp
-        if stamp_qty > 0:
-            self.db.log_activity(user_name, "보상", f"도장: {stamp_item}", stamp_qty)
+        # Both logs go out as one append
+        with self.db.batch() as batch:
+            # Log Coupon
+            if coupon_qty > 0:
+                self.db.log_activity(user_name, "보상", f"쿠폰: {coupon_item}", coupon_qty,
+                                    item_kind="coupon", item_name=coupon_item)
+            
+            # Log Stamp
+            if stamp_qty > 0:
+                self.db.log_activity(user_name, "보상", f"도장: {stamp_item}", stamp_qty,
+                                    item_kind="stamp", item_name=stamp_item)
             
-        return success
+        return batch.ok
 
     # --- Wallet Logic ---
-    def calculate_assets(self, user_name):
-        logs = self.db.get_logs()
+    def get_wallet(self, user_name, child_id=None):
+        """
+        Wallet summary (wallet.WalletSummary) of a child.
+        Starts from the child's Balances row (a checkpoint at its latest log) and only
+        reads the logs since its last settlement, for the list of unsettled stamps.
+        A missing or stale row is rebuilt from the full ledger.
+        """
         settings = self.db.get_settings()
-        
-        user_logs = logs[logs['User'] == user_name]
-        
-        total_money = 0
-        total_coupons = 0
-        
-        # Parse Settings
-        stamp_settings = settings[settings['category'] == 'stamp']
-        stamp_prices = {}
-        for _, row in stamp_settings.iterrows():
-            try:
-                stamp_prices[row['item_name']] = int(pd.to_numeric(row['value'], errors='coerce'))
-            except:
-                continue
-                
-        if user_logs.empty:
-            return 0, 0
+        checkpoint = wallet.balances.from_row(self.db.get_balance(user_name))
+        if checkpoint is not None:
+            start = wallet.checkpoint.window_start(checkpoint)
+            logs = self.db.get_logs(user_id=user_name, date_range=(start, None)).reset_index(drop=True)
+            if wallet.checkpoint.locate(checkpoint, logs) is not None:
+                return wallet.summarize(logs, settings, child_id=child_id, checkpoint=checkpoint)
+
+        logs = self.db.get_logs(user_id=user_name).reset_index(drop=True)
+        if not logs.empty:
+            self.db.rebuild_balances(users=[user_name])
+        return wallet.summarize(logs, settings, child_id=child_id)
 
-        for _, row in user_logs.iterrows():
-            log_type = row.get('Type', '')
-            content = row.get('Content', '')
-            try:
-                qty = int(pd.to_numeric(row.get('Reward', 0), errors='coerce'))
-            except:
-                qty = 0
-                
-            if log_type == "보상":
-                if "도장:" in content:
-                    # Content format: "도장: {stamp_name}"
-                    try:
-                        stamp_name = content.split(":", 1)[1].strip()
-                        unit_price = stamp_prices.get(stamp_name, 0)
-                        total_money += (qty * unit_price)
-                    except:
-                        pass # Malformed content
-                elif "쿠폰:" in content:
-                    total_coupons += qty
-                    
-            elif log_type == "쿠폰사용":
-                 total_coupons += qty # qty is logged as negative for usage
-                 
-            elif log_type == "정산":
-                # Settlement logs a negative MONEY value directly in Reward?
-                # or Qty?
-                # In perform_settlement below, we log "금액차감" with negative current balance.
-                # So here we just sum it up.
-                total_money += qty
-                
-        return int(total_money), int(total_coupons)
+    def calculate_assets(self, user_name, child_id=None):
+        """
+        Returns (unsettled money, available coupons) for a child, read from its Balances row.
+        Same ledger as the Wallet page: money counts stamps since the last settlement.
+        """
+        balance = self.db.get_balance(user_name)
+        if wallet.balances.from_row(balance) is None:
+            self.db.rebuild_balances(users=[user_name])
+            balance = self.db.get_balance(user_name)
+        if balance is None:
+            return 0, 0
+        return int(float(balance["money"])), int(float(balance["coupons"]))
 
-    def perform_settlement(self, user_name, current_balance):
+    def perform_settlement(self, user_name, current_balance, child_id=None):
         if current_balance <= 0:
             return False
             
-        # Log a negative entry to zero out the balance
-        self.db.log_activity(user_name, "정산", "금액차감", -current_balance)
-        return True
+        # Log a negative entry to zero out the balance (the Balances row follows in the same batch)
+        return self.db.log_activity(user_name, "정산", "금액차감", -current_balance)
 
     def use_coupon(self, user_name):
         # Generic usage
@@ -5,6 +5,7 @@
 from .mission_generator import MissionGenerator
 from .mission_manager import MissionManager
 from .reward_handler import RewardHandler
+from . import scheduler
 from . import ui_helpers
 
-__all__ = ['MissionGenerator', 'MissionManager', 'RewardHandler', 'ui_helpers']
+__all__ = ['MissionGenerator', 'MissionManager', 'RewardHandler', 'scheduler', 'ui_helpers']
@@ -1,8 +1,9 @@
 """미션 자동 생성 모듈
 
-오늘의 미션을 자동으로 생성하는 로직을 담당합니다.
+미션 정의로 오늘(또는 여러 날짜, 여러 자녀)의 미션을 생성하는 로직을 담당합니다.
 """
 from datetime import datetime
+from typing import Iterable, Optional
 import uuid
 import pandas as pd
 from modules.db_manager import db_manager
@@ -10,12 +11,40 @@ import modules.time_utils as time_utils
 import streamlit as st
 
 
+# 생성 미션 id의 uuid5 네임스페이스 (바꾸면 이미 만든 미션과 id가 달라져 중복 생성됨)
+MISSION_ID_NAMESPACE = uuid.UUID("6f1c2a8e-4b7d-5e90-a3c1-2d8f7b6e5a40")
+
+MISSION_COLUMNS = ["mission_id", "date", "assignee", "title", "status", "rejection_reason"]
+WEEKDAYS = ["월", "화", "수", "목", "금", "토", "일"]
+
+
+def mission_id_for(definition_key: str, date_str: str, assignee: str) -> str:
+    """미션 정의 + 날짜 + 담당 자녀로 정해지는 미션 id
+
+    같은 정의로 같은 날 같은 아이에게 만든 미션은 어느 세션에서 만들어도 id가 같으므로,
+    id 기준 insert-if-absent로 쓰면 여러 번 실행해도 한 번만 생성됩니다.
+    """
+    return str(uuid.uuid5(MISSION_ID_NAMESPACE, f"{definition_key}|{date_str}|{assignee}"))
+
+
+def definition_key(row) -> str:
+    """미션 정의의 고유 키 (def_id, 없으면 제목)"""
+    def_id = row.get("def_id")
+    if def_id is not None and not pd.isna(def_id) and str(def_id).strip():
+        return str(def_id)
+    return f"title:{row.get('title', '')}"
+
+
 class MissionGenerator:
     """일일 미션 자동 생성기"""
     
-    def __init__(self):
-        """초기화"""
-        pass
+    def __init__(self, db=None):
+        """초기화
+        
+        Args:
+            db: 미션을 읽고 쓸 DataManager (기본: 앱의 db_manager)
+        """
+        self.db = db or db_manager
     
     def ensure_todays_missions(self, target_child_id: str) -> None:
         """오늘의 미션이 없으면 자동 생성
@@ -24,87 +53,126 @@ class MissionGenerator:
             target_child_id: 대상 자녀 ID
         
         Note:
-            세션 상태를 사용하여 중복 생성 방지
+            미션 id가 (정의, 날짜, 자녀)로 정해지고, 쓰기 직전에 원격 Missions의 id를 다시 확인해
+            이미 있는 id는 건너뛰므로 여러 세션/기기에서 실행해도 한 번만 생성됩니다.
+            두 프로세스가 거의 동시에 쓰면 같은 id가 두 번 기록될 수 있지만, 읽을 때 하나만 보입니다.
         """
-        if "todays_missions_checked" not in st.session_state:
-            st.session_state["todays_missions_checked"] = {}
-        
-        today_str = time_utils.get_today_str()
-        check_key = f"{target_child_id}_{today_str}"
-        
-        if st.session_state["todays_missions_checked"].get(check_key):
-            return
-
         try:
-            defs_df = db_manager.get_mission_definitions(assignee=target_child_id)
-            if defs_df.empty:
-                return
-
-            missions_df = db_manager.get_missions(assignee=target_child_id)
-            existing_titles = []
-            if not missions_df.empty:
-                existing_today = missions_df[missions_df["date"] == today_str]
-                existing_titles = existing_today["title"].tolist()
-
-            new_missions = []
-            today_date = time_utils.get_now()
-            weekday_map = ["월", "화", "수", "목", "금", "토", "일"]
-            today_weekday = weekday_map[today_date.weekday()]
-
-            for _, row in defs_df.iterrows():
-                if not row.get("active", True):
-                    continue
-                
-                title = row["title"]
-                def_type = row["type"]
-                freq = row["frequency"]
-                note = row.get("note", "")
-
-                should_create = self._should_create_mission(
-                    def_type, freq, today_weekday, today_str
-                )
-                
-                if should_create and title not in existing_titles:
-                    new_missions.append({
-                        "mission_id": str(uuid.uuid4()),
-                        "date": today_str,
-                        "assignee": target_child_id,
-                        "title": title,
-                        "status": "Assigned", 
-                        "rejection_reason": note
-                    })
-                    existing_titles.append(title)
-            
-            if new_missions:
-                all_missions = db_manager.get_missions()
-                added_df = pd.DataFrame(new_missions)
-                if all_missions.empty:
-                    final_df = added_df
-                else:
-                    final_df = pd.concat([all_missions, added_df], ignore_index=True)
-                
-                if db_manager.update_data("Missions", final_df):
-                    st.session_state["todays_missions_checked"][check_key] = True
-        
+            self.generate(children=[target_child_id])
         except Exception as e:
             st.error(f"미션 생성 중 오류: {e}")
     
-    def _should_create_mission(self, def_type: str, freq: str, 
-                               today_weekday: str, today_str: str) -> bool:
-        """미션 생성 여부 판단
+    def generate_for_all(self, date_str: str) -> int:
+        """미션 정의가 있는 모든 자녀의 date_str 미션을 한 번의 append로 생성
         
         Args:
-            def_type: 미션 타입 (Routine/OneTime)
-            freq: 빈도 (요일 또는 날짜)
-            today_weekday: 오늘 요일
-            today_str: 오늘 날짜 문자열
+            date_str: 날짜 (YYYY-MM-DD)
         
         Returns:
-            생성 여부
+            새로 추가한 미션 수 (쓰기 실패 시 -1)
         """
-        if def_type == "Routine":
-            return today_weekday in str(freq)
-        elif def_type == "OneTime":
-            return str(freq) == today_str
+        return self.generate(start=date_str, end=date_str)
+    
+    def generate(self, children: Optional[Iterable[str]] = None,
+                 start: Optional[str] = None, end: Optional[str] = None) -> int:
+        """여러 자녀 x 여러 날짜의 미션을 한 번의 append로 생성 (밀린 날 채우기 등)
         
-        return False
+        Args:
+            children: 대상 자녀 ID 목록 (기본: 미션 정의가 있는 모든 자녀)
+            start, end: 날짜 범위 YYYY-MM-DD, 양 끝 포함 (기본: 오늘 하루)
+        
+        Returns:
+            새로 추가한 미션 수 (쓰기 실패 시 -1)
+        """
+        missions = self.plan(children, start, end)
+        if missions.empty:
+            return 0
+        return self.db.insert_missing("Missions", missions)
+    
+    def plan(self, children: Optional[Iterable[str]] = None,
+             start: Optional[str] = None, end: Optional[str] = None,
+             skip_existing: bool = False) -> pd.DataFrame:
+        """정의로 계산한 날짜 범위의 미션 (저장하지 않음, 다가올 주 미리보기 등)
+        
+        Args:
+            children: 대상 자녀 ID 목록 (기본: 미션 정의가 있는 모든 자녀)
+            start, end: 날짜 범위 YYYY-MM-DD, 양 끝 포함 (기본: 오늘 하루)
+            skip_existing: 이미 있는 미션(같은 id, 또는 id 도입 전 무작위 id로 만든 같은 날
+                같은 제목)을 Missions에서 읽어 제외. 미리보기용이며, generate()는 이 읽기 없이
+                쓰기 직전에 id로만 확인합니다
+        
+        Returns:
+            Missions 컬럼의 DataFrame (날짜, 자녀 순)
+        """
+        start = start or time_utils.get_today_str()
+        dates = pd.date_range(start, end or start, freq="D")
+        missions = plan_missions(self.db.get_mission_definitions(), dates, children)
+        if missions.empty or not skip_existing:
+            return missions
+
+        existing = self.db.get_missions(
+            assignee=sorted(missions["assignee"].unique()),
+            date_range=(dates[0].strftime("%Y-%m-%d"), dates[-1].strftime("%Y-%m-%d")),
+        )
+        if not existing.empty:
+            dates_str = pd.to_datetime(existing["date"], errors="coerce").dt.strftime("%Y-%m-%d")
+            taken = existing["assignee"].astype(str) + "|" + dates_str + "|" + existing["title"].astype(str)
+            wanted = missions["assignee"] + "|" + missions["date"] + "|" + missions["title"].astype(str)
+            exists = wanted.isin(set(taken)) | missions["mission_id"].isin(set(existing["mission_id"].astype(str)))
+            missions = missions[~exists.values]
+        return missions.reset_index(drop=True)
+
+def plan_missions(defs_df: pd.DataFrame, dates, children: Optional[Iterable[str]] = None) -> pd.DataFrame:
+    """활성 미션 정의 x 날짜를 한 번에 평가해 생성할 미션 행 계산 (저장소 접근 없음)
+    
+    Args:
+        defs_df: MissionDefinitions 프레임
+        dates: 날짜 목록 (DatetimeIndex 또는 YYYY-MM-DD 문자열 목록)
+        children: 대상 자녀 ID 목록 (None이면 전체)
+    
+    Returns:
+        Missions 컬럼의 DataFrame. Routine은 frequency에 그 날 요일이 있을 때,
+        OneTime은 frequency가 그 날짜일 때 생성되며, 같은 날 같은 아이의 같은 제목은 하나만 남깁니다
+    """
+    dates = pd.DatetimeIndex(pd.to_datetime(list(dates)))
+    defs = defs_df
+    if defs.empty or not len(dates) or "assignee" not in defs.columns:
+        return pd.DataFrame(columns=MISSION_COLUMNS)
+    if "active" in defs.columns:
+        defs = defs[defs["active"].astype(bool)]
+    defs = defs[defs["assignee"].notna()]
+    if children is not None:
+        defs = defs[defs["assignee"].astype(str).isin([str(c) for c in children])]
+    if defs.empty:
+        return pd.DataFrame(columns=MISSION_COLUMNS)
+
+    defs = pd.DataFrame({
+        "key": [definition_key(row) for row in defs.to_dict("records")],
+        "assignee": defs["assignee"].astype(str).values,
+        "title": defs["title"].values,
+        "type": defs["type"].astype(str).values,
+        "frequency": defs["frequency"].fillna("").astype(str).values,
+        "note": defs["note"].fillna("").values if "note" in defs.columns else "",
+    })
+    days = pd.DataFrame({
+        "date": dates.strftime("%Y-%m-%d"),
+        "weekday": [WEEKDAYS[d] for d in dates.weekday],
+    })
+    grid = defs.merge(days, how="cross")
+
+    routine = pd.Series(False, index=grid.index)
+    for weekday in WEEKDAYS:
+        routine |= (grid["weekday"] == weekday) & grid["frequency"].str.contains(weekday, regex=False)
+    routine &= grid["type"] == "Routine"
+    one_time = (grid["type"] == "OneTime") & (grid["frequency"].str[:10] == grid["date"])
+    grid = grid[routine | one_time].drop_duplicates(["assignee", "date", "title"])
+
+    missions = pd.DataFrame({
+        "mission_id": [mission_id_for(k, d, a) for k, d, a in zip(grid["key"], grid["date"], grid["assignee"])],
+        "date": grid["date"].values,
+        "assignee": grid["assignee"].values,
+        "title": grid["title"].values,
+        "status": "Assigned",
+        "rejection_reason": grid["note"].values,
+    }, columns=MISSION_COLUMNS)
+    return missions.sort_values(["date", "assignee"], kind="mergesort").reset_index(drop=True)
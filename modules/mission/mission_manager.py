@@ -13,6 +13,24 @@ class MissionManager:
         """초기화"""
         pass
     
+    def get_history(self, assignee: str) -> tuple:
+        """승인/반려된 미션 이력 (월별 샤드로 보관된 지난 미션 포함)
+        
+        Args:
+            assignee: 자녀 ID
+        
+        Returns:
+            (수정 가능한 이력, 보관된 이력) - 수정은 현재 Missions 워크시트에 남은 미션만 가능
+        """
+        history = db_manager.get_missions(assignee=assignee, status=["Approved", "Rejected"],
+                                          include_archived=True)
+        if history.empty:
+            return history, history
+        active = db_manager.get_missions(assignee=assignee)
+        active_ids = set(active["mission_id"].astype(str)) if "mission_id" in active.columns else set()
+        in_active = history["mission_id"].astype(str).isin(active_ids)
+        return history[in_active], history[~in_active]
+    
     def save_pending_changes(self, edited_pending: pd.DataFrame, 
                             status_map_inv: dict) -> bool:
         """대기 중 미션 변경사항 저장
@@ -25,24 +43,23 @@ class MissionManager:
             성공 여부
         """
         try:
-            all_raw = db_manager.get_missions(assignee=None) 
-            changes = 0
+            records = edited_pending.to_dict('records')
+            current = db_manager.get_rows_by_id("Missions", [r['mission_id'] for r in records])
+            changes = {}
             
-            for r in edited_pending.to_dict('records'):
-                mid = r['mission_id']
+            for r in records:
+                mid = str(r['mission_id'])
                 kor_s = r['상태']
                 reas = r['rejection_reason']
                 eng_s = status_map_inv.get(kor_s, "Pending")
                 
-                idx = all_raw[all_raw['mission_id'] == mid].index
-                if not idx.empty:
-                    if all_raw.loc[idx[0], 'status'] != eng_s or str(all_raw.loc[idx[0], 'rejection_reason']) != str(reas):
-                        all_raw.loc[idx[0], 'status'] = eng_s
-                        all_raw.loc[idx[0], 'rejection_reason'] = str(reas) if reas else ""
-                        changes += 1
+                if mid in current.index:
+                    row = current.loc[mid]
+                    if row['status'] != eng_s or str(row['rejection_reason']) != str(reas):
+                        changes[mid] = {'status': eng_s, 'rejection_reason': str(reas) if reas else ""}
             
-            if changes > 0:
-                return db_manager.update_data("Missions", all_raw)
+            if changes:
+                return db_manager.update_by_id("Missions", changes)
             return False
         except Exception as e:
             print(f"대기 중 미션 저장 오류: {e}")
@@ -111,25 +128,21 @@ class MissionManager:
             original_ids = edited_history['mission_id'].tolist()
             deleted_ids = set(original_ids) - set(current_ids)
             
-            all_raw = db_manager.get_missions(assignee=None)
-            
-            # Handle Deletions
-            if deleted_ids:
-                all_raw = all_raw[~all_raw['mission_id'].isin(deleted_ids)]
-            
             # Handle Updates
+            changes = {}
             for r in edited_history.to_dict('records'):
-                mid = r['mission_id']
                 kor_s = r['상태']
                 reas = r.get('rejection_reason', '')
                 eng_s = status_map_inv.get(kor_s, "Assigned")
-                
-                idx = all_raw[all_raw['mission_id'] == mid].index
-                if not idx.empty:
-                    all_raw.loc[idx[0], 'status'] = eng_s
-                    all_raw.loc[idx[0], 'rejection_reason'] = str(reas) if reas else ""
+                changes[r['mission_id']] = {'status': eng_s, 'rejection_reason': str(reas) if reas else ""}
             
-            return db_manager.update_data("Missions", all_raw)
+            # One write for updates and deletions
+            with db_manager.batch() as batch:
+                if changes:
+                    db_manager.update_by_id("Missions", changes)
+                if deleted_ids:
+                    db_manager.delete_by_id("Missions", deleted_ids)
+            return batch.ok
         except Exception as e:
             print(f"미션 이력 저장 오류: {e}")
             return False
@@ -27,12 +27,20 @@ class RewardHandler:
             성공 여부
         """
         try:
+            entries = []
             if stamp_qty > 0:
-               db_manager.log_activity(user_name, "Mission", f"도장: {stamp_type}", stamp_qty)
+                entries.append({"user_name": user_name, "activity_type": "Mission",
+                                "content": f"도장: {stamp_type}", "reward": stamp_qty,
+                                "item_kind": "stamp", "item_name": stamp_type})
             
             if coupon_qty > 0:
-                db_manager.log_activity(user_name, "Coupon", f"쿠폰: {coupon_type}", coupon_qty)
+                entries.append({"user_name": user_name, "activity_type": "Coupon",
+                                "content": f"쿠폰: {coupon_type}", "reward": coupon_qty,
+                                "item_kind": "coupon", "item_name": coupon_type})
             
+            # 한 번의 append 요청으로 함께 기록
+            if entries:
+                return db_manager.log_activities(entries)
             return True
         except Exception as e:
             print(f"보상 지급 오류: {e}")
@@ -50,7 +58,8 @@ class RewardHandler:
             성공 여부
         """
         try:
-            db_manager.log_activity(user_name, "Mission", f"도장: {stamp_type}", quantity)
+            db_manager.log_activity(user_name, "Mission", f"도장: {stamp_type}", quantity,
+                                    item_kind="stamp", item_name=stamp_type)
             return True
         except Exception as e:
             print(f"도장 지급 오류: {e}")
@@ -68,7 +77,8 @@ class RewardHandler:
             성공 여부
         """
         try:
-            db_manager.log_activity(user_name, "Coupon", f"쿠폰: {coupon_type}", quantity)
+            db_manager.log_activity(user_name, "Coupon", f"쿠폰: {coupon_type}", quantity,
+                                    item_kind="coupon", item_name=coupon_type)
             return True
         except Exception as e:
             print(f"쿠폰 지급 오류: {e}")
@@ -0,0 +1,91 @@
+"""일일 미션 생성 스케줄러
+
+서버 프로세스마다 한 번 띄우는 백그라운드 스레드가 KST 자정마다 모든 자녀의 미션을
+한 번의 append로 생성하고, 어느 날짜까지 생성했는지 프로세스 전역 표시를 남깁니다.
+페이지는 표시만 확인하므로 렌더링 중에 생성 비용을 치르지 않습니다.
+(서버가 자정 직후 시작되어 스레드가 아직 돌지 않았다면 첫 페이지가 한 번 대신 생성합니다.)
+
+cron 등 외부에서 돌릴 때는 scripts/tools/generate_missions.py를 사용합니다.
+스레드와 cron이 함께 돌면 둘 다 같은 미션을 만들려고 합니다. 미션 id가 결정적이고
+insert_missing이 쓰기 직전에 원격 Missions의 id를 다시 확인하므로 보통은 한쪽만 추가합니다.
+두 append가 거의 동시에 일어나면 같은 id가 두 번 기록될 수 있으며, 이 경우 get_missions가
+먼저 기록된 행 하나만 돌려줍니다.
+"""
+import threading
+import time
+from datetime import timedelta
+from typing import Optional
+
+import modules.time_utils as time_utils
+from .mission_generator import MissionGenerator
+
+
+# 자정 직후 여유 (초) / 생성 실패 시 재시도 간격 (초)
+MIDNIGHT_MARGIN = 5
+RETRY_INTERVAL = 60
+
+_lock = threading.Lock()
+_generated_for = None  # 미션 생성을 마친 날짜 (프로세스 전역)
+_thread = None
+
+
+def generated_for() -> Optional[str]:
+    """이 프로세스가 미션 생성을 마친 마지막 날짜 (YYYY-MM-DD)"""
+    return _generated_for
+
+
+def run_daily_generation(date_str: Optional[str] = None, force: bool = False) -> int:
+    """date_str(기본: 오늘) 미션을 모든 자녀에게 생성하고 날짜 표시를 남김
+
+    Args:
+        force: 이미 생성한 날짜여도 다시 실행 (없는 미션만 추가됨)
+
+    Returns:
+        새로 추가한 미션 수 (이미 생성했으면 0, 실패 시 -1)
+    """
+    global _generated_for
+    date_str = date_str or time_utils.get_today_str()
+    with _lock:
+        if _generated_for == date_str and not force:
+            return 0
+        try:
+            added = MissionGenerator().generate_for_all(date_str)
+        except Exception as e:
+            print(f"Mission generation error ({date_str}): {e}")
+            return -1
+        if added >= 0 and date_str == time_utils.get_today_str():
+            _generated_for = date_str
+        return added
+
+
+def ensure_todays_missions() -> None:
+    """오늘 미션이 생성되었는지 확인 (이미 생성했으면 즉시 반환)"""
+    if _generated_for != time_utils.get_today_str():
+        run_daily_generation()
+
+
+def seconds_until_midnight(now=None) -> float:
+    """다음 KST 자정까지 남은 초"""
+    now = now or time_utils.get_now()
+    midnight = (now + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
+    return max((midnight - now).total_seconds(), 0.0)
+
+
+def _run_forever():
+    while True:
+        added = run_daily_generation()
+        if added < 0:
+            time.sleep(RETRY_INTERVAL)
+            continue
+        time.sleep(seconds_until_midnight() + MIDNIGHT_MARGIN)
+
+
+def start() -> bool:
+    """스케줄러 스레드 시작 (프로세스당 한 번, 이미 돌고 있으면 False)"""
+    global _thread
+    with _lock:
+        if _thread is not None and _thread.is_alive():
+            return False
+        _thread = threading.Thread(target=_run_forever, name="mission-scheduler", daemon=True)
+        _thread.start()
+        return True
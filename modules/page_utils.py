@@ -5,15 +5,18 @@
 import streamlit as st
 import modules.auth_utils as auth_utils
 import modules.ui_components as ui_components
+from modules.db_manager import db_manager
+from modules.mission import scheduler as mission_scheduler
 
 
-def initialize_page(title: str, icon: str, layout: str = "wide"):
+def initialize_page(title: str, icon: str, layout: str = "wide", worksheets=None):
     """페이지 공통 초기화
     
     Args:
         title: 페이지 제목
         icon: 페이지 아이콘 (이모지)
         layout: 레이아웃 ("wide" 또는 "centered")
+        worksheets: 페이지가 읽는 워크시트 목록 (로그인용 Users와 함께 한 번에 미리 로드)
     
     Returns:
         authenticator: 인증 객체 (필요 시 사용)
@@ -21,6 +24,15 @@ def initialize_page(title: str, icon: str, layout: str = "wide"):
     # 페이지 설정
     st.set_page_config(page_title=title, page_icon=icon, layout=layout)
     
+    # 이번 실행의 저장소 호출을 이 페이지로 집계
+    db_manager.metrics.start_render(title)
+    
+    # 자정 미션 생성 스케줄러 (서버 프로세스당 한 번만 시작됨)
+    mission_scheduler.start()
+    
+    # 데이터 미리 로드 (캐시가 비어 있으면 한 번의 요청으로)
+    db_manager.prefetch(["Users"] + list(worksheets or []))
+    
     # 인증 확인
     authenticator = auth_utils.get_authenticator()
     auth_status = auth_utils.check_login(authenticator)
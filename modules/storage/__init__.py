@@ -0,0 +1,12 @@
+"""저장소 백엔드 모듈
+
+DataManager 뒤에서 실제 읽기/쓰기를 담당하는 백엔드들
+"""
+from .base import StorageBackend, FrameDelta, StaleSnapshotError, diff_frames
+from .cache import WorksheetCache
+from .quota import QuotaGovernor, shared_governor
+from .snapshot import SnapshotStore
+from .metrics import MetricsRegistry, InstrumentedBackend, registry as metrics_registry
+from .factory import create_backend, get_storage_config
+
+__all__ = ['StorageBackend', 'FrameDelta', 'StaleSnapshotError', 'diff_frames', 'WorksheetCache', 'QuotaGovernor', 'shared_governor', 'SnapshotStore', 'MetricsRegistry', 'InstrumentedBackend', 'metrics_registry', 'create_backend', 'get_storage_config']
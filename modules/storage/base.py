@@ -0,0 +1,218 @@
+"""저장소 백엔드 공통 인터페이스
+
+DataManager가 사용하는 워크시트 단위 읽기/쓰기 규약과
+백엔드 간에 공유하는 셀 정규화 및 프레임 diff 로직을 제공합니다.
+"""
+import re
+from collections import namedtuple
+from typing import List, Optional
+
+import pandas as pd
+
+
+# 스냅샷 대비 변경분
+#   key: 기준 id 컬럼
+#   columns: 컬럼 순서
+#   row_keys: 스냅샷 행 순서대로의 id 값 (문자열)
+#   changed_cells: (스냅샷 행 위치, 컬럼 위치, 새 값 문자열) 목록
+#   deleted_rows: 삭제될 스냅샷 행 위치 목록
+#   inserted: 새로 추가될 행 (문자열 리스트) 목록
+#   result: 반영 후 저장소에 남을 프레임 (기존 행 순서 유지, 신규 행은 맨 뒤)
+FrameDelta = namedtuple(
+    "FrameDelta",
+    ["key", "columns", "row_keys", "changed_cells", "deleted_rows", "inserted", "result"],
+)
+
+_NUMBER_RE = re.compile(r"-?(0|[1-9]\d*)(\.\d+)?")
+
+
+class StaleSnapshotError(Exception):
+    """저장소의 행이 스냅샷과 달라(다른 쓰기가 id를 지우거나 헤더를 바꿈) 변경분을 적용할 수 없음
+
+    호출자(DataManager)는 전체 재작성으로 전환합니다.
+    """
+
+
+def cell_str(value) -> str:
+    """셀 값을 비교/전송용 문자열로 정규화 (5.0 -> '5', NaN -> '')"""
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def parse_cell(text: str):
+    """문자열 셀을 시트의 USER_ENTERED 해석과 같은 파이썬 값으로 변환
+
+    Examples:
+        >>> parse_cell("5")
+        5
+        >>> parse_cell("007")
+        '007'
+        >>> parse_cell("")
+        None
+    """
+    if text == "":
+        return None
+    if text in ("TRUE", "FALSE", "True", "False"):
+        return text.upper() == "TRUE"
+    # 일반 십진수만 숫자로 취급 ('007', '010-...' 같은 id는 문자열 유지)
+    if _NUMBER_RE.fullmatch(text):
+        return float(text) if "." in text else int(text)
+    return text
+
+
+def diff_frames(snapshot: pd.DataFrame, df: pd.DataFrame, key: str) -> Optional[FrameDelta]:
+    """마지막으로 읽은 스냅샷과 저장할 프레임을 id 컬럼 기준으로 비교
+
+    Args:
+        snapshot: 저장소에 현재 들어있는 프레임
+        df: 저장할 프레임
+        key: id 컬럼명
+
+    Returns:
+        FrameDelta 또는 전체 재작성이 필요한 경우 None
+        (스키마 변경, id 컬럼 없음, 중복/빈 id)
+    """
+    if df.empty or list(snapshot.columns) != list(df.columns) or key not in snapshot.columns:
+        return None
+
+    old = snapshot.apply(lambda col: col.map(cell_str))
+    new = df.apply(lambda col: col.map(cell_str))
+    if (old[key].duplicated().any() or new[key].duplicated().any()
+            or (old[key] == "").any() or (new[key] == "").any()):
+        return None
+
+    old_pos = {k: i for i, k in enumerate(old[key])}
+    new_pos = {k: i for i, k in enumerate(new[key])}
+
+    changed_cells = []
+    deleted_rows = []
+    keep_order = []
+    old_values = old.values
+    new_values = new.values
+    for k, i in old_pos.items():
+        j = new_pos.get(k)
+        if j is None:
+            deleted_rows.append(i)
+            continue
+        keep_order.append(j)
+        for c in (old_values[i] != new_values[j]).nonzero()[0]:
+            changed_cells.append((i, int(c), new_values[j][c]))
+
+    inserted_idx = [j for k, j in new_pos.items() if k not in old_pos]
+    inserted = [list(new_values[j]) for j in inserted_idx]
+
+    result = df.iloc[keep_order + inserted_idx].reset_index(drop=True)
+    return FrameDelta(key, list(df.columns), list(old[key]), changed_cells, deleted_rows, inserted, result)
+
+
+def frame_from_values(values: List[list]) -> pd.DataFrame:
+    """시트 values 응답(첫 행 = 헤더)을 DataFrame으로 변환
+
+    CSV 읽기와 같은 방식으로 빈 칸은 NaN, 숫자/불리언 컬럼은 해당 타입으로 변환합니다.
+    """
+    if not values:
+        return pd.DataFrame()
+    header = [str(h) for h in values[0]]
+    width = len(header)
+    rows = [list(r[:width]) + [""] * (width - len(r)) for r in values[1:]]
+    df = pd.DataFrame(rows, columns=header)
+
+    for col in df.columns:
+        texts = df[col].map(cell_str)
+        non_empty = texts[texts != ""]
+        parsed = non_empty.map(parse_cell)
+        if non_empty.empty or parsed.map(lambda v: isinstance(v, str)).any():
+            df[col] = df[col].where(texts != "", None)
+            continue
+        if parsed.map(lambda v: isinstance(v, bool)).all():
+            df[col] = texts.map(lambda t: parse_cell(t) if t else None)
+        elif not parsed.map(lambda v: isinstance(v, bool)).any():
+            df[col] = pd.to_numeric(texts.where(texts != "", None))
+    return df
+
+
+class StorageBackend:
+    """워크시트(테이블) 단위 저장소 인터페이스
+
+    모든 메서드는 실패 시 예외를 던지며, 오류 출력과 폴백은 호출자(DataManager)가 담당합니다.
+    """
+
+    name = "base"
+
+    @property
+    def namespace(self) -> str:
+        """캐시 키 구분자 (스프레드시트/DB 파일 단위)"""
+        return self.name
+
+    def quota_status(self) -> Optional[dict]:
+        """남은 API 예산 (호출 한도가 없는 백엔드는 None)"""
+        return None
+
+    def revisions(self, worksheet_names: List[str]) -> dict:
+        """워크시트별 변경 표식 {워크시트명: 문자열}
+
+        데이터를 내려받지 않고 바뀌었는지 확인하는 데 씁니다.
+        표식을 지원하지 않는 백엔드(또는 표식이 없는 워크시트)는 결과에서 빠집니다.
+        """
+        return {}
+
+    def last_written_revision(self, worksheet_name: str) -> Optional[str]:
+        """이 프로세스의 마지막 쓰기가 남긴 변경 표식 (없으면 None)"""
+        return None
+
+    def read(self, worksheet_name: str) -> pd.DataFrame:
+        """워크시트 전체를 DataFrame으로 반환 (없으면 빈 DataFrame)"""
+        raise NotImplementedError
+
+    def read_many(self, worksheet_names: List[str]) -> dict:
+        """여러 워크시트를 한 번에 읽기 {워크시트명: DataFrame}
+
+        기본 구현은 하나씩 읽습니다. 백엔드가 일괄 조회를 지원하면 재정의합니다.
+        """
+        return {name: self.read(name) for name in worksheet_names}
+
+    def read_where(self, worksheet_name: str, filters: dict) -> pd.DataFrame:
+        """컬럼 == 값 (리스트면 IN) 조건으로 필터링된 행 반환
+
+        없는 컬럼에 대한 조건은 무시합니다 (구버전 시트 호환).
+        기본 구현은 전체를 읽은 뒤 pandas로 거릅니다.
+        """
+        df = self.read(worksheet_name)
+        for col, value in filters.items():
+            if df.empty or col not in df.columns:
+                continue
+            if isinstance(value, (list, tuple, set)):
+                df = df[df[col].isin(list(value))]
+            else:
+                df = df[df[col] == value]
+        return df
+
+    def write(self, worksheet_name: str, df: pd.DataFrame) -> None:
+        """워크시트 전체를 df로 교체"""
+        raise NotImplementedError
+
+    def append(self, worksheet_name: str, df: pd.DataFrame,
+               header: Optional[List[str]] = None) -> List[str]:
+        """행 추가. 반영 후의 컬럼 순서를 반환
+
+        Args:
+            header: 알고 있는 현재 컬럼 순서 (없으면 백엔드가 조회)
+        """
+        raise NotImplementedError
+
+    def apply_delta(self, worksheet_name: str, delta: FrameDelta) -> Optional[bool]:
+        """diff_frames 결과(변경 셀, 삭제/추가 행)를 반영
+
+        Returns:
+            True: 저장소가 스냅샷과 같았음 (반영 후 내용 = delta.result)
+            False: 다른 쓰기의 변경이 섞여 있어 행 위치를 id로 다시 찾아 반영함
+                (반영 후 내용이 delta.result와 다르므로 호출자는 캐시를 버려야 함)
+            None: id로 바로 반영하는 백엔드 (구분 없음)
+
+        Raises:
+            StaleSnapshotError: 바꾸거나 지울 id가 저장소에 없거나 헤더가 달라진 경우
+        """
+        raise NotImplementedError
@@ -0,0 +1,134 @@
+"""워크시트 단위 프레임 캐시
+
+(스프레드시트, 워크시트) 키마다 마지막으로 읽거나 쓴 DataFrame을 보관합니다.
+쓰기가 일어나면 해당 워크시트 항목만 새 프레임으로 교체하므로
+다른 워크시트의 캐시는 그대로 유지됩니다. 프로세스 전역(모든 세션 공유)입니다.
+
+store(SnapshotStore)를 주면 설치/수정된 프레임을 디스크에도 기록합니다 (모아서 늦게 기록).
+
+항목마다 버전 번호를 두어, 백그라운드 새로고침이 그 사이에 일어난 쓰기를
+오래된 읽기 결과로 덮어쓰지 않도록 합니다.
+"""
+import threading
+import time
+from typing import Callable, List, Optional, Tuple
+
+import pandas as pd
+
+
+class WorksheetCache:
+    """(namespace, worksheet) -> (DataFrame, loaded_at)"""
+
+    def __init__(self, store=None):
+        self._entries = {}
+        self._versions = {}
+        self._lock = threading.Lock()
+        self.store = store
+
+    def _persist(self, namespace: str, worksheet_name: str, entry) -> None:
+        if self.store is None or entry is None:
+            return
+        try:
+            self.store.schedule(namespace, worksheet_name, entry[0], entry[1])
+        except Exception as e:
+            print(f"Snapshot save error ({worksheet_name}): {e}")
+
+    def _bump(self, key) -> None:
+        self._versions[key] = self._versions.get(key, 0) + 1
+
+    def get(self, namespace: str, worksheet_name: str, ttl: Optional[float] = None) -> Optional[pd.DataFrame]:
+        """캐시된 프레임 사본 반환
+
+        Args:
+            ttl: 허용 나이(초). None이면 나이와 상관없이 반환
+        """
+        entry = self.entry(namespace, worksheet_name)
+        if entry is None:
+            return None
+        df, loaded_at = entry
+        if ttl is not None and time.time() - loaded_at > ttl:
+            return None
+        return df.copy()
+
+    def entry(self, namespace: str, worksheet_name: str) -> Optional[Tuple[pd.DataFrame, float]]:
+        """(프레임, 적재 시각) 원본 반환 (읽기 전용으로 사용)"""
+        with self._lock:
+            return self._entries.get((namespace, worksheet_name))
+
+    def version(self, namespace: str, worksheet_name: str) -> int:
+        """항목이 바뀔 때마다(설치/수정/무효화) 증가하는 번호"""
+        with self._lock:
+            return self._versions.get((namespace, worksheet_name), 0)
+
+    def freshness(self, namespace: str, worksheet_name: str) -> Optional[dict]:
+        """{"loaded_at", "age", "version"} (항목이 없으면 None)"""
+        with self._lock:
+            key = (namespace, worksheet_name)
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            return {"loaded_at": entry[1], "age": time.time() - entry[1],
+                    "version": self._versions.get(key, 0)}
+
+    def put(self, namespace: str, worksheet_name: str, df: pd.DataFrame,
+            loaded_at: Optional[float] = None, if_version: Optional[int] = None) -> bool:
+        """프레임을 새 캐시 값으로 설치
+
+        Args:
+            if_version: 주어지면 현재 버전이 같을 때만 설치 (그 사이 쓰기가 있었으면 False)
+        """
+        key = (namespace, worksheet_name)
+        with self._lock:
+            if if_version is not None and self._versions.get(key, 0) != if_version:
+                return False
+            entry = (df.copy(), time.time() if loaded_at is None else loaded_at)
+            self._entries[key] = entry
+            self._bump(key)
+        self._persist(namespace, worksheet_name, entry)
+        return True
+
+    def update(self, namespace: str, worksheet_name: str,
+               func: Callable[[pd.DataFrame], pd.DataFrame]) -> bool:
+        """캐시된 프레임을 func 결과로 교체 (적재 시각 유지). 항목이 없으면 False"""
+        key = (namespace, worksheet_name)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False
+            entry = (func(entry[0]), entry[1])
+            self._entries[key] = entry
+            self._bump(key)
+        self._persist(namespace, worksheet_name, entry)
+        return True
+
+    def touch(self, namespace: str, worksheet_name: str) -> bool:
+        """원격이 바뀌지 않았음을 확인한 항목의 적재 시각만 현재로 갱신
+
+        내용이 그대로이므로 디스크 스냅샷은 다시 쓰지 않습니다 (복원된 프레임은 어차피 재검증됨).
+        """
+        key = (namespace, worksheet_name)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False
+            self._entries[key] = (entry[0], time.time())
+        return True
+
+    def names(self, namespace: str) -> List[str]:
+        """namespace에 캐시된 워크시트 이름 목록"""
+        with self._lock:
+            return [ws for ns, ws in self._entries if ns == namespace]
+
+    def invalidate(self, namespace: str, worksheet_name: Optional[str] = None) -> None:
+        """워크시트 하나(또는 namespace 전체) 무효화"""
+        with self._lock:
+            if worksheet_name is not None:
+                keys = [(namespace, worksheet_name)]
+            else:
+                keys = [k for k in self._entries if k[0] == namespace]
+            for key in keys:
+                self._entries.pop(key, None)
+                self._bump(key)
+        if self.store is not None:
+            for ns, ws in keys:
+                self.store.delete(ns, ws)
@@ -0,0 +1,72 @@
+"""저장소 백엔드 선택
+
+`.streamlit/secrets.toml`의 `[storage]` 섹션 (또는 환경변수)으로 백엔드를 고릅니다.
+
+    [storage]
+    backend = "sqlite"            # "gsheets" (기본) | "sqlite" | "fake" (메모리 내 시트, fake_sheets.py)
+    sqlite_path = "data/family_mission.db"
+    reads_per_minute = 60         # Google Sheets 분당 호출 한도 (quota.py)
+    writes_per_minute = 60
+    snapshot_dir = "data/snapshots"  # 재시작 시 복원할 워크시트 스냅샷 ("" = 사용 안 함)
+
+환경변수 `STORAGE_BACKEND`, `SQLITE_PATH`, `SNAPSHOT_DIR`이 있으면 secrets보다 우선합니다.
+"""
+import os
+
+import streamlit as st
+
+from modules.storage.base import StorageBackend
+
+
+DEFAULT_SQLITE_PATH = "data/family_mission.db"
+
+
+def get_storage_config() -> dict:
+    """secrets + 환경변수를 합친 저장소 설정 반환"""
+    try:
+        config = dict(st.secrets.get("storage", {}))
+    except Exception:
+        # secrets.toml 없음 (CLI/테스트 실행)
+        config = {}
+
+    if os.environ.get("STORAGE_BACKEND"):
+        config["backend"] = os.environ["STORAGE_BACKEND"]
+    if os.environ.get("SQLITE_PATH"):
+        config["sqlite_path"] = os.environ["SQLITE_PATH"]
+    if "SNAPSHOT_DIR" in os.environ:
+        # 빈 문자열이면 스냅샷 사용 안 함
+        config["snapshot_dir"] = os.environ["SNAPSHOT_DIR"]
+    return config
+
+
+def create_backend(key_columns=None) -> StorageBackend:
+    """설정에 맞는 백엔드 인스턴스 생성
+
+    Args:
+        key_columns: 워크시트명 -> id 컬럼 (SQLite 인덱스용)
+    """
+    config = get_storage_config()
+    backend = str(config.get("backend", "gsheets")).lower()
+
+    if backend == "sqlite":
+        from modules.storage.sqlite_backend import SQLiteBackend
+        return SQLiteBackend(config.get("sqlite_path", DEFAULT_SQLITE_PATH), key_columns=key_columns)
+
+    from modules.storage.gsheets_backend import GSheetsBackend
+
+    if backend == "fake":
+        from modules.storage.fake_sheets import FakeSheetsConnection
+        from modules.storage.quota import QuotaGovernor
+        conn = FakeSheetsConnection(
+            latency=float(config.get("fake_latency", 0.0)),
+            quota_error_rate=float(config.get("fake_quota_error_rate", 0.0)),
+        )
+        # 가짜 시트의 호출이 실제 시트의 공유 한도를 쓰지 않도록 별도 조절기 사용
+        return GSheetsBackend(governor=QuotaGovernor(), conn=conn)
+
+    from modules.storage.quota import shared_governor, DEFAULT_READS_PER_MINUTE, DEFAULT_WRITES_PER_MINUTE
+    shared_governor.configure(
+        config.get("reads_per_minute", DEFAULT_READS_PER_MINUTE),
+        config.get("writes_per_minute", DEFAULT_WRITES_PER_MINUTE),
+    )
+    return GSheetsBackend(governor=shared_governor)
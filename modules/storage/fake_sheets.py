@@ -0,0 +1,348 @@
+"""메모리 내 Google Sheets 대역
+
+st-gsheets-connection(read/clear/update)과 gspread Spreadsheet/Worksheet 중
+GSheetsBackend가 쓰는 부분을 흉내 냅니다. 네트워크 없이 GSheetsBackend 코드 경로 전체를
+실행할 수 있어서 테스트와 성능 측정에 씁니다.
+
+    [storage]
+    backend = "fake"
+    fake_latency = 0.05           # 호출당 지연(초)
+    fake_quota_error_rate = 0.1   # 호출이 429로 실패할 확률
+
+모든 셀은 시트 API의 값 응답처럼 문자열로 보관합니다.
+"""
+import random
+import re
+import threading
+import time
+from collections import Counter
+from typing import List, Optional
+
+import pandas as pd
+
+from modules.storage.base import cell_str, frame_from_values
+
+
+class FakeAPIError(Exception):
+    """gspread APIError 대역 (response.headers로 Retry-After 전달)"""
+
+    class _Response:
+        def __init__(self, status_code, headers):
+            self.status_code = status_code
+            self.headers = headers
+
+    def __init__(self, message, status_code=429, retry_after=None):
+        super().__init__(message)
+        headers = {"Retry-After": str(retry_after)} if retry_after is not None else {}
+        self.response = self._Response(status_code, headers)
+
+
+class FakeWorksheetNotFound(Exception):
+    pass
+
+
+_A1_RE = re.compile(r"([A-Z]*)(\d*)")
+
+
+def _column_index(letters: str) -> int:
+    index = 0
+    for ch in letters:
+        index = index * 26 + (ord(ch) - ord("A") + 1)
+    return index - 1
+
+
+def _split_range(range_name: str):
+    """"'Sheet'!B2:C3" -> ("Sheet", "B2:C3"); 시트 이름이 없으면 (None, range)"""
+    if range_name.startswith("'"):
+        end = 1
+        while True:
+            end = range_name.index("'", end)
+            if range_name[end + 1:end + 2] == "'":
+                end += 2
+                continue
+            break
+        title = range_name[1:end].replace("''", "'")
+        rest = range_name[end + 1:]
+        return title, rest[1:] if rest.startswith("!") else None
+    if "!" in range_name:
+        title, rest = range_name.split("!", 1)
+        return title, rest
+    return None, range_name
+
+
+def _parse_cell_ref(ref: str):
+    """"B7" -> (row 6, col 1) (없는 부분은 None)"""
+    letters, digits = _A1_RE.fullmatch(ref).groups()
+    return (int(digits) - 1 if digits else None), (_column_index(letters) if letters else None)
+
+
+def _slice_values(values: List[List[str]], ref: Optional[str]) -> List[List[str]]:
+    """값 응답에서 A1 범위("B2:C", "1:1" 등)만 잘라냄 (뒤쪽 빈 칸/빈 행 제외)"""
+    if not ref:
+        return values
+    start, _, end = ref.partition(":")
+    r0, c0 = _parse_cell_ref(start)
+    r1, c1 = _parse_cell_ref(end) if end else (r0, c0)
+    rows = values[r0 or 0:(r1 + 1) if r1 is not None else None]
+    result = [list(line[c0 or 0:(c1 + 1) if c1 is not None else None]) for line in rows]
+    for line in result:
+        while line and line[-1] == "":
+            line.pop()
+    while result and not result[-1]:
+        result.pop()
+    return result
+
+
+def _user_entered_text(cell: dict) -> str:
+    value = cell.get("userEnteredValue", {})
+    if "stringValue" in value:
+        return value["stringValue"]
+    if "boolValue" in value:
+        return "TRUE" if value["boolValue"] else "FALSE"
+    if "numberValue" in value:
+        return cell_str(value["numberValue"])
+    return ""
+
+
+class FakeWorksheet:
+    """gspread Worksheet 대역"""
+
+    def __init__(self, spreadsheet, sheet_id: int, title: str):
+        self.spreadsheet = spreadsheet
+        self.id = sheet_id
+        self.title = title
+        self.hidden = False
+        self.rows: List[List[str]] = []
+
+    # --- 내부 조작 ---
+    def _set_cell(self, row: int, col: int, text: str) -> None:
+        while len(self.rows) <= row:
+            self.rows.append([])
+        line = self.rows[row]
+        while len(line) <= col:
+            line.append("")
+        line[col] = text
+
+    def _write_block(self, row: int, col: int, values) -> None:
+        for r, line in enumerate(values):
+            for c, value in enumerate(line):
+                self._set_cell(row + r, col + c, cell_str(value))
+
+    def _trimmed(self) -> List[List[str]]:
+        """값 응답처럼 뒤쪽 빈 칸/빈 행을 잘라낸 사본"""
+        result = [list(line) for line in self.rows]
+        for line in result:
+            while line and line[-1] == "":
+                line.pop()
+        while result and not result[-1]:
+            result.pop()
+        return result
+
+    # --- gspread 표면 ---
+    def row_values(self, row: int) -> List[str]:
+        self.spreadsheet._call("read")
+        values = self._trimmed()
+        return list(values[row - 1]) if len(values) >= row else []
+
+    def get_all_records(self) -> List[dict]:
+        self.spreadsheet._call("read")
+        values = self._trimmed()
+        if not values:
+            return []
+        header = values[0]
+        return [dict(zip(header, line + [""] * (len(header) - len(line)))) for line in values[1:]]
+
+    def clear(self) -> None:
+        self.spreadsheet._call("write")
+        self.rows = []
+
+    def update(self, values=None, range_name: str = "A1", **kwargs) -> None:
+        # gspread 5.x는 update(values) 와 update(range_name=..., values=...) 모두 허용
+        if isinstance(values, str):
+            values, range_name = range_name, values
+        self.spreadsheet._call("write")
+        row, col = _parse_cell_ref(range_name.split(":")[0])
+        self._write_block(row or 0, col or 0, values)
+
+    def append_rows(self, values, value_input_option: str = "RAW", table_range: Optional[str] = None) -> None:
+        self.spreadsheet._call("write")
+        self._write_block(len(self._trimmed()), 0, values)
+
+
+class FakeSpreadsheet:
+    """gspread Spreadsheet 대역"""
+
+    def __init__(self, connection):
+        self.connection = connection
+        self._sheets = {}
+        self._next_id = 1
+
+    def _call(self, kind: str) -> None:
+        self.connection._call(kind)
+
+    def _sheet_by_id(self, sheet_id: int) -> FakeWorksheet:
+        for ws in self._sheets.values():
+            if ws.id == sheet_id:
+                return ws
+        raise FakeAPIError(f"Unknown sheetId {sheet_id}", status_code=400)
+
+    def _get(self, title: str) -> FakeWorksheet:
+        if title not in self._sheets:
+            raise FakeWorksheetNotFound(title)
+        return self._sheets[title]
+
+    def worksheet(self, title: str) -> FakeWorksheet:
+        self._call("read")
+        return self._get(title)
+
+    def add_worksheet(self, title: str, rows: int = 1000, cols: int = 26) -> FakeWorksheet:
+        self._call("write")
+        if title in self._sheets:
+            raise FakeAPIError(f'A sheet with the name "{title}" already exists.', status_code=400)
+        ws = FakeWorksheet(self, self._next_id, title)
+        self._next_id += 1
+        self._sheets[title] = ws
+        return ws
+
+    def values_get(self, range_name: str) -> dict:
+        self._call("read")
+        title, ref = _split_range(range_name)
+        return {"range": range_name, "values": _slice_values(self._get(title)._trimmed(), ref)}
+
+    def values_batch_get(self, ranges: List[str]) -> dict:
+        self._call("read")
+        value_ranges = []
+        for range_name in ranges:
+            title, ref = _split_range(range_name)
+            value_ranges.append({"range": range_name,
+                                 "values": _slice_values(self._get(title)._trimmed(), ref)})
+        return {"valueRanges": value_ranges}
+
+    def values_update(self, range_name: str, params=None, body=None) -> dict:
+        self._call("write")
+        title, ref = _split_range(range_name)
+        row, col = _parse_cell_ref((ref or "A1").split(":")[0])
+        self._get(title)._write_block(row or 0, col or 0, body["values"])
+        return {"updatedRange": range_name}
+
+    def values_append(self, range_name: str, params=None, body=None) -> dict:
+        self._call("write")
+        title, _ = _split_range(range_name)
+        ws = self._get(title)
+        start = len(ws._trimmed())
+        ws._write_block(start, 0, body["values"])
+        end = start + len(body["values"])
+        quoted = "'" + title.replace("'", "''") + "'"
+        return {"updates": {"updatedRange": f"{quoted}!A{start + 1}:Z{end}"}}
+
+    def batch_update(self, body: dict) -> dict:
+        self._call("write")
+        for request in body.get("requests", []):
+            if "updateCells" in request:
+                spec = request["updateCells"]
+                grid = spec["range"]
+                ws = self._sheet_by_id(grid["sheetId"])
+                for r, row in enumerate(spec["rows"]):
+                    for c, cell in enumerate(row["values"]):
+                        ws._set_cell(grid["startRowIndex"] + r, grid["startColumnIndex"] + c,
+                                     _user_entered_text(cell))
+            elif "deleteDimension" in request:
+                grid = request["deleteDimension"]["range"]
+                ws = self._sheet_by_id(grid["sheetId"])
+                del ws.rows[grid["startIndex"]:grid["endIndex"]]
+            elif "appendCells" in request:
+                spec = request["appendCells"]
+                ws = self._sheet_by_id(spec["sheetId"])
+                start = len(ws._trimmed())
+                for r, row in enumerate(spec["rows"]):
+                    for c, cell in enumerate(row["values"]):
+                        ws._set_cell(start + r, c, _user_entered_text(cell))
+            elif "updateSheetProperties" in request:
+                props = request["updateSheetProperties"]["properties"]
+                ws = self._sheet_by_id(props["sheetId"])
+                ws.hidden = props.get("hidden", ws.hidden)
+            else:
+                raise FakeAPIError(f"Unsupported request: {list(request)}", status_code=400)
+        return {"replies": []}
+
+
+class _FakeClient:
+    def __init__(self, spreadsheet: FakeSpreadsheet):
+        self._spreadsheet = spreadsheet
+
+    def _open_spreadsheet(self) -> FakeSpreadsheet:
+        self._spreadsheet._call("read")  # 스프레드시트 메타데이터 조회
+        return self._spreadsheet
+
+
+class FakeSheetsConnection:
+    """st-gsheets-connection 대역 (GSheetsBackend(conn=...)로 주입)
+
+    Args:
+        latency: 호출당 지연(초)
+        quota_error_rate: 호출이 429로 실패할 확률 (0~1)
+        retry_after: 429 응답의 Retry-After 값(초). None이면 헤더 없음
+        seed: 실패 주입 난수 시드 (같은 시드면 같은 순서로 실패)
+    """
+
+    def __init__(self, latency: float = 0.0, quota_error_rate: float = 0.0,
+                 retry_after: Optional[float] = None, seed: Optional[int] = 0):
+        self.latency = latency
+        self.quota_error_rate = quota_error_rate
+        self.retry_after = retry_after
+        self.fail_next = 0
+        self.calls = Counter()
+        self.spreadsheet_url = f"fake://{id(self):x}"
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.spreadsheet = FakeSpreadsheet(self)
+        self.client = _FakeClient(self.spreadsheet)
+
+    def seed(self, worksheet: str, data: pd.DataFrame) -> None:
+        """테스트 준비용: 워크시트를 data로 채움 (호출 수/지연/실패 주입 없음)"""
+        sh = self.spreadsheet
+        if worksheet not in sh._sheets:
+            sh._sheets[worksheet] = FakeWorksheet(sh, sh._next_id, worksheet)
+            sh._next_id += 1
+        ws = sh._sheets[worksheet]
+        ws.rows = []
+        ws._write_block(0, 0, [list(data.columns)] + data.values.tolist())
+
+    def fail_with_quota(self, times: int = 1) -> None:
+        """다음 times번의 호출을 429로 실패시킴"""
+        self.fail_next += times
+
+    def _call(self, kind: str) -> None:
+        """API 요청 1회: 지연, 호출 수 집계, 429 주입"""
+        if self.latency:
+            time.sleep(self.latency)
+        with self._lock:
+            self.calls[kind] += 1
+            inject = self.fail_next > 0 or (
+                self.quota_error_rate and self._random.random() < self.quota_error_rate)
+            if self.fail_next > 0:
+                self.fail_next -= 1
+        if inject:
+            self.calls["quota_errors"] += 1
+            raise FakeAPIError("APIError: [429]: Quota exceeded for quota metric 'Read requests'",
+                               retry_after=self.retry_after)
+
+    # --- st-gsheets-connection 표면 ---
+    def read(self, worksheet: str, ttl=None, **kwargs) -> pd.DataFrame:
+        self._call("read")
+        return frame_from_values(self.spreadsheet._get(worksheet)._trimmed())
+
+    def clear(self, worksheet: str, **kwargs) -> None:
+        self._call("write")
+        try:
+            self.spreadsheet._get(worksheet).rows = []
+        except FakeWorksheetNotFound:
+            self.spreadsheet._sheets[worksheet] = FakeWorksheet(
+                self.spreadsheet, self.spreadsheet._next_id, worksheet)
+            self.spreadsheet._next_id += 1
+
+    def update(self, worksheet: str, data: pd.DataFrame, **kwargs) -> None:
+        self._call("write")
+        ws = self.spreadsheet._get(worksheet)
+        ws.rows = []
+        ws._write_block(0, 0, [list(data.columns)] + data.values.tolist())
@@ -0,0 +1,612 @@
+"""Google Sheets 저장소 백엔드
+
+st-gsheets-connection을 기본으로 사용하고, 실패 시 gspread 직접 연결로 전환합니다.
+
+우리 쓰기가 일어날 때마다 숨김 시트 `_Revisions`에 워크시트별 변경 표식을 새로 기록하므로,
+캐시 재검증 시 작은 시트 하나만 읽고 바뀐 워크시트만 내려받을 수 있습니다.
+행 추가와 변경분 반영은 표식 갱신을 같은 batchUpdate 요청에 실어 보내므로 쓰기 요청이 늘지 않습니다.
+"""
+import random
+import threading
+import uuid
+from typing import List, Optional
+
+import pandas as pd
+import streamlit as st
+from streamlit_gsheets import GSheetsConnection
+
+import modules.time_utils as time_utils
+from modules.storage.base import StorageBackend, FrameDelta, StaleSnapshotError, parse_cell, frame_from_values
+from modules.storage.metrics import registry as metrics
+from modules.storage.quota import shared_governor
+
+
+REVISIONS_SHEET = "_Revisions"
+REVISIONS_HEADER = ["worksheet", "revision", "updated_at"]
+
+# Client methods that each send one API request, and the quota they count against
+_CONNECTION_REQUESTS = {"read": "read", "clear": "write", "update": "write"}
+_SPREADSHEET_REQUESTS = {
+    "worksheet": "read", "add_worksheet": "write",
+    "values_get": "read", "values_batch_get": "read",
+    "values_update": "write", "values_append": "write", "batch_update": "write",
+}
+_WORKSHEET_REQUESTS = {
+    "row_values": "read", "get_all_records": "read",
+    "clear": "write", "update": "write", "append_rows": "write",
+}
+# Spreadsheet methods returning a worksheet, whose requests are metered as well
+_RETURNS_WORKSHEET = ("worksheet", "add_worksheet")
+
+
+def _quote(worksheet_name):
+    return "'" + worksheet_name.replace("'", "''") + "'"
+
+
+def _column_letter(index):
+    """0 -> "A", 26 -> "AA" """
+    letters = ""
+    index += 1
+    while index:
+        index, rem = divmod(index - 1, 26)
+        letters = chr(ord("A") + rem) + letters
+    return letters
+
+
+class _Metered:
+    """Client proxy that charges the quota governor once per API request made through it."""
+
+    def __init__(self, target, requests, charge):
+        self._target = target
+        self._requests = requests
+        self._charge = charge
+
+    def __getattr__(self, name):
+        attr = getattr(self._target, name)
+        kind = self._requests.get(name)
+        if kind is None:
+            return attr
+
+        def _request(*args, **kwargs):
+            self._charge(kind)
+            result = attr(*args, **kwargs)
+            if name in _RETURNS_WORKSHEET:
+                return _Metered(result, _WORKSHEET_REQUESTS, self._charge)
+            return result
+        return _request
+
+
+class GSheetsBackend(StorageBackend):
+    """Google Sheets 워크시트 = 테이블"""
+
+    name = "gsheets"
+
+    def __init__(self, governor=None, conn=None):
+        """
+        Args:
+            governor: QuotaGovernor pacing the API calls (default: the process-wide one).
+            conn: Ready-made connection to use instead of st.connection (e.g. a
+                FakeSheetsConnection in tests). An injected connection is never
+                swapped for the gspread fallback.
+        """
+        # Calls are paced by a process-wide quota governor shared by all sessions
+        self.governor = governor or shared_governor
+
+        self.use_fallback = False
+        self.client = None
+        self.spreadsheet_url = None
+        self._spreadsheet = None
+        # Worksheet handles by title: looking one up is a metadata request, so it is done once
+        self._worksheets = {}
+        # Quota kind of the request in flight per thread (penalized if it gets a 429)
+        self._request_kind = threading.local()
+        self._api_conn = None
+
+        # _Revisions bookkeeping: sheet row of each worksheet's marker, and the
+        # marker our own last write left behind
+        self._revision_rows = None
+        self._written_revisions = {}
+
+        # The connection is opened on first use, not at import time, so a restarted
+        # process can render from disk snapshots before touching the network.
+        self._conn = conn
+        self._connected = conn is not None
+        self._injected = conn is not None
+        if self._injected:
+            self.spreadsheet_url = getattr(conn, "spreadsheet_url", None)
+
+    def _connect(self):
+        if self._connected:
+            return
+        self._connected = True
+
+        # Establish connection using st-gsheets-connection
+        # This looks for [connections.gsheets] in secrets.toml
+        try:
+            self._conn = st.connection("gsheets", type=GSheetsConnection)
+        except Exception as e:
+            print(f"Streamlit Connection unavailable, trying fallback: {e}")
+            self.setup_fallback()
+
+    @property
+    def conn(self):
+        self._connect()
+        return self._conn
+
+    @conn.setter
+    def conn(self, value):
+        self._connected = True
+        self._conn = value
+
+    @property
+    def _api(self):
+        """The connection, with every request it sends charged to the governor."""
+        conn = self.conn
+        if conn is None:
+            return None
+        if self._api_conn is None or self._api_conn._target is not conn:
+            self._api_conn = _Metered(conn, _CONNECTION_REQUESTS, self._charge)
+        return self._api_conn
+
+    def _charge(self, kind):
+        """Takes one token of the given kind for an API request (waits if the budget is spent)."""
+        self._request_kind.kind = kind
+        metrics.note_quota_wait(self.governor.acquire(kind))
+
+    def setup_fallback(self):
+        try:
+            import gspread
+            from google.oauth2.service_account import Credentials
+            import toml
+
+            self.use_fallback = True
+            self._spreadsheet = None
+            self._worksheets = {}
+
+            # Load secrets
+            secrets_path = ".streamlit/secrets.toml"
+            with open(secrets_path, "r", encoding="utf-8") as f:
+                config = toml.load(f)
+
+            gs_config = config.get("connections", {}).get("gsheets", {})
+            self.spreadsheet_url = gs_config.get("spreadsheet")
+
+            if "project_id" in gs_config:
+                 creds = Credentials.from_service_account_info(
+                     gs_config,
+                     scopes=["https://www.googleapis.com/auth/spreadsheets"]
+                 )
+            else:
+                 pass
+
+            self.client = gspread.authorize(creds)
+            print("✅ Fallback (gspread) connected.")
+
+        except Exception as e:
+            print(f"❌ Fallback Setup Failed: {e}")
+            self.conn = None
+
+    @staticmethod
+    def _retry_after(error):
+        """Seconds from a Retry-After header on a quota error, if the server sent one."""
+        response = getattr(error, "response", None)
+        headers = getattr(response, "headers", None) or {}
+        try:
+            return float(headers.get("Retry-After"))
+        except (TypeError, ValueError):
+            return None
+
+    @staticmethod
+    def _is_quota_error(error):
+        error_str = str(error)
+        return "Quota exceeded" in error_str or "429" in error_str
+
+    @staticmethod
+    def _is_missing_worksheet(error):
+        """The worksheet does not exist yet (gspread WorksheetNotFound / unknown range)."""
+        return "WorksheetNotFound" in type(error).__name__ or "Unable to parse range" in str(error)
+
+    def _keep_connection(self, error):
+        """
+        True if a failed call should be retried/raised as is instead of switching
+        to the gspread fallback: quota errors are transient, and an injected
+        connection has no fallback.
+        """
+        return self._injected or self._is_quota_error(error)
+
+    def _retry_operation(self, operation, kind="read", max_retries=3, delay=2):
+        """
+        Runs an operation, retrying if it still hits a quota error.
+        Each API request the operation sends takes its own token from the quota governor
+        (see _Metered), which paces requests before Google rejects them; on a 429 it pauses
+        every caller of the failed request's kind for Retry-After seconds (or an
+        exponential backoff).
+        """
+        self._connect()
+        last_exception = None
+        for i in range(max_retries):
+            self._request_kind.kind = kind
+            try:
+                return operation()
+            except Exception as e:
+                if self._is_quota_error(e):
+                    wait_time = self._retry_after(e) or delay * (2 ** i) + random.uniform(0, 1)
+                    print(f"⚠️ Quota hit. Retrying in {wait_time:.1f}s... (Attempt {i+1}/{max_retries})")
+                    self.governor.penalize(self._request_kind.kind, wait_time)
+                    metrics.note_retry()
+                    last_exception = e
+                else:
+                    raise e
+        print("❌ Max retries reached.")
+        if last_exception:
+            raise last_exception
+        return None
+
+    def quota_status(self):
+        return self.governor.status()
+
+    def _fallback_read(self, worksheet_name):
+        if self.client:
+            try:
+                ws = self._worksheet(self._open_spreadsheet(), worksheet_name)
+                data = ws.get_all_records()
+                return pd.DataFrame(data)
+            except Exception as e:
+                print(f"Fallback read error: {e}")
+                return pd.DataFrame()
+        return pd.DataFrame()
+
+    @property
+    def namespace(self):
+        """Cache key of the spreadsheet this backend talks to."""
+        if self.use_fallback or self._injected:
+            return f"gsheets:{self.spreadsheet_url}"
+        try:
+            return f"gsheets:{st.secrets['connections']['gsheets'].get('spreadsheet', '')}"
+        except Exception:
+            return "gsheets:default"
+
+    def _open_spreadsheet(self):
+        """Returns the (metered) gspread Spreadsheet behind whichever client is active."""
+        if self._spreadsheet is None:
+            self._charge("read")  # opening fetches the spreadsheet metadata
+            if self.use_fallback and self.client:
+                spreadsheet = self.client.open_by_url(self.spreadsheet_url)
+            else:
+                spreadsheet = self.conn.client._open_spreadsheet()
+            self._spreadsheet = _Metered(spreadsheet, _SPREADSHEET_REQUESTS, self._charge)
+        return self._spreadsheet
+
+    def _worksheet(self, sh, worksheet_name, create=False):
+        """Cached worksheet handle (created first if create and it does not exist)."""
+        ws = self._worksheets.get(worksheet_name)
+        if ws is None:
+            try:
+                ws = sh.worksheet(worksheet_name)
+            except Exception as e:
+                if not create or self._is_quota_error(e): raise
+                ws = sh.add_worksheet(title=worksheet_name, rows=1000, cols=20)
+                print(f"Created new worksheet: {worksheet_name}")
+            self._worksheets[worksheet_name] = ws
+        return ws
+
+    def _get_sheet_id(self, sh, worksheet_name):
+        return self._worksheet(sh, worksheet_name).id
+
+    @staticmethod
+    def _cell_data(text):
+        """Builds a Sheets CellData value, keeping numbers/booleans typed like USER_ENTERED does."""
+        value = parse_cell(text)
+        if isinstance(value, bool):
+            return {"userEnteredValue": {"boolValue": value}}
+        if isinstance(value, (int, float)):
+            return {"userEnteredValue": {"numberValue": value}}
+        return {"userEnteredValue": {"stringValue": text}}
+
+    def _load_revision_rows(self, sh):
+        """Reads _Revisions; remembers each worksheet's row and returns {worksheet: marker}."""
+        values = sh.values_get(_quote(REVISIONS_SHEET)).get("values", [])
+        rows, markers = {}, {}
+        for i, row in enumerate(values[1:], start=2):
+            if row and row[0]:
+                rows[row[0]] = i
+                markers[row[0]] = row[1] if len(row) > 1 else ""
+        self._revision_rows = rows
+        return markers
+
+    def _ensure_revisions_sheet(self, sh):
+        try:
+            self._worksheet(sh, REVISIONS_SHEET)
+        except Exception as e:
+            if self._is_quota_error(e): raise
+            ws = sh.add_worksheet(title=REVISIONS_SHEET, rows=100, cols=len(REVISIONS_HEADER))
+            self._worksheets[REVISIONS_SHEET] = ws
+            ws.update(range_name="A1", values=[REVISIONS_HEADER])
+            sh.batch_update({"requests": [{"updateSheetProperties": {
+                "properties": {"sheetId": ws.id, "hidden": True},
+                "fields": "hidden",
+            }}]})
+            self._revision_rows = {}
+
+    def _bump_revision(self, worksheet_name):
+        """
+        Stamps a new marker for a worksheet after we changed it. Failures are only
+        logged: other readers then notice the change once their hard TTL runs out.
+        """
+        marker = uuid.uuid4().hex[:12]
+        updated_at = time_utils.get_current_time_str()
+
+        def _stamp():
+            sh = self._open_spreadsheet()
+            if self._revision_rows is None:
+                self._ensure_revisions_sheet(sh)
+                if self._revision_rows is None:
+                    self._load_revision_rows(sh)
+            row = self._revision_rows.get(worksheet_name)
+            if row is None:
+                response = sh.values_append(
+                    _quote(REVISIONS_SHEET), {"valueInputOption": "RAW"},
+                    {"values": [[worksheet_name, marker, updated_at]]},
+                )
+                # updatedRange looks like "'_Revisions'!A7:C7"
+                updated = response.get("updates", {}).get("updatedRange", "")
+                digits = "".join(ch for ch in updated.rsplit(":", 1)[-1] if ch.isdigit())
+                if digits:
+                    self._revision_rows[worksheet_name] = int(digits)
+            else:
+                sh.values_update(
+                    f"{_quote(REVISIONS_SHEET)}!B{row}:C{row}", {"valueInputOption": "RAW"},
+                    {"values": [[marker, updated_at]]},
+                )
+
+        try:
+            self._retry_operation(_stamp, kind="write")
+            self._written_revisions[worksheet_name] = marker
+        except Exception as e:
+            print(f"Revision stamp failed ({worksheet_name}): {e}")
+            self._written_revisions.pop(worksheet_name, None)
+
+    def _revision_request(self, sh, worksheet_name, marker):
+        """
+        updateCells request writing a new marker into the worksheet's _Revisions row, so it
+        rides in the same batchUpdate as the data change. None until the worksheet has a
+        marker row (the first stamp appends it separately) or if _Revisions is unavailable.
+        """
+        try:
+            if self._revision_rows is None:
+                self._ensure_revisions_sheet(sh)
+                if self._revision_rows is None:
+                    self._load_revision_rows(sh)
+            row = self._revision_rows.get(worksheet_name)
+            if row is None:
+                return None
+            sheet_id = self._get_sheet_id(sh, REVISIONS_SHEET)
+        except Exception as e:
+            if self._is_quota_error(e): raise
+            print(f"Revision row unavailable ({worksheet_name}): {e}")
+            return None
+        # _Revisions rows are 1-based sheet rows; marker and updated_at are columns B:C
+        return {"updateCells": {
+            "range": {"sheetId": sheet_id, "startRowIndex": row - 1, "endRowIndex": row,
+                      "startColumnIndex": 1, "endColumnIndex": 3},
+            "rows": [{"values": [{"userEnteredValue": {"stringValue": marker}},
+                                 {"userEnteredValue": {"stringValue": time_utils.get_current_time_str()}}]}],
+            "fields": "userEnteredValue",
+        }}
+
+    def _batch_update(self, sh, worksheet_name, requests):
+        """
+        Sends a worksheet's requests plus its _Revisions marker as one batchUpdate.
+        Returns the marker it wrote, or None if the marker still needs its own stamp.
+        """
+        marker = uuid.uuid4().hex[:12]
+        stamp = self._revision_request(sh, worksheet_name, marker)
+        sh.batch_update({"requests": requests + ([stamp] if stamp else [])})
+        return marker if stamp else None
+
+    def _note_revision(self, worksheet_name, marker):
+        """Remember the marker a write folded in, or stamp one separately if it could not."""
+        if marker:
+            self._written_revisions[worksheet_name] = marker
+        else:
+            self._bump_revision(worksheet_name)
+
+    # --- StorageBackend ---
+    def revisions(self, worksheet_names):
+        """Current markers from _Revisions (one small read for all worksheets)."""
+        try:
+            markers = self._retry_operation(lambda: self._load_revision_rows(self._open_spreadsheet()))
+        except Exception as e:
+            # No _Revisions sheet yet (nothing written since this feature shipped)
+            print(f"Revision check unavailable: {e}")
+            return {}
+        return {name: markers[name] for name in worksheet_names if markers.get(name)}
+
+    def last_written_revision(self, worksheet_name):
+        return self._written_revisions.get(worksheet_name)
+
+    def read(self, worksheet_name):
+        def _read():
+            if not self.use_fallback:
+                try:
+                    # Caching is DataManager's job (per worksheet), so bypass the connection cache
+                    return self._api.read(worksheet=worksheet_name, ttl=0)
+                except Exception as e:
+                    # Not created yet (Balances, Partitions, ...): empty, not a broken connection
+                    if self._is_missing_worksheet(e): return pd.DataFrame()
+                    if self._keep_connection(e): raise
+                    print(f"GSheets read failed: {e}. Switching to fallback.")
+                    self.setup_fallback()
+                    if not self.use_fallback: raise e
+
+            if self.use_fallback and self.client:
+                return self._fallback_read(worksheet_name)
+            return pd.DataFrame()
+
+        df = self._retry_operation(_read)
+        return df if df is not None else pd.DataFrame()
+
+    def read_many(self, worksheet_names):
+        """Reads several worksheets with a single values.batchGet request."""
+        names = list(worksheet_names)
+        if not names:
+            return {}
+
+        def _batch_get():
+            sh = self._open_spreadsheet()
+            ranges = [_quote(name) for name in names]
+            return sh.values_batch_get(ranges)
+
+        try:
+            response = self._retry_operation(_batch_get)
+        except Exception as e:
+            # e.g. one of the worksheets does not exist yet: read them one by one
+            print(f"Batch read failed: {e}. Reading worksheets individually.")
+            return super().read_many(names)
+
+        value_ranges = response.get("valueRanges", [])
+        return {
+            name: frame_from_values(vr.get("values", []))
+            for name, vr in zip(names, value_ranges)
+        }
+
+    def write(self, worksheet_name, df):
+        def _update():
+            if not self.use_fallback:
+                try:
+                    if self.conn:
+                        self._api.clear(worksheet=worksheet_name) # Clear first to avoid zombies
+                        self._api.update(worksheet=worksheet_name, data=df)
+                        return True
+                except Exception as e:
+                    if self._keep_connection(e): raise
+                    print(f"st.connection update failed: {e}. Switching to fallback.")
+                    self.setup_fallback()
+                    if not self.use_fallback: raise e
+
+            if self.use_fallback and self.client:
+                # Worksheet might not exist yet: created on first write
+                ws = self._worksheet(self._open_spreadsheet(), worksheet_name, create=True)
+                ws.clear()
+                update_values = [df.columns.values.tolist()] + df.astype(str).values.tolist()
+                ws.update(update_values)
+                return True
+            raise RuntimeError("No Google Sheets client available")
+
+        self._retry_operation(_update, kind="write")
+        self._bump_revision(worksheet_name)
+
+    def append(self, worksheet_name, df, header: Optional[List[str]] = None):
+        """Appends the rows (and any new header cells) in one batchUpdate with the marker."""
+        def _append():
+            sh = self._open_spreadsheet()
+            ws = self._worksheet(sh, worksheet_name, create=True)
+            sheet_header = header if header else ws.row_values(1)
+            missing = [c for c in df.columns if c not in sheet_header]
+            requests = []
+            if missing or not sheet_header:
+                # New columns (or an empty sheet): extend the header row once
+                sheet_header = list(sheet_header) + missing
+                requests.append({"updateCells": {
+                    "range": {"sheetId": ws.id, "startRowIndex": 0, "endRowIndex": 1,
+                              "startColumnIndex": 0, "endColumnIndex": len(sheet_header)},
+                    "rows": [{"values": [{"userEnteredValue": {"stringValue": str(c)}} for c in sheet_header]}],
+                    "fields": "userEnteredValue",
+                }})
+
+            values = df.reindex(columns=sheet_header).fillna("").astype(str).values.tolist()
+            requests.append({"appendCells": {
+                "sheetId": ws.id,
+                "rows": [{"values": [self._cell_data(t) for t in r]} for r in values],
+                "fields": "userEnteredValue",
+            }})
+            return sheet_header, self._batch_update(sh, worksheet_name, requests)
+
+        columns, marker = self._retry_operation(_append, kind="write")
+        self._note_revision(worksheet_name, marker)
+        return columns
+
+    def _current_rows(self, sh, worksheet_name, delta: FrameDelta):
+        """
+        Maps the snapshot rows a delta touches to where those ids sit in the sheet now.
+        Reads the header row and the id column in one request, so an update never lands
+        on a row another writer (session, CLI script, restored snapshot) has shifted.
+
+        Returns:
+            (row map or None if the sheet still matches the snapshot, matched flag)
+
+        Raises:
+            StaleSnapshotError: the header changed, or a touched id is gone / duplicated.
+        """
+        column = _column_letter(delta.columns.index(delta.key))
+        response = sh.values_batch_get([f"{_quote(worksheet_name)}!1:1",
+                                        f"{_quote(worksheet_name)}!{column}2:{column}"])
+        header_range, key_range = response.get("valueRanges", [{}, {}])
+        header = (header_range.get("values") or [[]])[0]
+        if [str(h) for h in header] != [str(c) for c in delta.columns]:
+            raise StaleSnapshotError(f"{worksheet_name}: header changed since it was read")
+
+        keys = [str(row[0]) if row else "" for row in key_range.get("values", [])]
+        if keys == delta.row_keys:
+            return None
+        positions = {}
+        for i, k in enumerate(keys):
+            positions[k] = -1 if k in positions else i
+        touched = set(r for r, _, _ in delta.changed_cells) | set(delta.deleted_rows)
+        rows = {}
+        for r in touched:
+            current = positions.get(delta.row_keys[r], -1)
+            if current < 0:
+                raise StaleSnapshotError(f"{worksheet_name}: row {delta.row_keys[r]} changed by another writer")
+            rows[r] = current
+        return rows
+
+    def apply_delta(self, worksheet_name, delta: FrameDelta):
+        """
+        Sends cell updates, row deletions and appends as one batchUpdate request,
+        addressed to the rows the touched ids occupy right now.
+        Returns True if the sheet still matched the snapshot, False if rows had moved.
+        """
+        def _apply():
+            sh = self._open_spreadsheet()
+            sheet_id = self._get_sheet_id(sh, worksheet_name)
+            moved = self._current_rows(sh, worksheet_name, delta)
+            at = (lambda row: row) if moved is None else moved.__getitem__
+            requests = []
+
+            # Sheet row 0 is the header, so data row i lives at sheet row i + 1
+            for row, col, text in delta.changed_cells:
+                row = at(row)
+                requests.append({"updateCells": {
+                    "range": {"sheetId": sheet_id,
+                              "startRowIndex": row + 1, "endRowIndex": row + 2,
+                              "startColumnIndex": col, "endColumnIndex": col + 1},
+                    "rows": [{"values": [self._cell_data(text)]}],
+                    "fields": "userEnteredValue",
+                }})
+
+            # Delete bottom-up so earlier indices stay valid; merge consecutive rows
+            runs = []
+            for row in sorted((at(r) for r in delta.deleted_rows), reverse=True):
+                if runs and runs[-1][0] == row + 2:
+                    runs[-1][0] = row + 1
+                else:
+                    runs.append([row + 1, row + 2])
+            for start, end in runs:
+                requests.append({"deleteDimension": {
+                    "range": {"sheetId": sheet_id, "dimension": "ROWS",
+                              "startIndex": start, "endIndex": end},
+                }})
+
+            if delta.inserted:
+                requests.append({"appendCells": {
+                    "sheetId": sheet_id,
+                    "rows": [{"values": [self._cell_data(t) for t in r]} for r in delta.inserted],
+                    "fields": "userEnteredValue",
+                }})
+
+            return moved is None, self._batch_update(sh, worksheet_name, requests)
+
+        matched, marker = self._retry_operation(_apply, kind="write")
+        self._note_revision(worksheet_name, marker)
+        return matched
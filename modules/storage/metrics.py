@@ -0,0 +1,251 @@
+"""저장소 호출 계측
+
+DataManager가 백엔드를 부를 때마다 (페이지, 작업, 워크시트) 단위로 호출 수, 행 수,
+대략적인 바이트, 소요 시간, 재시도, 한도 대기 시간을 누적하고
+캐시 적중/실패도 함께 셉니다. 프로세스 전역이며 `to_dict()`로 JSON 덤프를 얻습니다.
+"""
+import json
+import threading
+import time
+from collections import deque
+from typing import Optional
+
+import pandas as pd
+
+
+BACKGROUND_PAGE = "(background)"
+
+
+def frame_bytes(df) -> int:
+    """DataFrame 크기 추정치 (전송량 비교용)"""
+    if df is None or not isinstance(df, pd.DataFrame) or df.empty:
+        return 0
+    return int(df.memory_usage(index=False, deep=True).sum())
+
+
+class _CallStats:
+    __slots__ = ("calls", "errors", "rows", "bytes", "seconds", "retries", "quota_wait")
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.rows = 0
+        self.bytes = 0
+        self.seconds = 0.0
+        self.retries = 0
+        self.quota_wait = 0.0
+
+
+class MetricsRegistry:
+    """백엔드 호출/캐시 통계 (스레드 안전)"""
+
+    def __init__(self, recent: int = 200):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._calls = {}      # (page, op, worksheet) -> _CallStats
+        self._cache = {}      # (page, worksheet) -> {"hit": n, "stale": n, "miss": n}
+        self._renders = {}    # page -> 렌더 횟수
+        self._recent = deque(maxlen=recent)
+        self.started_at = time.time()
+
+    # --- 현재 스레드 문맥 ---
+    def start_render(self, page: str) -> None:
+        """페이지 스크립트 실행 시작 (이후 이 스레드의 호출은 page로 집계)"""
+        self._local.page = page
+        with self._lock:
+            self._renders[page] = self._renders.get(page, 0) + 1
+
+    def current_page(self) -> str:
+        return getattr(self._local, "page", None) or BACKGROUND_PAGE
+
+    def note_retry(self) -> None:
+        """진행 중인 호출의 재시도 1회 (백엔드 재시도 루프에서 호출)"""
+        call = getattr(self._local, "call", None)
+        if call is not None:
+            call["retries"] += 1
+
+    def note_quota_wait(self, seconds: float) -> None:
+        """진행 중인 호출이 한도 조절기에서 기다린 시간"""
+        call = getattr(self._local, "call", None)
+        if call is not None:
+            call["quota_wait"] += seconds
+
+    # --- 기록 ---
+    def begin_call(self) -> None:
+        self._local.call = {"retries": 0, "quota_wait": 0.0}
+
+    def end_call(self, op: str, worksheet: str, rows: int = 0, nbytes: int = 0,
+                 seconds: float = 0.0, error: Optional[str] = None) -> None:
+        call = getattr(self._local, "call", None) or {"retries": 0, "quota_wait": 0.0}
+        self._local.call = None
+        page = self.current_page()
+        with self._lock:
+            stats = self._calls.setdefault((page, op, worksheet), _CallStats())
+            stats.calls += 1
+            stats.errors += 1 if error else 0
+            stats.rows += rows
+            stats.bytes += nbytes
+            stats.seconds += seconds
+            stats.retries += call["retries"]
+            stats.quota_wait += call["quota_wait"]
+            self._recent.append({
+                "at": time.time(), "page": page, "op": op, "worksheet": worksheet,
+                "rows": rows, "bytes": nbytes, "seconds": round(seconds, 4),
+                "retries": call["retries"], "quota_wait": round(call["quota_wait"], 3),
+                "error": error,
+            })
+
+    def record_cache(self, worksheet: str, outcome: str) -> None:
+        """캐시 조회 결과 기록 (outcome: "hit" | "stale" | "miss")"""
+        page = self.current_page()
+        with self._lock:
+            counts = self._cache.setdefault((page, worksheet), {"hit": 0, "stale": 0, "miss": 0})
+            counts[outcome] += 1
+
+    def reset(self) -> None:
+        with self._lock:
+            self._calls.clear()
+            self._cache.clear()
+            self._renders.clear()
+            self._recent.clear()
+            self.started_at = time.time()
+
+    # --- 조회 ---
+    def page_summary(self) -> pd.DataFrame:
+        """페이지별 렌더 수, 호출 수, 시간, 바이트, 캐시 적중률"""
+        with self._lock:
+            pages = {}
+            for (page, _, _), stats in self._calls.items():
+                p = pages.setdefault(page, {"calls": 0, "errors": 0, "seconds": 0.0, "bytes": 0,
+                                            "retries": 0, "hits": 0, "lookups": 0})
+                p["calls"] += stats.calls
+                p["errors"] += stats.errors
+                p["seconds"] += stats.seconds
+                p["bytes"] += stats.bytes
+                p["retries"] += stats.retries
+            for (page, _), counts in self._cache.items():
+                p = pages.setdefault(page, {"calls": 0, "errors": 0, "seconds": 0.0, "bytes": 0,
+                                            "retries": 0, "hits": 0, "lookups": 0})
+                p["hits"] += counts["hit"] + counts["stale"]
+                p["lookups"] += sum(counts.values())
+            renders = dict(self._renders)
+
+        rows = []
+        for page, p in pages.items():
+            n = renders.get(page, 0)
+            rows.append({
+                "page": page,
+                "renders": n,
+                "calls": p["calls"],
+                "calls_per_render": round(p["calls"] / n, 2) if n else None,
+                "seconds": round(p["seconds"], 2),
+                "kb": round(p["bytes"] / 1024, 1),
+                "retries": p["retries"],
+                "errors": p["errors"],
+                "cache_hit_rate": round(p["hits"] / p["lookups"], 2) if p["lookups"] else None,
+            })
+        return pd.DataFrame(rows)
+
+    def to_dict(self) -> dict:
+        """JSON 직렬화 가능한 전체 덤프"""
+        with self._lock:
+            calls = [
+                {"page": page, "op": op, "worksheet": ws, "calls": s.calls, "errors": s.errors,
+                 "rows": s.rows, "bytes": s.bytes, "seconds": round(s.seconds, 4),
+                 "retries": s.retries, "quota_wait": round(s.quota_wait, 3)}
+                for (page, op, ws), s in self._calls.items()
+            ]
+            cache = [
+                {"page": page, "worksheet": ws, **counts}
+                for (page, ws), counts in self._cache.items()
+            ]
+            return {
+                "started_at": self.started_at,
+                "dumped_at": time.time(),
+                "renders": dict(self._renders),
+                "calls": calls,
+                "cache": cache,
+                "recent": list(self._recent),
+            }
+
+    def to_json(self, **kwargs) -> str:
+        return json.dumps(self.to_dict(), ensure_ascii=False, **kwargs)
+
+
+class InstrumentedBackend:
+    """StorageBackend 래퍼: 데이터 입출력 메서드 호출을 registry에 기록하고 나머지는 그대로 위임"""
+
+    def __init__(self, backend, registry: MetricsRegistry):
+        self._backend = backend
+        self._registry = registry
+
+    def __getattr__(self, name):
+        return getattr(self._backend, name)
+
+    def _measure(self, op, worksheet, func, size):
+        self._registry.begin_call()
+        started = time.perf_counter()
+        error = None
+        result = None
+        try:
+            result = func()
+            return result
+        except Exception as e:
+            error = str(e)[:200]
+            raise
+        finally:
+            rows, nbytes = size(result) if error is None else (0, 0)
+            self._registry.end_call(op, worksheet, rows=rows, nbytes=nbytes,
+                                    seconds=time.perf_counter() - started, error=error)
+
+    @staticmethod
+    def _frame_size(df):
+        return (len(df) if isinstance(df, pd.DataFrame) else 0), frame_bytes(df)
+
+    @staticmethod
+    def _frames_size(frames):
+        frames = frames or {}
+        return (sum(len(df) for df in frames.values() if df is not None),
+                sum(frame_bytes(df) for df in frames.values()))
+
+    def read(self, worksheet_name):
+        return self._measure("read", worksheet_name,
+                             lambda: self._backend.read(worksheet_name), self._frame_size)
+
+    def read_many(self, worksheet_names):
+        names = list(worksheet_names)
+        return self._measure("read_many", ",".join(names),
+                             lambda: self._backend.read_many(names), self._frames_size)
+
+    def read_where(self, worksheet_name, filters):
+        return self._measure("read_where", worksheet_name,
+                             lambda: self._backend.read_where(worksheet_name, filters), self._frame_size)
+
+    def revisions(self, worksheet_names):
+        names = list(worksheet_names)
+        return self._measure("revisions", ",".join(names),
+                             lambda: self._backend.revisions(names), lambda r: (len(r or {}), 0))
+
+    def write(self, worksheet_name, df):
+        return self._measure("write", worksheet_name,
+                             lambda: self._backend.write(worksheet_name, df),
+                             lambda _: self._frame_size(df))
+
+    def append(self, worksheet_name, df, header=None):
+        return self._measure("append", worksheet_name,
+                             lambda: self._backend.append(worksheet_name, df, header=header),
+                             lambda _: self._frame_size(df))
+
+    def apply_delta(self, worksheet_name, delta):
+        def _size(_):
+            rows = len(set(r for r, _, _ in delta.changed_cells)) + len(delta.deleted_rows) + len(delta.inserted)
+            nbytes = sum(len(str(t)) for _, _, t in delta.changed_cells)
+            nbytes += sum(len(str(t)) for row in delta.inserted for t in row)
+            return rows, nbytes
+
+        return self._measure("apply_delta", worksheet_name,
+                             lambda: self._backend.apply_delta(worksheet_name, delta), _size)
+
+
+# 프로세스 공유 인스턴스
+registry = MetricsRegistry()
@@ -0,0 +1,154 @@
+"""월 단위 파티션 (Logs / Missions)
+
+계속 늘어나는 워크시트를 월별 샤드로 나눕니다.
+원래 워크시트(예: "Logs")는 아직 닫히지 않은 최근 달의 행만 담는 현재 파티션이고,
+지난 달의 행은 archive로 "Logs_202609" 같은 월별 샤드에 옮겨집니다.
+쓰기(append/행 단위 수정)는 늘 현재 파티션으로 가고, 샤드는 옮겨진 뒤 바뀌지 않습니다.
+
+Missions는 날짜 대신 핫/콜드로 나눕니다. Missions 워크시트(활성 집합)에는 최근 MISSION_HOT_DAYS일의
+미션과 날짜와 상관없이 모든 Pending 미션이 남고, 그보다 오래되어 처리가 끝난 미션만 샤드로 옮겨집니다.
+그래서 활성 구간 안의 날짜나 Pending 조회는 Missions 워크시트만 읽으면 됩니다.
+
+어떤 샤드가 있는지는 Partitions 워크시트(샤드당 한 행)에 기록합니다:
+    sheet, base, month, rows, Timestamp
+"""
+from typing import Iterable, List, Optional, Tuple
+
+import pandas as pd
+
+
+PARTITION_SHEET = "Partitions"
+PARTITION_COLUMNS = ["sheet", "base", "month", "rows", "Timestamp"]
+
+# 파티션하는 워크시트 -> 월을 정하는 날짜 컬럼
+PARTITIONED_SHEETS = {
+    "Logs": "Timestamp",
+    "Missions": "date",
+}
+
+# archive 시 현재 파티션에 남길 달 수 (1 = 이번 달만)
+DEFAULT_KEEP_MONTHS = 1
+
+
+# Missions 활성 집합: 최근 이만큼의 날짜 + 이 상태의 미션
+MISSION_HOT_DAYS = 7
+MISSION_HOT_STATUSES = ("Pending",)
+
+
+def shard_name(base: str, month: str) -> str:
+    """("Logs", "2026-09") -> "Logs_202609" """
+    return f"{base}_{month.replace('-', '')}"
+
+
+def base_of(worksheet_name: str) -> str:
+    """샤드 이름이면 원래 워크시트 이름, 아니면 그대로"""
+    base, _, suffix = worksheet_name.rpartition("_")
+    if base in PARTITIONED_SHEETS and len(suffix) == 6 and suffix.isdigit():
+        return base
+    return worksheet_name
+
+
+def months_of(values: pd.Series) -> pd.Series:
+    """날짜/일시 값 -> "YYYY-MM" (읽을 수 없는 값은 "")"""
+    dates = pd.to_datetime(values, errors="coerce")
+    return dates.dt.strftime("%Y-%m").fillna("")
+
+
+def month_range(start, end) -> Tuple[Optional[str], Optional[str]]:
+    """날짜 범위 -> (시작 월, 끝 월). 비어 있는 쪽은 None (열린 범위)"""
+    def _month(value):
+        if value is None:
+            return None
+        stamp = pd.to_datetime(value, errors="coerce")
+        return None if pd.isna(stamp) else stamp.strftime("%Y-%m")
+    return _month(start), _month(end)
+
+
+def shards_for(manifest: pd.DataFrame, base: str, start=None, end=None) -> List[str]:
+    """날짜 범위와 겹치는 base의 샤드 이름 (월 순서)
+
+    Args:
+        manifest: Partitions 프레임
+        start, end: 날짜 범위 (None이면 그쪽으로 열린 범위)
+    """
+    if manifest.empty or "base" not in manifest.columns:
+        return []
+    rows = manifest[manifest["base"].astype(str) == base]
+    months = rows["month"].astype(str)
+    first, last = month_range(start, end)
+    if first:
+        rows, months = rows[months >= first], months[months >= first]
+    if last:
+        rows, months = rows[months <= last], months[months <= last]
+    return list(rows.assign(_month=months).sort_values("_month")["sheet"].astype(str))
+
+
+def in_range(df: pd.DataFrame, column: str, start=None, end=None) -> pd.DataFrame:
+    """column의 날짜가 [start, end] 안인 행 (날짜 단위, 양 끝 포함)"""
+    if df.empty or column not in df.columns or (start is None and end is None):
+        return df
+    days = pd.to_datetime(df[column], errors="coerce").dt.normalize()
+    mask = days.notna()
+    if start is not None:
+        mask &= days >= pd.Timestamp(start).normalize()
+    if end is not None:
+        mask &= days <= pd.Timestamp(end).normalize()
+    return df[mask]
+
+
+def closed_months(df: pd.DataFrame, column: str, today, keep_months: int = DEFAULT_KEEP_MONTHS) -> List[str]:
+    """현재 파티션에서 샤드로 옮길 달 (오래된 순)
+
+    Args:
+        today: 기준 날짜. 이 날이 속한 달부터 keep_months개 달은 남깁니다
+    """
+    if df.empty or column not in df.columns:
+        return []
+    cutoff = (pd.Timestamp(today).to_period("M") - (max(keep_months, 1) - 1)).strftime("%Y-%m")
+    months = sorted(set(months_of(df[column])) - {""})
+    return [m for m in months if m < cutoff]
+
+
+def hot_since(today, hot_days: int = MISSION_HOT_DAYS) -> str:
+    """활성 구간의 첫 날짜 (today 포함 hot_days일)"""
+    return (pd.Timestamp(today).normalize() - pd.Timedelta(days=max(hot_days, 1) - 1)).strftime("%Y-%m-%d")
+
+
+def cold_missions(df: pd.DataFrame, today, hot_days: int = MISSION_HOT_DAYS) -> pd.Series:
+    """샤드로 옮길 미션 (활성 구간보다 오래되었고 Pending이 아닌 행)"""
+    if df.empty or "date" not in df.columns:
+        return pd.Series(False, index=df.index)
+    days = pd.to_datetime(df["date"], errors="coerce")
+    old = days < pd.Timestamp(hot_since(today, hot_days))
+    if "status" in df.columns:
+        old &= ~df["status"].isin(MISSION_HOT_STATUSES)
+    return old
+
+
+def manifest_row(base: str, month: str, rows: int, timestamp: str) -> dict:
+    """Partitions 워크시트 행"""
+    return {"sheet": shard_name(base, month), "base": base, "month": month,
+            "rows": int(rows), "Timestamp": timestamp}
+
+
+class PartitionedKeys(dict):
+    """워크시트 -> id 컬럼 매핑. 샤드는 원래 워크시트의 id 컬럼을 씁니다"""
+
+    def get(self, worksheet_name, default=None):
+        return super().get(base_of(worksheet_name), default)
+
+    def __contains__(self, worksheet_name):
+        return super().__contains__(base_of(worksheet_name))
+
+    def __getitem__(self, worksheet_name):
+        return super().__getitem__(base_of(worksheet_name))
+
+
+def concat(frames: Iterable[pd.DataFrame]) -> pd.DataFrame:
+    """샤드와 현재 파티션을 이어 붙인 프레임 (컬럼은 등장 순 합집합)"""
+    frames = [f for f in frames if f is not None and not f.empty]
+    if not frames:
+        return pd.DataFrame()
+    if len(frames) == 1:
+        return frames[0]
+    return pd.concat(frames, ignore_index=True, sort=False)
@@ -0,0 +1,102 @@
+"""Google Sheets API 호출량 조절기
+
+프로세스 전체(모든 세션)가 공유하는 토큰 버킷으로 읽기/쓰기 호출을 분당 한도 안에서 배분합니다.
+429를 받은 뒤에 잠드는 대신 한도에 닿기 전에 호출을 늦추고,
+서버가 Retry-After를 주면 그 시간 동안 해당 종류의 호출을 모두 멈춥니다.
+"""
+import threading
+import time
+from typing import Optional
+
+
+# Sheets API 기본 한도: 사용자(서비스 계정)당 분당 읽기 60회, 쓰기 60회
+DEFAULT_READS_PER_MINUTE = 60
+DEFAULT_WRITES_PER_MINUTE = 60
+
+
+class _TokenBucket:
+    def __init__(self, per_minute: int):
+        self.capacity = float(per_minute)
+        self.tokens = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+
+    def refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + max(0.0, now - self.updated) * self.rate)
+        self.updated = now
+
+
+class QuotaGovernor:
+    """읽기/쓰기 분당 예산을 관리하는 토큰 버킷 묶음 (스레드 안전)"""
+
+    def __init__(self, reads_per_minute: int = DEFAULT_READS_PER_MINUTE,
+                 writes_per_minute: int = DEFAULT_WRITES_PER_MINUTE):
+        self._lock = threading.Lock()
+        self._buckets = {}
+        self.configure(reads_per_minute, writes_per_minute)
+
+    def configure(self, reads_per_minute: int, writes_per_minute: int) -> None:
+        """분당 한도 변경 (남은 토큰은 새 한도로 초기화)"""
+        with self._lock:
+            self._buckets = {
+                "read": _TokenBucket(int(reads_per_minute)),
+                "write": _TokenBucket(int(writes_per_minute)),
+            }
+
+    def acquire(self, kind: str, max_wait: float = 60.0) -> float:
+        """호출 1회분 토큰 확보. 필요하면 잠시 대기하고 대기한 시간(초)을 반환
+
+        Args:
+            kind: "read" 또는 "write"
+            max_wait: 최대 대기 시간. 넘으면 토큰 없이 진행 (서버 429는 재시도로 처리)
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                bucket = self._buckets[kind]
+                now = time.monotonic()
+                bucket.refill(now)
+                if now < bucket.blocked_until:
+                    wait = bucket.blocked_until - now
+                elif bucket.tokens >= 1:
+                    bucket.tokens -= 1
+                    return waited
+                else:
+                    wait = (1 - bucket.tokens) / bucket.rate
+
+            wait = min(wait, max_wait - waited)
+            if wait <= 0:
+                return waited
+            time.sleep(wait)
+            waited += wait
+
+    def penalize(self, kind: Optional[str], seconds: float) -> None:
+        """서버가 한도 초과를 알린 경우 해당 종류(None이면 전체) 호출을 seconds 동안 중지"""
+        with self._lock:
+            now = time.monotonic()
+            kinds = [kind] if kind else list(self._buckets)
+            for k in kinds:
+                bucket = self._buckets[k]
+                bucket.blocked_until = max(bucket.blocked_until, now + seconds)
+                # 대기가 끝나면 한 번만 시도하고 이후로는 분당 속도로 다시 채움
+                bucket.tokens = 1.0
+                bucket.updated = bucket.blocked_until
+
+    def status(self) -> dict:
+        """UI 표시용 남은 예산 {"read": {"remaining", "limit", "blocked_for"}, ...}"""
+        with self._lock:
+            now = time.monotonic()
+            result = {}
+            for kind, bucket in self._buckets.items():
+                bucket.refill(now)
+                result[kind] = {
+                    "remaining": int(bucket.tokens),
+                    "limit": int(bucket.capacity),
+                    "blocked_for": max(0.0, bucket.blocked_until - now),
+                }
+            return result
+
+
+# 프로세스 공유 인스턴스 (한도는 factory가 설정값으로 조정)
+shared_governor = QuotaGovernor()
@@ -0,0 +1,148 @@
+"""워크시트 프레임 디스크 스냅샷
+
+WorksheetCache에 설치된 프레임을 워크시트마다 pickle 파일로 남겨 두고,
+프로세스가 재시작되면(배포, 인스턴스 재기동) 다시 읽어 첫 화면을 네트워크 없이 그립니다.
+파일 형식이 바뀌면 SCHEMA_VERSION을 올립니다. 버전이 다른 파일은 무시됩니다.
+
+로그 추가처럼 잦은 변경마다 시트 전체를 다시 쓰지 않도록, 바뀐 프레임은 save_delay초 동안 모았다가
+워크시트마다 마지막 것만 한 번 기록합니다 (프로세스 종료 시 남은 것도 기록).
+비밀번호 해시가 든 Users 같은 인증 정보 워크시트는 디스크에 남기지 않습니다.
+"""
+import atexit
+import hashlib
+import os
+import pickle
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+import pandas as pd
+
+
+SCHEMA_VERSION = 1
+DEFAULT_SNAPSHOT_DIR = "data/snapshots"
+# 이보다 오래된 스냅샷은 시작 시 버리고 원격에서 새로 읽음
+DEFAULT_MAX_AGE = 7 * 24 * 3600
+# 변경된 프레임을 모아 두었다가 기록하는 간격(초)
+DEFAULT_SAVE_DELAY = 30.0
+# 디스크에 남기지 않는 워크시트 (인증 정보)
+PRIVATE_WORKSHEETS = ("Users",)
+
+
+class SnapshotStore:
+    """(namespace, worksheet) -> 디스크의 (DataFrame, loaded_at)"""
+
+    def __init__(self, directory: str = DEFAULT_SNAPSHOT_DIR, save_delay: float = DEFAULT_SAVE_DELAY,
+                 private=PRIVATE_WORKSHEETS):
+        """
+        Args:
+            save_delay: 변경을 모으는 시간(초). 0이면 schedule() 즉시 기록
+            private: 기록하지 않는 워크시트 이름들
+        """
+        self.directory = directory
+        self.save_delay = save_delay
+        self.private = set(private)
+        self._dirty = {}
+        self._lock = threading.Lock()
+        self._timer = None
+        atexit.register(self.flush)
+
+    def _path(self, namespace: str, worksheet_name: str) -> str:
+        digest = hashlib.sha1(f"{namespace}\0{worksheet_name}".encode("utf-8")).hexdigest()[:16]
+        return os.path.join(self.directory, f"{digest}.pkl")
+
+    def schedule(self, namespace: str, worksheet_name: str, df: pd.DataFrame, loaded_at: float) -> None:
+        """save_delay 뒤에 기록 예약 (그 사이 같은 워크시트가 다시 바뀌면 마지막 프레임만 기록)
+
+        df는 이후 수정되지 않는 프레임이어야 합니다 (WorksheetCache 항목처럼).
+        """
+        if worksheet_name in self.private:
+            return
+        if self.save_delay <= 0:
+            self.save(namespace, worksheet_name, df, loaded_at)
+            return
+        with self._lock:
+            self._dirty[(namespace, worksheet_name)] = (df, loaded_at)
+            if self._timer is None:
+                self._timer = threading.Timer(self.save_delay, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def flush(self) -> None:
+        """예약된 스냅샷을 지금 모두 기록"""
+        with self._lock:
+            dirty, self._dirty = self._dirty, {}
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+        for (namespace, worksheet_name), (df, loaded_at) in dirty.items():
+            try:
+                self.save(namespace, worksheet_name, df, loaded_at)
+            except Exception as e:
+                print(f"Snapshot save error ({worksheet_name}): {e}")
+
+    def save(self, namespace: str, worksheet_name: str, df: pd.DataFrame, loaded_at: float) -> None:
+        """스냅샷 기록 (임시 파일에 쓴 뒤 교체하므로 읽는 쪽이 반쯤 쓴 파일을 보지 않음)"""
+        if worksheet_name in self.private:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(namespace, worksheet_name)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        payload = {
+            "schema": SCHEMA_VERSION,
+            "namespace": namespace,
+            "worksheet": worksheet_name,
+            "loaded_at": loaded_at,
+            "frame": df,
+        }
+        with open(tmp_path, "wb") as f:
+            pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def _read_payload(path: str) -> Optional[dict]:
+        try:
+            with open(path, "rb") as f:
+                payload = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"Snapshot load error ({path}): {e}")
+            return None
+        if not isinstance(payload, dict) or payload.get("schema") != SCHEMA_VERSION:
+            return None
+        return payload
+
+    def load_all(self, namespace: str,
+                 max_age: Optional[float] = DEFAULT_MAX_AGE) -> Dict[str, Tuple[pd.DataFrame, float]]:
+        """namespace의 스냅샷 전체 {워크시트명: (DataFrame, loaded_at)}
+
+        스키마가 다르거나 max_age보다 오래된 파일은 건너뜁니다.
+        """
+        if not os.path.isdir(self.directory):
+            return {}
+        now = time.time()
+        result = {}
+        for filename in os.listdir(self.directory):
+            if not filename.endswith(".pkl"):
+                continue
+            path = os.path.join(self.directory, filename)
+            payload = self._read_payload(path)
+            if payload is None or payload.get("namespace") != namespace:
+                continue
+            if payload["worksheet"] in self.private:
+                # Written before such worksheets were kept off disk
+                os.remove(path)
+                continue
+            if max_age is not None and now - payload["loaded_at"] > max_age:
+                continue
+            result[payload["worksheet"]] = (payload["frame"], payload["loaded_at"])
+        return result
+
+    def delete(self, namespace: str, worksheet_name: str) -> None:
+        with self._lock:
+            self._dirty.pop((namespace, worksheet_name), None)
+        try:
+            os.remove(self._path(namespace, worksheet_name))
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,201 @@
+"""SQLite 저장소 백엔드
+
+워크시트 하나를 테이블 하나로 저장합니다. 컬럼은 시트처럼 동적으로 늘어나며,
+id 컬럼과 자주 쓰는 조회 컬럼에는 인덱스를 생성하고
+변경분은 행 단위 INSERT/UPDATE/DELETE로 반영합니다.
+"""
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import List, Optional
+
+import pandas as pd
+
+from modules.storage.base import StorageBackend, FrameDelta, cell_str, parse_cell
+from modules.storage.partition import base_of
+
+
+# 조회 조건으로 자주 쓰이는 컬럼 (워크시트별)
+SECONDARY_INDEXES = {
+    "Missions": [("assignee", "date"), ("status",)],
+    "MissionDefinitions": [("assignee",)],
+    "Logs": [("User", "Type")],
+    "Praise": [("user_name",)],
+    "Reading": [("user_name",)],
+    "WeeklySchedule": [("assignee",)],
+}
+
+
+def _q(identifier: str) -> str:
+    """SQL 식별자 인용"""
+    return '"' + str(identifier).replace('"', '""') + '"'
+
+
+class SQLiteBackend(StorageBackend):
+    """로컬 디스크 SQLite 파일 기반 저장소"""
+
+    name = "sqlite"
+
+    def __init__(self, path: str = "data/family_mission.db", key_columns: Optional[dict] = None):
+        """
+        Args:
+            path: DB 파일 경로 (':memory:' 가능)
+            key_columns: 워크시트명 -> id 컬럼 (인덱스 및 행 단위 갱신에 사용)
+        """
+        self.path = path
+        self.key_columns = key_columns or {}
+        self._lock = threading.RLock()
+        self._memory_conn = None
+
+        if path != ":memory:":
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+        else:
+            # 메모리 DB는 연결이 닫히면 사라지므로 하나를 공유
+            self._memory_conn = sqlite3.connect(":memory:", check_same_thread=False)
+
+        with self._session() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+
+    @contextmanager
+    def _session(self):
+        """잠금을 잡고 연결을 열어 준 뒤 닫음 (메모리 DB는 공유 연결 유지)"""
+        with self._lock:
+            if self._memory_conn is not None:
+                yield self._memory_conn
+                return
+            conn = sqlite3.connect(self.path, timeout=10)
+            try:
+                yield conn
+            finally:
+                conn.close()
+
+    @property
+    def namespace(self):
+        return f"sqlite:{os.path.abspath(self.path) if self.path != ':memory:' else id(self)}"
+
+    @staticmethod
+    def _to_db_value(value):
+        return parse_cell(cell_str(value))
+
+    def _table_columns(self, conn, table) -> List[str]:
+        rows = conn.execute(f"PRAGMA table_info({_q(table)})").fetchall()
+        return [r[1] for r in rows]
+
+    def _ensure_table(self, conn, table, columns) -> List[str]:
+        """테이블/컬럼/인덱스 보장 후 현재 컬럼 순서 반환"""
+        existing = self._table_columns(conn, table)
+        if not existing:
+            cols_sql = ", ".join(_q(c) for c in columns)
+            conn.execute(f"CREATE TABLE {_q(table)} ({cols_sql})")
+            existing = list(columns)
+        else:
+            for c in columns:
+                if c not in existing:
+                    conn.execute(f"ALTER TABLE {_q(table)} ADD COLUMN {_q(c)}")
+                    existing.append(c)
+
+        # 월별 샤드(Logs_202609 등)도 원래 워크시트와 같은 인덱스를 가짐
+        index_sets = list(SECONDARY_INDEXES.get(base_of(table), []))
+        key = self.key_columns.get(table)
+        if key:
+            index_sets.insert(0, (key,))
+        for cols in index_sets:
+            if all(c in existing for c in cols):
+                name = f"idx_{table}_{'_'.join(cols)}"
+                conn.execute(
+                    f"CREATE INDEX IF NOT EXISTS {_q(name)} ON {_q(table)} ({', '.join(_q(c) for c in cols)})"
+                )
+        return existing
+
+    def _insert(self, conn, table, columns, rows):
+        placeholders = ", ".join("?" for _ in columns)
+        conn.executemany(
+            f"INSERT INTO {_q(table)} ({', '.join(_q(c) for c in columns)}) VALUES ({placeholders})",
+            rows,
+        )
+
+    def _frame_rows(self, df, columns):
+        return [
+            tuple(self._to_db_value(v) for v in row)
+            for row in df.reindex(columns=columns).itertuples(index=False, name=None)
+        ]
+
+    # --- StorageBackend ---
+    def read(self, worksheet_name):
+        with self._session() as conn:
+            if not self._table_columns(conn, worksheet_name):
+                return pd.DataFrame()
+            return pd.read_sql_query(f"SELECT * FROM {_q(worksheet_name)} ORDER BY rowid", conn)
+
+    def read_many(self, worksheet_names):
+        frames = {}
+        with self._session() as conn:
+            for name in worksheet_names:
+                if not self._table_columns(conn, name):
+                    frames[name] = pd.DataFrame()
+                else:
+                    frames[name] = pd.read_sql_query(f"SELECT * FROM {_q(name)} ORDER BY rowid", conn)
+        return frames
+
+    def read_where(self, worksheet_name, filters):
+        with self._session() as conn:
+            columns = self._table_columns(conn, worksheet_name)
+            if not columns:
+                return pd.DataFrame()
+            clauses, params = [], []
+            for col, value in filters.items():
+                if col not in columns:
+                    continue
+                if isinstance(value, (list, tuple, set)):
+                    values = [self._to_db_value(v) for v in value]
+                    if not values:
+                        return pd.DataFrame(columns=columns)
+                    clauses.append(f"{_q(col)} IN ({', '.join('?' for _ in values)})")
+                    params.extend(values)
+                else:
+                    clauses.append(f"{_q(col)} = ?")
+                    params.append(self._to_db_value(value))
+            where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+            return pd.read_sql_query(
+                f"SELECT * FROM {_q(worksheet_name)}{where} ORDER BY rowid", conn, params=params
+            )
+
+    def write(self, worksheet_name, df):
+        with self._session() as conn:
+            with conn:
+                conn.execute(f"DROP TABLE IF EXISTS {_q(worksheet_name)}")
+                columns = self._ensure_table(conn, worksheet_name, list(df.columns))
+                self._insert(conn, worksheet_name, columns, self._frame_rows(df, columns))
+
+    def append(self, worksheet_name, df, header=None):
+        with self._session() as conn:
+            with conn:
+                columns = self._ensure_table(conn, worksheet_name, list(header or []) + [
+                    c for c in df.columns if c not in (header or [])
+                ])
+                self._insert(conn, worksheet_name, columns, self._frame_rows(df, columns))
+            return columns
+
+    def apply_delta(self, worksheet_name, delta: FrameDelta):
+        key = delta.key
+        with self._session() as conn:
+            with conn:
+                table = _q(worksheet_name)
+                self._ensure_table(conn, worksheet_name, delta.columns)
+                for row, col, text in delta.changed_cells:
+                    conn.execute(
+                        f"UPDATE {table} SET {_q(delta.columns[col])} = ? WHERE {_q(key)} = ?",
+                        (parse_cell(text), parse_cell(delta.row_keys[row])),
+                    )
+                deleted_keys = [parse_cell(delta.row_keys[r]) for r in delta.deleted_rows]
+                if deleted_keys:
+                    conn.executemany(
+                        f"DELETE FROM {table} WHERE {_q(key)} = ?",
+                        [(k,) for k in deleted_keys],
+                    )
+                if delta.inserted:
+                    self._insert(conn, worksheet_name, delta.columns,
+                                 [tuple(parse_cell(t) for t in r) for r in delta.inserted])
@@ -76,10 +76,24 @@ def render_sidebar(authenticator=None):
             st.session_state["target_child_name"] = selected
             
             st.caption(f"현재 **{selected}**의 데이터를 보고 있습니다.")
+            render_balance_caption(selected)
+            
+            # Google Sheets API 남은 예산 (분당)
+            from modules.db_manager import db_manager
+            quota = db_manager.quota_status()
+            if quota:
+                r, w = quota["read"], quota["write"]
+                msg = f"API 여유: 읽기 {r['remaining']}/{r['limit']} · 쓰기 {w['remaining']}/{w['limit']} (분당)"
+                if r["blocked_for"] or w["blocked_for"]:
+                    msg += f" ⏳ {max(r['blocked_for'], w['blocked_for']):.0f}초 대기 중"
+                st.caption(msg)
+            
+            render_storage_metrics(db_manager)
         else:
             # Child Role
             st.session_state["target_child_name"] = st.session_state.get("name")
             st.caption(f"**{st.session_state.get('name')}**의 보물지도")
+            render_balance_caption(st.session_state.get("name"))
 
         st.divider()
         
@@ -100,16 +114,60 @@ def render_sidebar(authenticator=None):
         """, unsafe_allow_html=True)
 
 
+def render_balance_caption(user_name):
+    """One-line wallet balance of a child, read from the small Balances table."""
+    from modules.db_manager import db_manager
+    balance = db_manager.get_balance(user_name)
+    if not balance:
+        return
+    try:
+        money = int(float(balance.get("money", 0)))
+        coupons = int(float(balance.get("coupons", 0)))
+    except (TypeError, ValueError):
+        return
+    st.caption(f"💰 용돈 {money:,}원 · 🎫 쿠폰 {coupons}장")
+
+
+def render_storage_metrics(db_manager):
+    """
+    Admin-only panel: storage calls, time, bytes and cache hit rate per page
+    since the process started, plus a JSON dump of the raw counters.
+    """
+    registry = db_manager.metrics
+    with st.expander("📊 API 사용량 (페이지별)"):
+        summary = registry.page_summary()
+        if summary.empty:
+            st.caption("아직 기록된 호출이 없습니다.")
+        else:
+            st.dataframe(summary, hide_index=True, width="stretch")
+        
+        col_dl, col_reset = st.columns(2)
+        with col_dl:
+            st.download_button(
+                "JSON 받기", registry.to_json(indent=2),
+                file_name="storage_metrics.json", mime="application/json",
+                width="stretch",
+            )
+        with col_reset:
+            if st.button("초기화", key="reset_storage_metrics", width="stretch"):
+                registry.reset()
+                st.rerun()
+
+
 def handle_submission(action_func, success_msg="저장되었습니다.", error_msg="저장 실패", delay=0.7):
     """
     Executes an action with a spinner, shows toast, and reruns.
     This prevents 'ghost screens' caused by rendering artifacts during long operations.
     Standardized flow: Spinner -> Action -> Toast -> Sleep -> Rerun.
+    All writes made by the action are batched, so each worksheet is written once.
     """
     import time
+    from modules.db_manager import db_manager
     with st.spinner("처리 중..."):
         try:
-            success = action_func()
+            with db_manager.batch() as batch:
+                success = action_func()
+            success = success and batch.ok
         except Exception as e:
             st.error(f"오류 발생: {e}")
             return
@@ -0,0 +1,16 @@
+"""지갑 관련 모듈
+
+도장/용돈/쿠폰 장부 계산, 도장 단가 조회, 쿠폰 보유 현황, 잔액 체크포인트, 잔액 표
+"""
+from .pricing import DEFAULT_STAMP_PRICE, StampPriceResolver, build_price_map, get_resolver
+from .coupons import CouponInventory
+from .checkpoint import Checkpoint
+from .ledger import (STRUCTURED_COLUMNS, WalletSummary, annotate_logs, carry_forward, parse_logs,
+                     price_stamps, coupon_balance, coupon_inventory, summarize)
+from . import balances, checkpoint
+
+__all__ = ['DEFAULT_STAMP_PRICE', 'StampPriceResolver', 'build_price_map', 'get_resolver',
+           'CouponInventory', 'Checkpoint',
+           'STRUCTURED_COLUMNS', 'WalletSummary', 'annotate_logs', 'carry_forward', 'parse_logs',
+           'price_stamps', 'coupon_balance', 'coupon_inventory', 'summarize',
+           'balances', 'checkpoint']
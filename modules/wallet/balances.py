@@ -0,0 +1,155 @@
+"""아이별 잔액 표 (Balances 워크시트)
+
+아이의 잔액 행은 그 아이의 가장 최근 로그까지의 체크포인트입니다.
+보상/쿠폰/정산 로그가 기록될 때마다 같은 배치에서 잔액 행을 새 로그만큼 이어서 갱신하므로,
+지갑 페이지와 사이드바는 로그 전체 대신 이 작은 표 한 장과 (도장 목록용) 마지막 정산 이후 로그만 읽습니다.
+잔액 행의 마지막 로그를 찾지 못하면(로그가 수정/삭제됨) 그 아이의 로그 전체로 다시 계산하고,
+verify()/rebuild()로 Logs와 대조해 표 전체를 점검할 수 있습니다.
+
+잔액 행 (아이당 한 행):
+    User, stamps, money, coupons, lots, last_log, last_at, since, since_at, Timestamp
+    - stamps, money: 마지막 정산 이후 도장 수 / 미정산 용돈
+    - coupons: 보유 쿠폰 수 (lots 장수 합)
+    - lots: 남은 쿠폰 묶음 JSON [[쿠폰명, 획득일시, 장수], ...] (오래된 쿠폰부터 사용 처리)
+    - last_log, last_at / since, since_at: 반영한 마지막 로그 / 마지막 정산 로그의 log_id와 Timestamp
+"""
+import json
+from typing import Callable, Optional
+
+import pandas as pd
+
+import modules.time_utils as time_utils
+from .checkpoint import Checkpoint, position
+from .coupons import LOT_COLUMNS, CouponInventory
+from .ledger import carry_forward
+from .pricing import StampPriceResolver
+
+
+BALANCE_SHEET = "Balances"
+BALANCE_COLUMNS = ["User", "stamps", "money", "coupons", "lots", "last_log", "last_at", "since", "since_at",
+                   "Timestamp"]
+
+# 잔액 비교 대상 컬럼 (verify)
+_COMPARED = ["stamps", "money", "coupons", "lots", "last_log", "since"]
+
+
+def _text(value) -> str:
+    return "" if value is None or pd.isna(value) else str(value).strip()
+
+
+def _lots(row) -> list:
+    try:
+        return [[str(item), str(at), int(qty)] for item, at, qty in json.loads(row.get("lots") or "[]")]
+    except (TypeError, ValueError, AttributeError):
+        return []
+
+
+def to_row(user_name: str, checkpoint: Checkpoint) -> dict:
+    """Balances 워크시트 행"""
+    lots = checkpoint.lots[LOT_COLUMNS].astype({"qty": int})
+    return {
+        "User": user_name,
+        "stamps": int(checkpoint.stamps),
+        "money": int(checkpoint.money),
+        "coupons": int(lots["qty"].sum()),
+        "lots": json.dumps(lots.values.tolist(), ensure_ascii=False),
+        "last_log": checkpoint.last_log,
+        "last_at": checkpoint.last_at,
+        "since": checkpoint.since,
+        "since_at": checkpoint.since_at,
+        "Timestamp": time_utils.get_current_time_str(),
+    }
+
+
+def from_row(row) -> Optional[Checkpoint]:
+    """잔액 행(dict/Series) -> Checkpoint
+
+    형식이 잘못되었거나 예전 형식이면, 또는 로그 위치를 log_id로 가리킬 수 없는 행이면 None
+    """
+    if row is None or _text(row.get("lots")) == "":
+        return None
+    try:
+        lots = pd.DataFrame(json.loads(row.get("lots")), columns=LOT_COLUMNS)
+        lots["timestamp"] = lots["timestamp"].astype(str)
+        lots["qty"] = lots["qty"].astype(int)
+        checkpoint = Checkpoint(_text(row.get("last_log")), _text(row.get("last_at")),
+                                _text(row.get("since")), _text(row.get("since_at")),
+                                int(float(row["stamps"])), int(float(row["money"])), CouponInventory(lots).lots)
+    except (KeyError, TypeError, ValueError) as e:
+        print(f"Balance parse error: {e}")
+        return None
+    if (checkpoint.last_at and not checkpoint.last_log) or (checkpoint.since_at and not checkpoint.since):
+        return None  # id 없는 예전 로그를 가리키는 행
+    return checkpoint
+
+
+def advance(user_name: str, row, logs_before: pd.DataFrame, new_logs: pd.DataFrame,
+            resolver: StampPriceResolver) -> Optional[dict]:
+    """잔액 행에 new_logs를 반영한 새 행
+
+    Args:
+        row: 기존 잔액 행 (dict/Series). None(또는 from_row가 읽지 못하는 행)이면
+            logs_before + new_logs 전체로 계산
+        logs_before: 그 아이의 기존 로그 (기록 순서). 잔액 행이 있으면 그 행의 last_at 날짜부터만
+            담고 있어도 됨 (checkpoint.tail_start)
+        new_logs: 새로 덧붙는 로그
+        resolver: 그 아이의 도장 단가 조회기
+
+    Returns:
+        새 잔액 행. 잔액 행의 마지막 로그가 logs_before에 없으면(로그가 수정/삭제되었거나
+        더 앞부터 읽어야 함) None - 호출한 쪽에서 로그 전체로 rebuild()
+    """
+    checkpoint = from_row(row) if row is not None else None
+    if checkpoint is None:
+        return rebuild(user_name, pd.concat([logs_before, new_logs], ignore_index=True), resolver)
+    last = position(logs_before, checkpoint.last_log) if checkpoint.last_log else -1
+    if last is None:
+        return None
+    tail = pd.concat([logs_before.iloc[last + 1:], new_logs], ignore_index=True)
+    return to_row(user_name, carry_forward(tail, resolver, checkpoint))
+
+
+def rebuild(user_name: str, logs: pd.DataFrame, resolver: StampPriceResolver) -> dict:
+    """아이의 로그 전체로 잔액 행 계산"""
+    return to_row(user_name, carry_forward(logs, resolver))
+
+
+def verify(balances: pd.DataFrame, logs: pd.DataFrame,
+           resolver_for: Callable[[str], StampPriceResolver]) -> pd.DataFrame:
+    """저장된 잔액과 Logs로 다시 계산한 잔액 비교
+
+    Args:
+        balances: Balances 프레임
+        logs: 전체 Logs 프레임
+        resolver_for: 아이 이름 -> 도장 단가 조회기
+
+    Returns:
+        어긋난 항목만 담은 DataFrame (User, column, stored, expected). 비어 있으면 모두 일치
+    """
+    users = list(dict.fromkeys(list(logs["User"].dropna().astype(str)) if "User" in logs.columns else []))
+    stored = {}
+    if not balances.empty and "User" in balances.columns:
+        stored = {str(r["User"]): r for r in balances.to_dict("records")}
+
+    problems = []
+    for user in users:
+        user_logs = logs[logs["User"].astype(str) == user].reset_index(drop=True)
+        expected = rebuild(user, user_logs, resolver_for(user))
+        row = stored.get(user)
+        for col in _COMPARED:
+            want = expected[col]
+            have = None if row is None else row.get(col)
+            if row is None:
+                same = False
+            elif col == "lots":
+                same = _lots(row) == _lots(expected)
+            elif col in ("last_log", "since"):
+                same = _text(have) == want
+            else:
+                try:
+                    same = int(float(have)) == want
+                except (TypeError, ValueError):
+                    same = False
+            if not same:
+                problems.append({"User": user, "column": col, "stored": have, "expected": want})
+    return pd.DataFrame(problems, columns=["User", "column", "stored", "expected"])
@@ -0,0 +1,86 @@
+"""지갑 잔액 체크포인트
+
+어느 로그까지의 지갑 상태(도장 수, 미정산 용돈, 남은 쿠폰 묶음)를 담는 값입니다.
+저장은 Balances 표(balances.to_row/from_row)가 맡고, 아이의 잔액 행이 곧
+가장 최근 로그까지의 체크포인트입니다. 이후 계산은 체크포인트 뒤에 쌓인 로그만 봅니다.
+위치는 행 번호가 아니라 log_id로 기록하므로, 월별 샤드로 나뉜 Logs 중
+필요한 날짜 이후 구간만 읽어도 체크포인트 위치를 찾을 수 있습니다.
+
+Checkpoint:
+    - last_log, last_at: 반영된 마지막 로그의 log_id와 Timestamp
+    - since, since_at: 마지막 정산 로그의 log_id와 Timestamp (정산 이력이 없으면 빈 값)
+    - stamps, money: 마지막 정산 이후 도장 수 / 미정산 용돈
+    - lots: 남은 쿠폰 묶음 (CouponInventory.lots)
+"""
+from collections import namedtuple
+from typing import Optional, Tuple
+
+import pandas as pd
+
+from .coupons import CouponInventory
+
+
+Checkpoint = namedtuple("Checkpoint", ["last_log", "last_at", "since", "since_at", "stamps", "money", "lots"])
+
+
+def empty() -> Checkpoint:
+    """로그가 하나도 없는 시점"""
+    return Checkpoint("", "", "", "", 0, 0, CouponInventory.empty().lots)
+
+
+def _text(value) -> str:
+    return "" if value is None or pd.isna(value) else str(value).strip()
+
+
+def log_ref(logs: pd.DataFrame, i: int) -> Tuple[str, str]:
+    """i번째 로그의 (log_id, Timestamp)"""
+    row = logs.iloc[i]
+    return _text(row.get("log_id")), _text(row.get("Timestamp"))
+
+
+def position(logs: pd.DataFrame, log_id: str) -> Optional[int]:
+    """log_id 행의 위치 (없으면 None)"""
+    if not log_id or logs.empty or "log_id" not in logs.columns:
+        return None
+    hits = (logs["log_id"].map(_text) == log_id).values.nonzero()[0]
+    return int(hits[-1]) if len(hits) else None
+
+
+def locate(checkpoint: Optional[Checkpoint], logs: pd.DataFrame) -> Optional[Tuple[int, int]]:
+    """logs 안에서 체크포인트 위치 찾기
+
+    Args:
+        logs: 그 아이의 로그 (기록 순서). 마지막 정산 로그부터(정산 이력이 없으면 처음부터) 담고 있어야 함
+
+    Returns:
+        (체크포인트 다음 행 위치, 미정산 구간 시작 위치). 마지막 로그나 정산 로그를 찾지 못하면
+        (수정/삭제되었거나 logs가 그 앞에서 잘림) None
+    """
+    if checkpoint is None:
+        return None
+    if not checkpoint.last_log:
+        # 로그가 하나도 없던 시점이면 logs 전체가 그 뒤 (Timestamp만 있으면 id 없는 예전 로그)
+        return (0, 0) if not checkpoint.last_at else None
+    last = position(logs, checkpoint.last_log)
+    if last is None:
+        return None
+    if not checkpoint.since:
+        return last + 1, 0
+    settled = position(logs, checkpoint.since)
+    if settled is None or settled > last:
+        return None
+    return last + 1, settled + 1
+
+
+def window_start(checkpoint: Optional[Checkpoint]) -> Optional[str]:
+    """체크포인트로 지갑 현황(미정산 도장 목록 포함)을 계산할 때 읽어야 하는 로그의 첫 날짜 (None이면 처음부터)"""
+    if checkpoint is None or not checkpoint.since_at:
+        return None
+    return checkpoint.since_at[:10]
+
+
+def tail_start(checkpoint: Optional[Checkpoint]) -> Optional[str]:
+    """체크포인트에 새 로그를 이어 붙일 때 읽어야 하는 로그의 첫 날짜 (None이면 처음부터)"""
+    if checkpoint is None or not checkpoint.last_at:
+        return None
+    return checkpoint.last_at[:10]
@@ -0,0 +1,103 @@
+"""쿠폰 보유 현황
+
+쿠폰명별로 획득 묶음(lot)을 시간순으로 두고, 사용 수량을 오래된 묶음부터 차감(FIFO)한
+남은 수량만 보관합니다. 장수만큼 항목을 펼치지 않고 Logs 프레임에서 groupby/cumsum 한 번으로
+계산하므로, 쌓인 쿠폰 로그가 많아도 계산량과 메모리는 로그 행 수에만 비례합니다.
+"""
+from typing import Mapping, Optional
+
+import numpy as np
+import pandas as pd
+
+from modules.coupon_utils import total_minutes
+
+
+LOT_COLUMNS = ["item", "timestamp", "qty"]
+
+
+class CouponInventory:
+    """쿠폰명별 보유 수량
+
+    Attributes:
+        lots: 남은 획득 묶음 (item, timestamp, qty), 획득 시각 순
+        counts: 쿠폰명 -> 보유 수량 (보유 0장인 쿠폰은 없음)
+    """
+
+    def __init__(self, lots: pd.DataFrame):
+        self.lots = lots.reset_index(drop=True)
+        self.counts = self.lots.groupby("item", sort=False)["qty"].sum().astype(int)
+
+    @classmethod
+    def empty(cls) -> "CouponInventory":
+        return cls(pd.DataFrame({"item": pd.Series(dtype=object), "timestamp": pd.Series(dtype=object),
+                                 "qty": pd.Series(dtype=int)}))
+
+    @classmethod
+    def from_parsed(cls, logs: pd.DataFrame, parsed: pd.DataFrame,
+                    base_lots: Optional[pd.DataFrame] = None) -> "CouponInventory":
+        """parse_logs 결과로 계산
+
+        Args:
+            logs: 원본 Logs (Timestamp 컬럼 사용)
+            parsed: parse_logs(logs)
+            base_lots: logs 이전 시점의 남은 묶음 (체크포인트). logs의 획득보다 먼저 사용됩니다
+        """
+        kind = parsed["kind"]
+        grants = parsed[(kind == "coupon") & (parsed["qty"] > 0)]
+        timestamps = (logs.loc[grants.index, "Timestamp"] if "Timestamp" in logs.columns
+                      else pd.Series("", index=grants.index))
+        lots = pd.DataFrame({
+            "item": grants["item"].values,
+            "timestamp": timestamps.values,
+            "qty": grants["qty"].values.astype(int),
+        })
+        if base_lots is not None and not base_lots.empty:
+            lots = pd.concat([base_lots[LOT_COLUMNS], lots], ignore_index=True)
+        if lots.empty:
+            return cls.empty()
+
+        lots["_at"] = pd.to_datetime(lots["timestamp"], errors="coerce")
+        lots["_pos"] = np.arange(len(lots))
+        # 같은 시각(또는 시각 없음)은 기록 순서
+        lots = lots.sort_values(["_at", "_pos"], kind="mergesort", na_position="last")
+
+        used = parsed[kind == "coupon_used"].groupby("item")["qty"].sum()
+        consumed = lots["item"].map(used).fillna(0).values
+        granted_before = lots.groupby("item", sort=False)["qty"].cumsum().values - lots["qty"].values
+        # 이 묶음에서 차감되는 수량 = 사용 수량 중 앞선 묶음이 흡수하고 남은 부분
+        remaining = lots["qty"].values - np.clip(consumed - granted_before, 0, lots["qty"].values)
+        lots = lots.assign(qty=remaining.astype(int))
+        return cls(lots.loc[lots["qty"] > 0, LOT_COLUMNS])
+
+    @property
+    def total(self) -> int:
+        """보유 쿠폰 총 장수"""
+        return int(self.counts.sum())
+
+    def minutes(self, selection: Optional[Mapping[str, int]] = None) -> int:
+        """보유(또는 선택한 {쿠폰명: 장수}) 쿠폰의 총 시간(분)"""
+        return total_minutes(self.counts if selection is None else selection)
+
+    def usage_rows(self, user_name: str, selection: Mapping[str, int]) -> list:
+        """선택한 쿠폰의 CouponUsed 로그 행 (log_activities 입력 형식)
+
+        Raises:
+            ValueError: 보유 수량보다 많이 선택한 경우
+        """
+        rows = []
+        for name, qty in selection.items():
+            qty = int(qty)
+            if qty <= 0:
+                continue
+            held = int(self.counts.get(name, 0))
+            if qty > held:
+                raise ValueError(f"'{name}' 쿠폰은 {held}장만 보유 중입니다.")
+            rows.append({
+                "user_name": user_name,
+                "activity_type": "CouponUsed",
+                "content": f"쿠폰: {name}",
+                "reward": -qty,  # 음수로 저장
+                "item_kind": "coupon_used",
+                "item_name": name,
+            })
+        return rows
@@ -0,0 +1,284 @@
+"""지갑 장부 계산
+
+Logs 프레임에서 도장 개수, 미정산 용돈, 보유 쿠폰 수를 계산합니다.
+행마다 반복하지 않고 컬럼 단위(pandas/NumPy)로 파싱, 단가 결합, 합산을 수행하므로
+로그가 수만 건이어도 즉시 계산됩니다. 지갑 페이지와 LogicProcessor가 함께 사용합니다.
+"""
+from collections import namedtuple
+from typing import Callable, Optional
+
+import numpy as np
+import pandas as pd
+
+from .checkpoint import Checkpoint, empty as empty_checkpoint, locate, log_ref
+from .coupons import CouponInventory
+from .pricing import StampPriceResolver, get_resolver
+
+
+# 로그 Type 분류 (페이지는 영문, LogicProcessor는 한글 Type으로 기록)
+STAMP_TYPES = ("Mission", "Praise")
+REWARD_TYPES = ("보상",)          # Content 접두어("도장:"/"쿠폰:")로 종류 구분
+COUPON_GRANT_TYPES = ("Coupon",)
+COUPON_USE_TYPES = ("CouponUsed", "쿠폰사용")
+SETTLEMENT_TYPES = ("Settlement", "정산")
+
+# 보상 로그의 구조화 컬럼 (예전 로그는 비어 있고 Content 문자열로 판별)
+STRUCTURED_COLUMNS = ["item_kind", "item_name", "unit_price_at_grant"]
+
+STAMP_PREFIX = "도장:"
+COUPON_PREFIX = "쿠폰:"
+
+
+# 계산 결과
+#   stamps: 마지막 정산 이후 받은 도장 수
+#   money: 마지막 정산 이후 도장 단가 합 (미정산 용돈)
+#   coupons: 보유 쿠폰 수 (획득 - 사용, 쿠폰명별로 0 미만은 0)
+#   inventory: 쿠폰명별 보유 현황 (CouponInventory, 오래된 쿠폰부터 사용 처리)
+#   active_logs: 마지막 정산 이후의 로그 (원본 컬럼)
+#   stamp_logs: active_logs 중 도장 로그
+WalletSummary = namedtuple("WalletSummary", ["stamps", "money", "coupons", "active_logs", "stamp_logs",
+                                             "inventory"])
+
+
+def _rewards(logs: pd.DataFrame) -> pd.Series:
+    """Reward 컬럼을 숫자로 ('1,000' 허용, 변환 불가는 NaN)"""
+    if "Reward" not in logs.columns:
+        return pd.Series(np.nan, index=logs.index)
+    text = logs["Reward"].astype(str).str.replace(",", "", regex=False).str.strip()
+    return pd.to_numeric(text, errors="coerce")
+
+
+def _after_prefix(content: pd.Series, prefix: str) -> pd.Series:
+    """'도장: 참 잘했어요' -> '참 잘했어요' (접두어가 없으면 NaN)"""
+    parts = content.str.partition(prefix)
+    return parts[2].str.strip().where(parts[1] != "")
+
+
+def _structured(logs: pd.DataFrame, column: str) -> Optional[pd.Series]:
+    """구조화 컬럼 값 (컬럼이 없으면 None, 빈 값은 "")"""
+    if column not in logs.columns:
+        return None
+    return logs[column].fillna("").astype(str).str.strip()
+
+
+def _text_kind(types: pd.Series, content: pd.Series) -> np.ndarray:
+    """Type/Content 문자열로 판별한 종류 (item_kind가 없는 예전 로그용)"""
+    has_stamp = content.str.contains(STAMP_PREFIX, regex=False)
+    has_coupon = content.str.contains(COUPON_PREFIX, regex=False)
+    is_reward = types.isin(REWARD_TYPES)
+
+    is_stamp = types.isin(STAMP_TYPES) | (is_reward & has_stamp)
+    is_coupon = types.isin(COUPON_GRANT_TYPES) | (is_reward & has_coupon & ~has_stamp)
+    is_used = types.isin(COUPON_USE_TYPES)
+    is_settlement = types.isin(SETTLEMENT_TYPES)
+    return np.select([is_stamp, is_coupon, is_used, is_settlement],
+                     ["stamp", "coupon", "coupon_used", "settlement"], default="")
+
+
+def _kinds(logs: pd.DataFrame, types: pd.Series, content: pd.Series) -> np.ndarray:
+    kind = _text_kind(types, content)
+    structured = _structured(logs, "item_kind")
+    if structured is not None:
+        kind = np.where(structured != "", structured, kind)
+    return kind
+
+
+def parse_logs(logs: pd.DataFrame) -> pd.DataFrame:
+    """장부 계산용 파싱 컬럼
+
+    item_kind/item_name/unit_price_at_grant 컬럼이 채워진 행은 그 값을 그대로 쓰고,
+    비어 있는 예전 행만 Type/Content 문자열에서 읽어냅니다.
+
+    Returns:
+        logs와 같은 인덱스의 DataFrame
+        - kind: "stamp" | "coupon" | "coupon_used" | "settlement" | ""
+        - item: 도장명/쿠폰명
+        - qty: 수량 (도장은 소수점 버림, 변환 불가는 NaN / 쿠폰은 빈 값을 1장으로)
+        - price: 지급 당시 도장 단가 (기록이 없으면 NaN)
+    """
+    if logs.empty:
+        return pd.DataFrame({"kind": pd.Series(dtype=object), "item": pd.Series(dtype=object),
+                             "qty": pd.Series(dtype=float), "price": pd.Series(dtype=float)},
+                            index=logs.index)
+
+    types = logs["Type"].astype(str) if "Type" in logs.columns else pd.Series("", index=logs.index)
+    content = logs["Content"].fillna("").astype(str) if "Content" in logs.columns \
+        else pd.Series("", index=logs.index)
+    reward = _rewards(logs)
+
+    kind = _kinds(logs, types, content)
+    is_stamp = kind == "stamp"
+    is_coupon = kind == "coupon"
+    is_used = kind == "coupon_used"
+
+    # 도장명: '도장:' 뒤 (없으면 Content 전체) / 쿠폰명: '쿠폰: ' 제거
+    stamp_item = _after_prefix(content, STAMP_PREFIX).fillna(content)
+    coupon_item = content.str.replace("쿠폰: ", "", regex=False).str.strip()
+    item = np.where(is_stamp, stamp_item, np.where(is_coupon | is_used, coupon_item, ""))
+    structured_item = _structured(logs, "item_name")
+    if structured_item is not None:
+        item = np.where(structured_item != "", structured_item, item)
+
+    # 도장은 int(float()) 처럼 버림, 쿠폰은 빈 값을 1장으로, 사용 수량은 절댓값
+    qty = np.where(is_stamp, np.trunc(reward), reward)
+    qty = np.where((is_coupon | is_used) & np.isnan(qty), 1, qty)
+    qty = np.where(is_used, np.abs(qty), qty)
+
+    price = (pd.to_numeric(logs["unit_price_at_grant"], errors="coerce").values
+             if "unit_price_at_grant" in logs.columns else np.full(len(logs), np.nan))
+
+    return pd.DataFrame({"kind": kind, "item": item, "qty": qty, "price": price}, index=logs.index)
+
+
+def stamp_money(stamp_rows: pd.DataFrame, resolver: StampPriceResolver) -> int:
+    """도장 행(parse_logs 결과)의 금액 합 (지급 당시 단가 우선, 없으면 현재 Settings 단가)"""
+    if stamp_rows.empty:
+        return 0
+    prices = stamp_rows["price"]
+    missing = prices.isna()
+    if missing.any():
+        prices = prices.where(~missing, resolver.price_series(stamp_rows.loc[missing, "item"]))
+    return int((stamp_rows["qty"] * prices).sum())
+
+
+def annotate_logs(logs: pd.DataFrame, resolver_for: Callable[[str], StampPriceResolver]) -> pd.DataFrame:
+    """item_kind/item_name/unit_price_at_grant 컬럼을 채운 사본
+
+    이미 채워진 값은 그대로 두고, 빈 칸만 Type/Content에서 읽어 채웁니다.
+    도장 단가는 행의 User별 조회기(resolver_for)의 현재 단가로 고정합니다.
+
+    Args:
+        logs: Logs 행 (새로 기록할 행 또는 예전 로그 전체)
+        resolver_for: User(아이 이름) -> 도장 단가 조회기
+    """
+    annotated = logs.copy()
+    if logs.empty:
+        for col in STRUCTURED_COLUMNS:
+            if col not in annotated.columns:
+                annotated[col] = pd.Series(dtype=object)
+        return annotated
+
+    parsed = parse_logs(logs)
+    annotated["item_kind"] = parsed["kind"].values
+    annotated["item_name"] = parsed["item"].values
+
+    is_stamp = (parsed["kind"] == "stamp").values
+    price = parsed["price"].copy()
+    unpriced = is_stamp & price.isna().values
+    if unpriced.any():
+        users = (logs["User"].astype(str) if "User" in logs.columns
+                 else pd.Series("", index=logs.index))[unpriced]
+        for user, items in parsed.loc[unpriced, "item"].groupby(users.values):
+            price.loc[items.index] = resolver_for(user).price_series(items)
+    annotated["unit_price_at_grant"] = pd.Series(
+        np.where(is_stamp, price.values, None), index=logs.index, dtype=object
+    ).map(lambda v: "" if v is None or pd.isna(v) else int(v))
+    return annotated
+
+
+def price_stamps(items: pd.Series, price_map: dict) -> pd.Series:
+    """도장명 컬럼의 단가 (price_map으로 만든 일회용 조회기 사용)"""
+    return StampPriceResolver(price_map).price_series(items)
+
+
+def coupon_balance(parsed: pd.DataFrame) -> pd.Series:
+    """쿠폰명별 보유 수량 (획득 합 - 사용 합, 0 미만은 0)"""
+    granted = parsed[parsed["kind"] == "coupon"].groupby("item")["qty"].sum()
+    used = parsed[parsed["kind"] == "coupon_used"].groupby("item")["qty"].sum()
+    balance = granted.sub(used.reindex(granted.index), fill_value=0).clip(lower=0)
+    return balance[balance > 0].astype(int)
+
+
+def coupon_inventory(logs: pd.DataFrame, parsed: Optional[pd.DataFrame] = None) -> CouponInventory:
+    """Logs의 쿠폰 보유 현황 (parsed가 있으면 다시 파싱하지 않음)"""
+    if logs is None or logs.empty:
+        return CouponInventory.empty()
+    return CouponInventory.from_parsed(logs, parse_logs(logs) if parsed is None else parsed)
+
+
+def _stamp_mask(logs: pd.DataFrame) -> np.ndarray:
+    """도장 로그 여부만 (parse_logs의 kind == "stamp"와 같은 조건, 항목명/수량은 읽지 않음)"""
+    types = logs["Type"].astype(str) if "Type" in logs.columns else pd.Series("", index=logs.index)
+    content = logs["Content"].fillna("").astype(str) if "Content" in logs.columns \
+        else pd.Series("", index=logs.index)
+    return _kinds(logs, types, content) == "stamp"
+
+
+def summarize(logs: pd.DataFrame, settings: pd.DataFrame, child_id: Optional[str] = None,
+              resolver: Optional[StampPriceResolver] = None,
+              checkpoint: Optional[Checkpoint] = None) -> WalletSummary:
+    """한 아이의 로그로 지갑 현황 계산
+
+    Args:
+        logs: 해당 아이의 Logs (기록 순서)
+        settings: Settings 프레임 (도장 단가)
+        child_id: 아이 id (target_child 전용 단가 적용, 없으면 'All' 단가만)
+        resolver: 단가 조회기 (없으면 settings/child_id로 공유 조회기를 가져옴)
+        checkpoint: 잔액 체크포인트. logs 안에서 log_id로 위치를 찾으면 그 뒤의 로그만 계산하고,
+            찾지 못하면(로그가 수정/삭제됨) 무시하고 처음부터 계산. logs는 체크포인트의
+            마지막 정산 로그부터만 담고 있어도 됨 (checkpoint.window_start)
+    """
+    if logs is None or logs.empty:
+        empty = pd.DataFrame(columns=["Type", "Content", "Reward", "Timestamp"])
+        return WalletSummary(0, 0, 0, empty, empty, CouponInventory.empty())
+
+    located = locate(checkpoint, logs)
+    if located is None:
+        checkpoint, located = empty_checkpoint(), (0, 0)
+    offset, since = located
+    tail_logs = logs.iloc[offset:]
+    parsed = parse_logs(tail_logs)
+
+    # 마지막 정산 이후 행만 용돈 계산 대상 (체크포인트 뒤에 정산이 없으면 체크포인트 값에 이어서)
+    settled = np.flatnonzero(parsed["kind"].values == "settlement")
+    if len(settled):
+        start, stamps, money = offset + settled[-1] + 1, 0, 0
+    else:
+        start, stamps, money = since, checkpoint.stamps, checkpoint.money
+    active_logs = logs.iloc[start:]
+    active = parsed.iloc[max(start - offset, 0):]
+
+    stamp_rows = active[(active["kind"] == "stamp") & active["qty"].notna()]
+    if resolver is None:
+        resolver = get_resolver(settings, child_id)
+    money += stamp_money(stamp_rows, resolver)
+    stamps += int(stamp_rows["qty"].sum())
+
+    inventory = CouponInventory.from_parsed(tail_logs, parsed, base_lots=checkpoint.lots)
+    # 체크포인트 이전의 미정산 구간은 도장 여부만 다시 판별
+    before = logs.iloc[start:max(offset, start)]
+    stamp_mask = np.concatenate([_stamp_mask(before), (active["kind"] == "stamp").values])
+    stamp_logs = active_logs[stamp_mask]
+    return WalletSummary(stamps, money, inventory.total, active_logs, stamp_logs, inventory)
+
+
+def carry_forward(logs: pd.DataFrame, resolver: StampPriceResolver,
+                  checkpoint: Optional[Checkpoint] = None) -> Checkpoint:
+    """checkpoint 뒤에 이어지는 logs를 반영한 새 체크포인트
+
+    summarize()와 같은 규칙으로 잔액만 계산합니다 (미정산 로그 목록은 만들지 않음).
+
+    Args:
+        logs: checkpoint 바로 다음 로그부터 (checkpoint가 없으면 그 아이의 로그 전체, 기록 순서)
+        resolver: 그 아이의 도장 단가 조회기
+        checkpoint: 이어서 계산할 체크포인트 (없으면 처음부터)
+    """
+    base = checkpoint or empty_checkpoint()
+    if logs is None or logs.empty:
+        return base
+
+    parsed = parse_logs(logs)
+    settled = np.flatnonzero(parsed["kind"].values == "settlement")
+    if len(settled):
+        since, since_at = log_ref(logs, settled[-1])
+        stamps, money = 0, 0
+        active = parsed.iloc[settled[-1] + 1:]
+    else:
+        since, since_at, stamps, money = base.since, base.since_at, base.stamps, base.money
+        active = parsed
+
+    stamp_rows = active[(active["kind"] == "stamp") & active["qty"].notna()]
+    inventory = CouponInventory.from_parsed(logs, parsed, base_lots=base.lots)
+    last_log, last_at = log_ref(logs, len(logs) - 1)
+    return Checkpoint(last_log, last_at, since, since_at, stamps + int(stamp_rows["qty"].sum()),
+                      money + stamp_money(stamp_rows, resolver), inventory.lots)
@@ -0,0 +1,156 @@
+"""도장 단가 조회기
+
+Settings의 도장 단가표(target_child별 덮어쓰기 포함)를 한 번 컴파일해
+접두어 트라이와 조회 결과 메모를 갖춘 조회기로 만듭니다.
+같은 Settings 내용과 아이에 대해서는 프로세스 안에서 조회기를 재사용하므로
+지갑, 칭찬, 오늘의 미션 페이지가 매 실행마다 단가표를 다시 만들지 않습니다.
+"""
+import threading
+from typing import List, Optional
+
+import pandas as pd
+
+
+# 설정에 없는 도장의 기본 단가
+DEFAULT_STAMP_PRICE = 100
+
+# 보관할 조회기 수 (Settings 버전 x 아이)
+_MAX_RESOLVERS = 32
+
+_TERMINAL = ""  # 트라이 노드에서 등록된 이름의 끝을 표시하는 키 (한 글자 키와 겹치지 않음)
+
+
+def _stamp_rows(settings: pd.DataFrame) -> pd.DataFrame:
+    if settings is None or settings.empty or "category" not in settings.columns:
+        return pd.DataFrame(columns=["item_name", "value", "target_child"])
+    stamps = settings[settings["category"] == "Stamp"]
+    target = (stamps["target_child"].fillna("All") if "target_child" in stamps.columns
+              else pd.Series("All", index=stamps.index))
+    return pd.DataFrame({
+        "item_name": stamps["item_name"].astype(str).str.strip() if "item_name" in stamps.columns
+        else pd.Series("", index=stamps.index),
+        "value": stamps["value"] if "value" in stamps.columns else pd.Series(None, index=stamps.index),
+        "target_child": target,
+    })
+
+
+def build_price_map(settings: pd.DataFrame, child_id: Optional[str] = None) -> dict:
+    """Settings의 도장 단가표 {도장명: 단가}
+
+    target_child가 'All'(또는 빈 값)인 항목을 먼저 넣고 child_id 전용 항목으로 덮어씁니다.
+    숫자가 아닌 단가는 건너뜁니다.
+    """
+    stamps = _stamp_rows(settings)
+    if stamps.empty:
+        return {}
+
+    target = stamps["target_child"]
+    values = pd.to_numeric(stamps["value"], errors="coerce")
+    names = stamps["item_name"]
+
+    scopes = [target == "All"] + ([target == child_id] if child_id else [])
+    price_map = {}
+    for scope in scopes:
+        valid = scope & values.notna()
+        price_map.update(zip(names[valid], values[valid].astype(int)))
+    return price_map
+
+
+class StampPriceResolver:
+    """도장명 -> 단가 조회기
+
+    조회 순서: 정확히 일치 -> '(' 앞부분 일치 -> 등록된 이름으로 시작 -> 기본값.
+    접두어 일치가 여러 개면 단가표에 먼저 등록된 이름을 씁니다.
+    접두어 검색은 트라이를 한 번 내려가는 것으로 끝나고(등록된 도장 수와 무관),
+    한 번 조회한 이름은 메모해 두었다가 그대로 돌려줍니다.
+
+    Args:
+        price_map: {도장명: 단가} (build_price_map 결과)
+        options: 선택 목록에 보여줄 도장명 (Settings 순서)
+    """
+
+    def __init__(self, price_map: dict, options: Optional[List[str]] = None):
+        self.price_map = dict(price_map)
+        self.options = list(options) if options is not None else list(self.price_map)
+        self._memo = {}
+        self._trie = {}
+        for rank, (name, price) in enumerate(self.price_map.items()):
+            node = self._trie
+            for ch in name:
+                node = node.setdefault(ch, {})
+            node.setdefault(_TERMINAL, (rank, price))
+
+    @classmethod
+    def from_settings(cls, settings: pd.DataFrame, child_id: Optional[str] = None) -> "StampPriceResolver":
+        stamps = _stamp_rows(settings)
+        scope = stamps["target_child"] == "All"
+        if child_id:
+            scope = scope | (stamps["target_child"] == child_id)
+        names = [n for n in stamps.loc[scope, "item_name"] if n != ""]
+        return cls(build_price_map(settings, child_id), options=list(dict.fromkeys(names)))
+
+    def _first_prefix(self, candidate: str) -> Optional[int]:
+        best = None
+        node = self._trie
+        for ch in candidate:
+            node = node.get(ch)
+            if node is None:
+                break
+            hit = node.get(_TERMINAL)
+            if hit is not None and (best is None or hit[0] < best[0]):
+                best = hit
+        return None if best is None else best[1]
+
+    def _resolve(self, candidate: str) -> int:
+        if candidate in self.price_map:
+            return self.price_map[candidate]
+        base = candidate.split("(", 1)[0].strip()
+        if base in self.price_map:
+            return self.price_map[base]
+        price = self._first_prefix(candidate)
+        return DEFAULT_STAMP_PRICE if price is None else price
+
+    def price(self, candidate: str) -> int:
+        """도장명 하나의 단가"""
+        try:
+            return self._memo[candidate]
+        except KeyError:
+            price = self._memo[candidate] = self._resolve(candidate)
+            return price
+
+    def price_series(self, items: pd.Series) -> pd.Series:
+        """도장명 컬럼의 단가 (서로 다른 이름마다 한 번만 조회해 결합)"""
+        if items.empty:
+            return pd.Series(dtype=float, index=items.index)
+        return items.map({name: self.price(name) for name in pd.unique(items)})
+
+
+_resolvers = {}
+_resolvers_lock = threading.Lock()
+
+
+def _settings_key(settings: pd.DataFrame) -> int:
+    """도장 단가에 영향을 주는 Settings 내용의 지문"""
+    stamps = _stamp_rows(settings)
+    if stamps.empty:
+        return 0
+    hashed = pd.util.hash_pandas_object(stamps.astype(str), index=False)
+    return hash((len(stamps), hashed.values.tobytes()))
+
+
+def get_resolver(settings: pd.DataFrame, child_id: Optional[str] = None) -> StampPriceResolver:
+    """Settings 내용과 아이별로 공유되는 조회기
+
+    Settings가 바뀌면(도장 행의 내용이 달라지면) 새로 컴파일합니다.
+    """
+    key = (_settings_key(settings), child_id or None)
+    with _resolvers_lock:
+        resolver = _resolvers.get(key)
+    if resolver is not None:
+        return resolver
+
+    resolver = StampPriceResolver.from_settings(settings, child_id)
+    with _resolvers_lock:
+        if len(_resolvers) >= _MAX_RESOLVERS:
+            _resolvers.clear()
+        return _resolvers.setdefault(key, resolver)
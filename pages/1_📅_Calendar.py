@@ -8,7 +8,7 @@ import modules.auth_utils as auth_utils
 import modules.ui_components as ui_components
 
 # 페이지 초기화
-initialize_page("주간 시간표", "📅")
+initialize_page("주간 시간표", "📅", worksheets=["WeeklySchedule"])
 
 st.title("📅 주간 시간표 (Weekly Schedule)")
 
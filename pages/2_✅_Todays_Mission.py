@@ -7,12 +7,13 @@ from modules.page_utils import initialize_page
 import modules.time_utils as time_utils
 import modules.auth_utils as auth_utils
 import modules.ui_components as ui_components
+import modules.wallet as wallet
 
 # 미션 모듈
-from modules.mission import MissionGenerator, MissionManager, RewardHandler, ui_helpers
+from modules.mission import MissionManager, RewardHandler, ui_helpers, scheduler as mission_scheduler
 
 # 페이지 초기화
-initialize_page("오늘의 미션", "✅")
+initialize_page("오늘의 미션", "✅", worksheets=["Missions", "MissionDefinitions", "Settings", "Logs"])
 
 # Custom CSS for smaller button text
 st.markdown("""
@@ -34,7 +35,6 @@ user_role = st.session_state.get("role", "user")
 st.title("✅ 오늘의 미션")
 
 # 미션 인스턴스 생성
-mission_gen = MissionGenerator()
 mission_mgr = MissionManager()
 reward_handler = RewardHandler()
 
@@ -42,8 +42,8 @@ reward_handler = RewardHandler()
 status_map, status_map_inv = ui_helpers.get_status_maps()
 approval_map = ui_helpers.get_approval_request_maps()
 
-# 자동 미션 생성
-mission_gen.ensure_todays_missions(target_child_id)
+# 자동 미션 생성 (스케줄러가 자정에 모든 자녀 분을 만들어 두므로 보통은 날짜 확인만 함)
+mission_scheduler.ensure_todays_missions()
 
 # Fetch Data
 try:
@@ -136,8 +136,7 @@ if current_tab == "✅ 오늘의 미션":
             # Save button
             if st.button("💾 승인 요청 저장", type="primary", width="content"):
                 # Check which missions changed from 미요청 to 요청
-                changes = 0
-                all_missions = db_manager.get_missions(assignee=None)
+                changes = {}
                 
                 for idx, row in edited_missions.iterrows():
                     mission_id = row['mission_id']
@@ -155,17 +154,14 @@ if current_tab == "✅ 오늘의 미션":
                     # Allow for both Assigned and Rejected missions
                     if edited_approval == '요청' and original_approval == '미요청' and original_status in ['Assigned', 'Rejected']:
                         # Update to Pending
-                        mission_idx = all_missions[all_missions['mission_id'] == mission_id].index
-                        if not mission_idx.empty:
-                            all_missions.loc[mission_idx, 'status'] = 'Pending'
-                            # Clear rejection reason when re-requesting
-                            if original_status == 'Rejected':
-                                all_missions.loc[mission_idx, 'rejection_reason'] = ''
-                            changes += 1
+                        changes[mission_id] = {'status': 'Pending'}
+                        # Clear rejection reason when re-requesting
+                        if original_status == 'Rejected':
+                            changes[mission_id]['rejection_reason'] = ''
                 
-                if changes > 0:
-                    if db_manager.update_data("Missions", all_missions):
-                        st.toast(f"✅ {changes}개 미션의 승인 요청이 전송되었습니다! 🙏")
+                if changes:
+                    if db_manager.update_by_id("Missions", changes):
+                        st.toast(f"✅ {len(changes)}개 미션의 승인 요청이 전송되었습니다! 🙏")
                         time.sleep(0.5)
                         st.rerun()
                     else:
@@ -228,16 +224,7 @@ if current_tab == "✅ 오늘의 미션":
         with st.container(border=True):
             col_r1, col_r2, col_r3 = st.columns([1, 1, 1])
             with col_r1:
-                stamps = settings_df[settings_df['category'] == 'Stamp'].copy()
-                # Robust filtering
-                if not stamps.empty and 'target_child' in stamps.columns:
-                     # Check if target_child is All or matches ID
-                     # Handle NaN as 'All'
-                     stamps['target_child'] = stamps['target_child'].fillna('All')
-                     mask = stamps['target_child'].isin(['All', target_child_id])
-                     stamps = stamps[mask]
-                
-                s_opts = stamps['item_name'].tolist() if not stamps.empty else ["참 잘했어요"]
+                s_opts = wallet.get_resolver(settings_df, target_child_id).options or ["참 잘했어요"]
                 # 기본값: '참 잘했어요(S)' 찾기
                 default_stamp_idx = 0
                 for i, opt in enumerate(s_opts):
@@ -423,10 +410,13 @@ if current_tab == "📜 이력 관리":
     # 1. Mission History (Moved from Tab 1)
     st.subheader("✅ 미션 승인/반려 이력")
     
-    history_mask = missions_df['status'].isin(['Approved', 'Rejected']) # Use total df but filter
-    # missions_df is filtered by assignee initially at top: db_manager.get_missions(assignee=target_child_id)
-    # So this history is only for current child. Correct.
-    history_df = missions_df[history_mask].copy()
+    # Recent history lives in Missions (editable); older months are read from the monthly shards
+    history_df, archived_df = mission_mgr.get_history(target_child_id)
+    history_df = history_df.copy()
+    archived_df = archived_df.copy()
+    
+    if not archived_df.empty:
+        archived_df["상태"] = archived_df["status"].map(status_map)
     
     if not history_df.empty:
         history_df["상태"] = history_df["status"].map(status_map)
@@ -455,25 +445,20 @@ if current_tab == "📜 이력 관리":
                     original_ids = history_df['mission_id'].tolist()
                     deleted_ids = set(original_ids) - set(current_ids)
                     
-                    all_raw = db_manager.get_missions(assignee=None)
-                    
-                    # Handle Deletions
-                    if deleted_ids:
-                        all_raw = all_raw[~all_raw['mission_id'].isin(deleted_ids)]
-                    
                     # Handle Updates
+                    changes = {}
                     for r in edited_history.to_dict('records'):
-                        mid = r['mission_id']
                         kor_s = r['상태']
-                        reas = r['rejection_reason']
                         eng_s = status_map_inv.get(kor_s, "Pending")
-                        
-                        idx = all_raw[all_raw['mission_id'] == mid].index
-                        if not idx.empty:
-                            all_raw.loc[idx[0], 'status'] = eng_s
-                            all_raw.loc[idx[0], 'rejection_reason'] = reas
-        
-                    return db_manager.update_data("Missions", all_raw)
+                        changes[r['mission_id']] = {'status': eng_s, 'rejection_reason': r['rejection_reason']}
+                    
+                    # Updates and deletions go out as one write
+                    with db_manager.batch() as batch:
+                        if changes:
+                            db_manager.update_by_id("Missions", changes)
+                        if deleted_ids:
+                            db_manager.delete_by_id("Missions", deleted_ids)
+                    return batch.ok
 
                 ui_components.handle_submission(save_history_action, success_msg="미션 이력이 저장되었습니다.")
         else:
@@ -489,8 +474,22 @@ if current_tab == "📜 이력 관리":
                 width="stretch",
                 hide_index=True
             )
-    else:
+    elif archived_df.empty:
         st.info("미션 이력이 없습니다.")
+    
+    if not archived_df.empty:
+        with st.expander(f"🗄️ 지난 미션 이력 ({len(archived_df)}건, 보관됨)"):
+            st.dataframe(
+                archived_df[["date", "title", "상태", "rejection_reason"]],
+                column_config={
+                    "date": "날짜",
+                    "title": "미션 내용",
+                    "상태": "결과",
+                    "rejection_reason": "비고"
+                },
+                width="stretch",
+                hide_index=True
+            )
 
     st.divider()
 
@@ -513,41 +512,15 @@ if current_tab == "📜 이력 관리":
         reward_logs = logs_df[reward_mask].copy()
         
         if not reward_logs.empty:
-            # We need editable logs. 
-            # Logs don't have unique ID usually? 
-            # Looking at db_manager.log_activity: Timestamp, User, Type, Content, Reward.
-            # No Log ID. 
-            # Without Log ID, editing is RISKY (duplicates might be ambiguous).
-            # But we must support deletion/edit as requested.
-            # We can use Index if we fetch ALL logs and then map back by index? 
-            # Better: Generate a temp ID or relying on index relative to full DF is hard if we filter.
-            # Workaround: Editing works best if we bring Full Logs, Filter in UI, then Re-merge.
-            # But 'data_editor' needs to return specific changed rows.
-            
-            # Strategy:
-            # 1. Fetch ALL logs for EVERYONE (raw).
-            # 2. Add an original index column to track them.
-            # 3. Filter for current view (Current Child + Reward Type).
-            # 4. Show editor.
-            # 5. On Save:
-            #    a. Reconstruct Full Logs.
-            #    b. Update rows that match original index.
-            #    c. Delete rows whose original index is missing in editor.
-            
-            full_logs_raw = db_manager.get_logs(user_id=None)
-            # Add explicit index if not default
-            full_logs_raw = full_logs_raw.reset_index(drop=True)
-            full_logs_raw['__id'] = full_logs_raw.index
-            
-            # Filter for View
-            view_mask = (full_logs_raw['User'] == target_child_name) & (full_logs_raw['Type'].isin(['Mission', 'Coupon']))
-            view_df = full_logs_raw[view_mask].copy()
+            # Each log row carries a stable log_id; edits/deletes are saved by id,
+            # so only the touched rows are written back. Archived months are read-only.
+            view_df, archived_logs = db_manager.get_logs_for_edit(target_child_name, ['Mission', 'Coupon'])
             
             if user_role == 'admin':
                 edited_rewards = st.data_editor(
-                    view_df[["__id", "Timestamp", "Type", "Content", "Reward"]].reset_index(drop=True),
+                    view_df[["log_id", "Timestamp", "Type", "Content", "Reward"]].reset_index(drop=True),
                     column_config={
-                        "__id": None, # Hidden ID
+                        "log_id": None, # Hidden ID
                         "Timestamp": st.column_config.TextColumn("일시", disabled=True),
                         "Type": st.column_config.SelectboxColumn("구분", options=["Mission", "Coupon"], disabled=True),
                         "Content": st.column_config.TextColumn("내용"),
@@ -561,22 +534,7 @@ if current_tab == "📜 이력 관리":
                 
                 if st.button("💾 보상 이력 저장", type="primary"):
                     def save_logs_action():
-                        # 1. Identify rows to keep/update
-                        df_others = full_logs_raw[~view_mask]
-                        df_updated_subset = edited_rewards.copy()
-                        
-                        # CRITICAL: Restore User column (lost during data_editor)
-                        df_updated_subset['User'] = target_child_name
-                        
-                        if "__id" in df_updated_subset.columns: del df_updated_subset["__id"]
-                        if "__id" in df_others.columns: del df_others["__id"]
-                            
-                        final_logs = pd.concat([df_others, df_updated_subset], ignore_index=True)
-                        
-                        try: final_logs = final_logs.sort_values(by="Timestamp", ascending=True)
-                        except: pass
-                        
-                        return db_manager.update_logs(final_logs)
+                        return db_manager.save_log_edits(view_df, edited_rewards, target_child_name, "Mission")
 
                     ui_components.handle_submission(save_logs_action, success_msg="보상 이력이 저장되었습니다.")
             else:
@@ -593,6 +551,20 @@ if current_tab == "📜 이력 관리":
                     hide_index=True
                 )
 
+            if not archived_logs.empty:
+                with st.expander(f"🗄️ 지난 보상 이력 ({len(archived_logs)}건, 보관됨)"):
+                    st.dataframe(
+                        archived_logs[["Timestamp", "Type", "Content", "Reward"]],
+                        column_config={
+                            "Timestamp": "일시",
+                            "Type": "구분",
+                            "Content": "내용",
+                            "Reward": "수량"
+                        },
+                        width="stretch",
+                        hide_index=True
+                    )
+
         else:
             st.info("보상 지급 이력이 없습니다.")
     else:
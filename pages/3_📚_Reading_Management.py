@@ -8,7 +8,7 @@ import modules.auth_utils as auth_utils
 import modules.ui_components as ui_components
 
 # 페이지 초기화
-initialize_page("독서 관리", "📚")
+initialize_page("독서 관리", "📚", worksheets=["Reading"])
 
 # Resolve Target Child ID (Centralized)
 target_id = auth_utils.get_target_child_id()
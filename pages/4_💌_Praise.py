@@ -5,9 +5,10 @@ from modules.db_manager import db_manager
 from modules.page_utils import initialize_page
 import modules.auth_utils as auth_utils
 import modules.ui_components as ui_components
+import modules.wallet as wallet
 
 # 페이지 초기화
-initialize_page("칭찬합니다", "💌")
+initialize_page("칭찬합니다", "💌", worksheets=["Praise", "Settings", "Logs"])
 
 # Resolve Target Child ID (Centralized)
 target_id = auth_utils.get_target_child_id()
@@ -25,26 +26,11 @@ except Exception as e:
     st.stop()
 
 # --- Load Settings for Reward Options ---
+# Stamps available to this child (target_child 'All' or target_id), from the shared price resolver
 try:
-    df_settings = db_manager.get_settings()
-    # Filter for Stamps only
-    if not df_settings.empty and "category" in df_settings.columns:
-        # Filter Logic: Category='Stamp' AND (target_child='All' OR target_child=target_id)
-        # Note: target_id comes from auth_utils, user_name comes from logs.
-        # But settings.target_child stores ID (e.g. 'son1') ideally.
-        # Let's verify 'All' handling.
-        # Ensure target_child column exists
-        if "target_child" not in df_settings.columns:
-             df_settings["target_child"] = "All"
-             
-        mask = (df_settings["category"] == "Stamp") & \
-               ((df_settings["target_child"].fillna("All") == "All") | (df_settings["target_child"] == target_id))
-        
-        stamp_options = df_settings[mask]["item_name"].tolist()
-        stamp_options = [s for s in stamp_options if str(s).strip() != ""]
-    else:
-        stamp_options = []
-except:
+    stamp_resolver = wallet.get_resolver(db_manager.get_settings(), target_id)
+    stamp_options = stamp_resolver.options
+except Exception:
     stamp_options = []
 
 # Sorting Logic & Migration
@@ -126,7 +112,7 @@ if current_tab == "👑 칭찬 승인/확인":
                     
                     # 2. Iterate and Update
                     changes = 0
-                    rewards_issued = 0
+                    reward_logs = []
                     new_records = edited_praise.to_dict('records')
                     
                     for r in new_records:
@@ -150,15 +136,19 @@ if current_tab == "👑 칭찬 승인/확인":
                                     # Issue Reward Log
                                     reward_val = 1
                                     
-                                    # 2. Log Activity
+                                    # 2. Queue Log Activity (appended in one request below)
                                     # Note: target_id is the child.
-                                    db_manager.log_activity(
-                                        user_name=target_child_name, 
-                                        activity_type="Praise", 
-                                        content=f"도장: {selected_reward} (칭찬: {r['content'][:10]}...)", 
-                                        reward=reward_val
-                                    )
-                                    rewards_issued += 1
+                                    reward_logs.append({
+                                        "user_name": target_child_name, 
+                                        "activity_type": "Praise", 
+                                        "content": f"도장: {selected_reward} (칭찬: {r['content'][:10]}...)", 
+                                        "reward": reward_val,
+                                        "item_kind": "stamp",
+                                        "item_name": selected_reward
+                                    })
+                    
+                    if reward_logs:
+                        db_manager.log_activities(reward_logs)
                     
                     if changes > 0:
                         return db_manager.update_data("Praise", all_praises)
@@ -258,15 +248,12 @@ if current_tab == "👑 칭찬 승인/확인":
                 # Admin: Editable view
                 st.caption("승인 시 지급된 도장(Praise Type) 이력을 직접 수정하거나 취소할 수 있습니다.")
                 
-                all_logs_raw = all_logs_raw.reset_index(drop=True)
-                all_logs_raw['__id'] = all_logs_raw.index
-                reward_mask = (all_logs_raw['User'] == target_child_name) & (all_logs_raw['Type'] == 'Praise')
-                reward_logs_view = all_logs_raw[reward_mask].copy()
+                reward_logs_view, archived_rewards = db_manager.get_logs_for_edit(target_child_name, ['Praise'])
                 
                 edited_rewards = st.data_editor(
-                    reward_logs_view[["__id", "Timestamp", "Content", "Reward"]].reset_index(drop=True),
+                    reward_logs_view[["log_id", "Timestamp", "Content", "Reward"]].reset_index(drop=True),
                     column_config={
-                        "__id": None,
+                        "log_id": None,
                         "Timestamp": st.column_config.TextColumn("일시", disabled=True),
                         "Content": st.column_config.TextColumn("내용 (보상명)"),
                         "Reward": st.column_config.NumberColumn("보상 (개수)")
@@ -279,31 +266,24 @@ if current_tab == "👑 칭찬 승인/확인":
                 
                 if st.button("💾 보상 이력 저장", key="save_reward_logs_admin"):
                     def save_rewards_action():
-                        df_others = all_logs_raw[~reward_mask]
-                        original_ids = reward_logs_view['__id'].tolist()
-                        current_ids = edited_rewards['__id'].dropna().astype(int).tolist()
-                        ids_to_delete = set(original_ids) - set(current_ids)
-                        
-                        all_logs_final = all_logs_raw.copy()
-                        if ids_to_delete:
-                            all_logs_final = all_logs_final[~all_logs_final['__id'].isin(ids_to_delete)]
-                        
-                        for _, row in edited_rewards.iterrows():
-                            if pd.notna(row['__id']):
-                                rid = int(row['__id'])
-                                if rid in all_logs_final['__id'].values:
-                                    idx_map = all_logs_final.index[all_logs_final['__id'] == rid].tolist()
-                                    if idx_map:
-                                        real_idx = idx_map[0]
-                                        all_logs_final.at[real_idx, 'Content'] = row['Content']
-                                        all_logs_final.at[real_idx, 'Reward'] = row['Reward']
-                        
-                        if "__id" in all_logs_final.columns:
-                            del all_logs_final["__id"]
-                        
-                        return db_manager.update_logs(all_logs_final)
+                        # Changed/removed/added rows are saved by log_id
+                        return db_manager.save_log_edits(reward_logs_view, edited_rewards, target_child_name, "Praise")
                     
                     ui_components.handle_submission(save_rewards_action, success_msg="보상 이력이 수정되었습니다!")
+
+                if not archived_rewards.empty:
+                    # Archived months (monthly shards) are read-only
+                    with st.expander(f"🗄️ 지난 보상 이력 ({len(archived_rewards)}건, 보관됨)"):
+                        st.dataframe(
+                            archived_rewards[["Timestamp", "Content", "Reward"]],
+                            column_config={
+                                "Timestamp": "일시",
+                                "Content": "내용 (보상명)",
+                                "Reward": "보상 (개수)"
+                            },
+                            hide_index=True,
+                            width="stretch"
+                        )
             else:
                 # Child: Read-only view
                 st.dataframe(
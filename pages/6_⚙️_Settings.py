@@ -5,7 +5,7 @@ from modules.page_utils import initialize_page
 import modules.auth_utils as auth_utils
 
 # 페이지 초기화
-initialize_page("설정 관리", "⚙️")
+initialize_page("설정 관리", "⚙️", worksheets=["Settings"])
     
 st.title("⚙️ 설정 (Settings)")
 
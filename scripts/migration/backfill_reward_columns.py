@@ -0,0 +1,91 @@
+"""Logs 구조화 보상 컬럼 채우기 (1회성)
+
+item_kind / item_name / unit_price_at_grant 가 비어 있는 예전 로그를
+Type/Content 문자열에서 읽어 채웁니다. 도장 단가는 현재 Settings 단가로 고정되므로,
+이후 Settings를 바꿔도 지난 용돈 계산은 달라지지 않습니다.
+보관된 월별 샤드(Logs_YYYYMM)도 Partitions 목록을 따라 함께 채웁니다.
+이미 값이 있는 행은 건드리지 않으므로 여러 번 실행해도 안전합니다.
+
+    python scripts/migration/backfill_reward_columns.py            # 변경 내용만 확인
+    python scripts/migration/backfill_reward_columns.py --apply    # 저장
+"""
+import argparse
+import os
+import sys
+
+# Force UTF-8 for Windows Console
+if sys.platform.startswith('win'):
+    sys.stdout.reconfigure(encoding='utf-8')
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from modules.db_manager import db_manager
+from modules.storage import partition
+from modules.storage.base import cell_str
+import modules.wallet as wallet
+
+
+def annotate(sheet):
+    """한 워크시트(Logs 또는 월별 샤드)의 (채운 사본, 바뀐 행 마스크). 비어 있으면 None"""
+    logs = db_manager.get_data(sheet, ttl=0)  # Force fresh read
+    if logs.empty:
+        return None
+    annotated = wallet.annotate_logs(logs, db_manager.get_stamp_resolver)
+    before = logs.reindex(columns=wallet.STRUCTURED_COLUMNS).apply(lambda col: col.map(cell_str))
+    after = annotated[wallet.STRUCTURED_COLUMNS].apply(lambda col: col.map(cell_str))  # 100.0 == 100
+    return annotated, (before != after).any(axis=1)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Logs에 item_kind/item_name/unit_price_at_grant를 채웁니다.")
+    parser.add_argument("--apply", action="store_true", help="변경 내용을 Logs에 저장 (없으면 미리보기만)")
+    args = parser.parse_args(argv)
+
+    print("=== Logs Backfill: 구조화 보상 컬럼 ===\n")
+    # 보관된 월별 샤드(Partitions 목록)와 현재 Logs를 모두 채웁니다
+    sheets = partition.shards_for(db_manager.get_partitions(), "Logs") + ["Logs"]
+    results = {}
+    for sheet in sheets:
+        result = annotate(sheet)
+        if result is not None:
+            results[sheet] = result
+    if not results:
+        print("[OK] Logs가 비어 있습니다.")
+        return 0
+
+    total = sum(len(annotated) for annotated, _ in results.values())
+    changed_total = sum(int(changed.sum()) for _, changed in results.values())
+    print(f"[1] 전체 {total}행 중 {changed_total}행을 채웁니다.")
+    if not changed_total:
+        print("[OK] 채울 행이 없습니다.")
+        return 0
+
+    for sheet, (annotated, changed) in results.items():
+        if not changed.any():
+            continue
+        print(f"\n  [{sheet}] {int(changed.sum())}행")
+        summary = annotated[changed].groupby("item_kind").size()
+        for kind, count in summary.items():
+            print(f"    - {kind or '(보상 아님)'}: {count}행")
+        preview = annotated.loc[changed, ["Timestamp", "User", "Content"] + wallet.STRUCTURED_COLUMNS].head(10)
+        print(preview.to_string(index=False))
+
+    if not args.apply:
+        print("\n[DRY RUN] --apply 옵션으로 저장하세요.")
+        return 0
+
+    print("\n[2] Logs 저장 중...")
+    with db_manager.batch() as batch:
+        for sheet, (annotated, changed) in results.items():
+            if changed.any():
+                db_manager.update_data(sheet, annotated)
+        db_manager.rebuild_balances()
+    if not batch.ok:
+        print("[ERROR] 저장 실패")
+        return 1
+    print("[OK] 완료 (Balances 표도 다시 계산했습니다).")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,71 @@
+"""지난 Logs/Missions를 월별 샤드로 옮기기
+
+Logs는 최근 달만 남기고 닫힌 달의 행을 "Logs_202609" 같은 월별 샤드로 옮깁니다.
+Missions는 최근 며칠(--hot-days)과 Pending 미션만 남기고 처리가 끝난 예전 미션을 옮깁니다.
+옮긴 샤드는 Partitions 워크시트에 기록되며, 날짜 범위를 준 조회는 필요한 샤드만 읽습니다.
+매일 또는 매주 한 번 실행하면 됩니다 (cron 등).
+
+    python scripts/tools/archive_partitions.py                    # 옮길 행만 확인
+    python scripts/tools/archive_partitions.py --apply            # 옮기기
+    python scripts/tools/archive_partitions.py --keep-months 2 --hot-days 14 --apply
+"""
+import argparse
+import os
+import sys
+
+# Force UTF-8 for Windows Console
+if sys.platform.startswith('win'):
+    sys.stdout.reconfigure(encoding='utf-8')
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from modules.db_manager import db_manager
+from modules.storage import partition
+import modules.time_utils as time_utils
+
+
+def main():
+    parser = argparse.ArgumentParser(description="닫힌 달의 Logs/Missions 행을 월별 샤드로 옮깁니다.")
+    parser.add_argument("--sheet", choices=sorted(partition.PARTITIONED_SHEETS), action="append",
+                        help="대상 워크시트 (여러 번 지정 가능, 기본: 전부)")
+    parser.add_argument("--keep-months", type=int, default=partition.DEFAULT_KEEP_MONTHS,
+                        help="현재 워크시트에 남길 달 수 (이번 달 포함, 기본: %(default)s)")
+    parser.add_argument("--hot-days", type=int, default=partition.MISSION_HOT_DAYS,
+                        help="Missions에 남길 최근 날짜 수 (오늘 포함, 기본: %(default)s)")
+    parser.add_argument("--apply", action="store_true", help="실제로 옮기기 (없으면 미리보기만)")
+    args = parser.parse_args()
+
+    today = time_utils.get_today_str()
+    print(f"=== 파티션 정리 (기준일 {today}, Logs 최근 {args.keep_months}개월 / "
+          f"Missions 최근 {args.hot_days}일 + Pending 유지) ===\n")
+    failed = False
+    for base in args.sheet or sorted(partition.PARTITIONED_SHEETS):
+        column = partition.PARTITIONED_SHEETS[base]
+        current = db_manager.get_data(base, ttl=0)  # Force fresh read
+        if base == "Missions":
+            cold = partition.cold_missions(current, today, args.hot_days)
+        else:
+            months = partition.closed_months(current, column, today, args.keep_months)
+            cold = partition.months_of(current[column]).isin(months) if months else None
+        if cold is None or not cold.any():
+            print(f"[{base}] 옮길 행이 없습니다.")
+            continue
+        counts = partition.months_of(current.loc[cold, column]).value_counts().sort_index()
+        for month, count in counts.items():
+            print(f"[{base}] {month}: {int(count)}행 -> {partition.shard_name(base, month)}")
+        if not args.apply:
+            continue
+        if base == "Missions":
+            shards = db_manager.archive_missions(hot_days=args.hot_days, today=today)
+        else:
+            shards = db_manager.archive_closed_months(base, keep_months=args.keep_months, today=today)
+        print(f"[{base}] {len(shards)}/{len(counts)}개 샤드에 옮겼습니다.")
+        failed |= len(shards) != len(counts)
+
+    if not args.apply:
+        print("\n[DRY RUN] --apply 옵션으로 옮기세요.")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,64 @@
+"""미션 생성 / 밀린 날 채우기 / 미리보기 (cron용)
+
+미션 정의가 있는 자녀들의 미션을 날짜 범위 단위로 한 번에 계산해 한 번의 append로 추가합니다.
+미션 id가 (정의, 날짜, 자녀)로 정해지고 쓰기 직전에 원격 Missions의 id를 다시 확인하므로
+여러 번 실행해도 이미 있는 미션은 다시 만들지 않습니다. 앱 서버의 스케줄러와 같은 순간에
+쓰면 같은 미션이 두 번 기록될 수 있지만 읽을 때는 하나만 보입니다 (modules/mission/scheduler.py 참고).
+
+    python scripts/tools/generate_missions.py                                  # 오늘 (KST)
+    python scripts/tools/generate_missions.py --date 2026-03-02 --until 2026-03-08   # 서버가 멈췄던 날 채우기
+    python scripts/tools/generate_missions.py --until 2026-03-31 --child son1 --preview  # 다가올 미션 미리보기
+
+    # crontab (서버 시간이 KST일 때 매일 자정)
+    0 0 * * * cd /path/to/app && python scripts/tools/generate_missions.py
+"""
+import argparse
+import os
+import sys
+
+# Force UTF-8 for Windows Console
+if sys.platform.startswith('win'):
+    sys.stdout.reconfigure(encoding='utf-8')
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from modules.mission import MissionGenerator, scheduler
+import modules.time_utils as time_utils
+
+
+def main():
+    parser = argparse.ArgumentParser(description="자녀들의 미션을 날짜 범위로 생성합니다.")
+    parser.add_argument("--date", default=None, help="시작 날짜 YYYY-MM-DD (기본: 오늘, KST)")
+    parser.add_argument("--until", default=None, help="마지막 날짜 YYYY-MM-DD (기본: 시작 날짜 하루)")
+    parser.add_argument("--child", action="append", help="대상 자녀 ID (여러 번 지정 가능, 기본: 전체)")
+    parser.add_argument("--preview", action="store_true", help="저장하지 않고 생성될 미션만 출력")
+    args = parser.parse_args()
+
+    start = args.date or time_utils.get_today_str()
+    end = args.until or start
+    print(f"=== 미션 생성 ({start} ~ {end}) ===\n")
+    generator = MissionGenerator()
+
+    if args.preview:
+        missions = generator.plan(children=args.child, start=start, end=end, skip_existing=True)
+        if missions.empty:
+            print("[OK] 새로 생성될 미션이 없습니다.")
+        else:
+            print(missions[["date", "assignee", "title"]].to_string(index=False))
+            print(f"\n[PREVIEW] {len(missions)}개 미션이 생성됩니다.")
+        return 0
+
+    if args.child is None and start == end:
+        # 하루 전체 생성은 스케줄러와 같은 경로 (오늘이면 프로세스 표시도 남김)
+        added = scheduler.run_daily_generation(start, force=True)
+    else:
+        added = generator.generate(children=args.child, start=start, end=end)
+    if added < 0:
+        print("[ERROR] 미션 생성 실패")
+        return 1
+    print(f"[OK] 새 미션 {added}개를 추가했습니다.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,50 @@
+"""Balances 표 점검/재계산
+
+Logs로 다시 계산한 아이별 잔액과 Balances 워크시트를 비교합니다.
+--rebuild를 주면 Logs 기준으로 Balances 표 전체를 다시 씁니다.
+
+    python scripts/tools/verify_balances.py            # 점검만
+    python scripts/tools/verify_balances.py --rebuild  # 어긋나면 재계산해서 저장
+"""
+import argparse
+import os
+import sys
+
+# Force UTF-8 for Windows Console
+if sys.platform.startswith('win'):
+    sys.stdout.reconfigure(encoding='utf-8')
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from modules.db_manager import db_manager
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Balances 표를 Logs와 대조합니다.")
+    parser.add_argument("--rebuild", action="store_true", help="어긋난 항목이 있으면 Logs로 다시 계산해 저장")
+    args = parser.parse_args()
+
+    print("=== Balances 점검 ===\n")
+    problems = db_manager.verify_balances()
+    if problems.empty:
+        print("[OK] 모든 잔액이 Logs와 일치합니다.")
+        return 0
+
+    print(f"[MISMATCH] {len(problems)}개 항목이 다릅니다:")
+    print(problems.to_string(index=False))
+
+    if not args.rebuild:
+        print("\n--rebuild 옵션으로 다시 계산할 수 있습니다.")
+        return 1
+
+    print("\n[REBUILD] Logs로 Balances 표를 다시 계산합니다...")
+    if not db_manager.rebuild_balances():
+        print("[ERROR] Balances 저장 실패")
+        return 1
+    remaining = db_manager.verify_balances()
+    print("[OK] 재계산 완료." if remaining.empty else f"[WARNING] 여전히 {len(remaining)}개 항목이 다릅니다.")
+    return 0 if remaining.empty else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -8,6 +8,12 @@ import pandas as pd
 sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
 
 import os
+# Run against the in-memory Google Sheets stand-in (no network, production data untouched).
+# Set STORAGE_BACKEND=sqlite (with SQLITE_PATH) for a local database file,
+# or STORAGE_BACKEND=gsheets to run against the real spreadsheet instead.
+os.environ.setdefault("STORAGE_BACKEND", "fake")
+os.environ.setdefault("SNAPSHOT_DIR", "")
+
 # Add parent dir to sys.path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
@@ -23,8 +29,20 @@ streamlit.secrets = {"connections": {"gsheets": {"spreadsheet": "dummy"}}} # Moc
 from modules.db_manager import db_manager
 from modules.logic_processor import logic
 
+def seed_local_storage():
+    """Give a local backend (in-memory spreadsheet or SQLite file) the worksheets the scenarios expect."""
+    if os.environ["STORAGE_BACKEND"] not in ("fake", "sqlite"):
+        return # Real spreadsheet
+    db_manager.update_data("Missions", pd.DataFrame(columns=["mission_id", "date", "assignee", "title", "status", "rejection_reason"]))
+    db_manager.update_data("Logs", pd.DataFrame(columns=["Timestamp", "User", "Type", "Content", "Reward"]))
+    db_manager.update_data("Settings", pd.DataFrame([
+        {"category": "Stamp", "item_name": "칭찬도장", "value": 100, "target_child": "All"},
+        {"category": "Coupon", "item_name": "게임 30분", "value": 30, "target_child": "All"},
+    ]))
+
 def run_test():
     print("🚀 [Self-Test] Starting Integration Test Sequence...")
+    seed_local_storage()
     
     # 0. Setup & Cleanup
     test_child = "son1"
@@ -1,6 +1,7 @@
 import sys
 import io
 import os
+import time
 import pandas as pd
 from datetime import datetime
 
@@ -8,10 +9,21 @@ from datetime import datetime
 sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
 sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8')
 
+# Run against the in-memory Google Sheets stand-in (no network, production data untouched).
+# Set STORAGE_BACKEND=gsheets to run against the real spreadsheet instead.
+os.environ.setdefault("STORAGE_BACKEND", "fake")
+os.environ.setdefault("SNAPSHOT_DIR", "")
+
 # Add project root to sys.path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
 from modules.db_manager import db_manager
+import modules.time_utils as time_utils
+
+def _backend_calls(*ops, manager=None):
+    """Backend calls of the given ops so far, from the metrics registry."""
+    calls = (manager or db_manager).metrics.to_dict()["calls"]
+    return sum(c["calls"] for c in calls if c["op"] in ops)
 
 def test_calendar():
     print("\n[Test] Calendar CRUD...")
@@ -52,7 +64,7 @@ def test_praise():
     df = db_manager.get_praise_logs()
     found = df[df["content"] == unique_content]
     assert not found.empty
-    assert found.iloc[0]["status"] == "Pending"
+    assert found.iloc[0]["status"] == "대기 중"
     print("  - Add Request Success")
     
     # Approve
@@ -74,6 +86,476 @@ def test_settings():
     assert df.iloc[0]["item_name"] == "TestItem"
     print("  - Update Success")
 
+def _shared_sheet_managers(governor=None, **worksheets):
+    """Two DataManagers (e.g. app + CLI) with their own caches over one fake spreadsheet."""
+    from modules.db_manager import DataManager
+    from modules.storage.fake_sheets import FakeSheetsConnection
+    from modules.storage.gsheets_backend import GSheetsBackend
+    from modules.storage.quota import QuotaGovernor
+    conn = FakeSheetsConnection()
+    for name, df in worksheets.items():
+        conn.seed(name, df)
+    managers = [DataManager(backend=GSheetsBackend(governor=governor or QuotaGovernor(), conn=conn))
+                for _ in range(2)]
+    return conn, managers
+
+def _retries():
+    return sum(c["retries"] for c in db_manager.metrics.to_dict()["calls"])
+
+def test_quota_retry():
+    print("\n[Test] Quota (429) Retry...")
+    # Own in-memory spreadsheet, so this runs whatever STORAGE_BACKEND the suite uses
+    conn, (app, _) = _shared_sheet_managers()
+    conn.retry_after = 0.01 # Keep the Retry-After pause short
+    retries_before = _retries()
+    conn.fail_with_quota(1)
+    assert app.add_calendar_event("2025-05-06", "Retry Event", "가족 전체", "가족행사")
+    assert _retries() == retries_before + 1
+    df = app.get_calendar()
+    assert not df[df["title"] == "Retry Event"].empty
+    print("  - Retry Success")
+
+def test_quota_accounting():
+    print("\n[Test] Quota Tokens Per API Request...")
+    from collections import Counter
+    from modules.storage.quota import QuotaGovernor
+
+    class CountingGovernor(QuotaGovernor):
+        def __init__(self):
+            super().__init__()
+            self.taken = Counter()
+
+        def acquire(self, kind, max_wait=60.0):
+            self.taken[kind] += 1
+            return super().acquire(kind, max_wait)
+
+    governor = CountingGovernor()
+    conn, (app, _) = _shared_sheet_managers(governor=governor)
+    assert app.add_calendar_event("2025-08-01", "첫 일정", "가족 전체", "가족행사")
+    assert app.add_calendar_event("2025-08-02", "둘째 일정", "가족 전체", "가족행사")
+    event_id = app.get_calendar().iloc[0]["event_id"]
+    assert app.update_calendar_event(event_id, "2025-08-01", "바뀐 일정", "가족 전체", "가족행사")
+    assert governor.taken["read"] == conn.calls["read"]
+    assert governor.taken["write"] == conn.calls["write"]
+    worksheet_lookups = conn.calls["read"]
+    assert app.add_calendar_event("2025-08-03", "셋째 일정", "가족 전체", "가족행사")
+    assert conn.calls["read"] == worksheet_lookups  # handle and header are reused
+    print("  - Every Request Charged Success")
+
+def _events(*titles):
+    return pd.DataFrame([{"event_id": f"e{i}", "date": "2025-08-01", "title": t, "member": "가족 전체",
+                          "type": "가족행사"} for i, t in enumerate(titles, 1)])
+
+def _wait_refresh(manager, name):
+    for _ in range(200):
+        if not manager.freshness(name)[name]["refreshing"]:
+            return
+        time.sleep(0.01)
+    raise AssertionError(f"refresh of {name} still running")
+
+def test_prefetch_one_request():
+    print("\n[Test] Prefetch In One Request...")
+    settings = pd.DataFrame([{"category": "Stamp", "item_name": "칭찬도장", "value": 100, "target_child": "All"}])
+    _, (app, _) = _shared_sheet_managers(Calendar=_events("일정1"), Settings=settings)
+    many, single = _backend_calls("read_many"), _backend_calls("read")
+    app.prefetch(["Calendar", "Settings"])
+    assert _backend_calls("read_many") == many + 1
+    assert len(app.get_calendar()) == 1 and len(app.get_settings()) == 1  # served from the cache
+    assert _backend_calls("read_many") == many + 1 and _backend_calls("read") == single
+    print("  - One read_many, Cached Reads Success")
+
+def test_stale_while_revalidate():
+    print("\n[Test] Stale-While-Revalidate / Hard TTL...")
+    conn, (app, cli) = _shared_sheet_managers(Calendar=_events("일정1"))
+    assert len(app.get_calendar()) == 1
+    assert cli.add_calendar_event("2025-08-02", "일정2", "가족 전체", "가족행사")
+    namespace = app.backend.namespace
+
+    # Older than the soft TTL: the cached frame comes back at once, a refresh is scheduled
+    app.cache.put(namespace, "Calendar", app.get_calendar(), loaded_at=time.time() - 400)
+    single = _backend_calls("read")
+    assert len(app.get_data("Calendar", ttl=300)) == 1
+    assert _backend_calls("read") == single  # not read in the caller's thread
+    _wait_refresh(app, "Calendar")
+    assert len(app.get_data("Calendar", ttl=300)) == 2
+    print("  - Stale Served, Refreshed In Background Success")
+
+    # Older than HARD_TTL: the read blocks on the backend
+    assert cli.add_calendar_event("2025-08-03", "일정3", "가족 전체", "가족행사")
+    app.cache.put(namespace, "Calendar", app.get_calendar(), loaded_at=time.time() - app.HARD_TTL - 10)
+    single = _backend_calls("read")
+    assert len(app.get_data("Calendar", ttl=300)) == 3
+    assert _backend_calls("read") == single + 1
+    print("  - Hard TTL Blocks Success")
+
+def test_batch_coalescing():
+    print("\n[Test] Batched Writes...")
+    conn, (app, _) = _shared_sheet_managers(Calendar=_events("일정1"))
+    assert len(app.get_calendar()) == 1
+    writes = _backend_calls("write", "append", "apply_delta")
+    with app.batch() as batch:
+        for i in range(5):
+            assert app.add_calendar_event("2025-08-02", f"배치{i}", "가족 전체", "가족행사")
+        assert len(app.get_calendar()) == 6  # reads inside the block see the queued rows
+        assert len(conn.read("Calendar")) == 1  # nothing sent yet
+    assert batch.ok
+    assert _backend_calls("write", "append", "apply_delta") == writes + 1
+    assert len(conn.read("Calendar")) == 6
+    print("  - N Writes, One Backend Call Success")
+
+    # Writes made before an exception are still flushed (as they would be without a batch)
+    writes = _backend_calls("write", "append", "apply_delta")
+    try:
+        with app.batch():
+            assert app.add_calendar_event("2025-08-03", "예외 전", "가족 전체", "가족행사")
+            raise ValueError("boom")
+    except ValueError:
+        pass
+    assert _backend_calls("write", "append", "apply_delta") == writes + 1
+    assert "예외 전" in conn.read("Calendar")["title"].tolist()
+    assert app._current_batch() is None
+    print("  - Flushed On Exception Success")
+
+def test_metrics_counters():
+    print("\n[Test] Metrics Counters...")
+    _, (app, _) = _shared_sheet_managers(Calendar=_events("일정1"))
+
+    def cache_counts():
+        rows = [c for c in app.metrics.to_dict()["cache"] if c["worksheet"] == "Calendar"]
+        return {k: sum(c[k] for c in rows) for k in ("hit", "stale", "miss")}
+
+    reads, counts = _backend_calls("read"), cache_counts()
+    app.get_calendar()
+    assert _backend_calls("read") == reads + 1 and cache_counts()["miss"] == counts["miss"] + 1
+    app.get_calendar()
+    assert _backend_calls("read") == reads + 1 and cache_counts()["hit"] == counts["hit"] + 1
+
+    writes = _backend_calls("write", "append", "apply_delta")
+    assert app.add_calendar_event("2025-08-02", "일정2", "가족 전체", "가족행사")
+    assert _backend_calls("write", "append", "apply_delta") == writes + 1
+    recent = app.metrics.to_dict()["recent"][-1]
+    assert recent["worksheet"] == "Calendar" and recent["rows"] == 1 and recent["error"] is None
+    print("  - Call/Cache Counters Success")
+
+def test_revision_in_same_request():
+    print("\n[Test] Change Marker Rides With The Write...")
+    conn, (app, other) = _shared_sheet_managers()
+    assert app.add_calendar_event("2025-09-01", "첫 일정", "가족 전체", "가족행사")  # creates marker row
+    writes = conn.calls["write"]
+    assert app.add_calendar_event("2025-09-02", "둘째 일정", "가족 전체", "가족행사")
+    assert conn.calls["write"] == writes + 1
+    event_id = app.get_calendar().iloc[0]["event_id"]
+    assert app.update_calendar_event(event_id, "2025-09-01", "바뀐 일정", "가족 전체", "가족행사")
+    assert conn.calls["write"] == writes + 2
+    marker = app.backend.last_written_revision("Calendar")
+    assert marker and other.backend.revisions(["Calendar"]) == {"Calendar": marker}
+    print("  - One Write Request Per Change Success")
+
+def test_concurrent_delta():
+    print("\n[Test] Delta Writes After Another Writer...")
+    events = pd.DataFrame([{"event_id": f"e{i}", "date": "2025-07-0" + str(i), "title": f"일정{i}",
+                            "member": "가족 전체", "type": "가족행사"} for i in (1, 2, 3)])
+    conn, (app, cli) = _shared_sheet_managers(Calendar=events)
+    assert len(app.get_calendar()) == 3 and len(cli.get_calendar()) == 3
+
+    assert cli.delete_calendar_event("e1")  # app's snapshot still has e1 on top
+    assert app.update_calendar_event("e2", "2025-07-02", "바뀐 일정", "가족 전체", "가족행사")
+    sheet = conn.read("Calendar").set_index("event_id")
+    assert list(sheet.index) == ["e2", "e3"]
+    assert sheet.loc["e2", "title"] == "바뀐 일정" and sheet.loc["e3", "title"] == "일정3"
+    assert app.get_calendar()["event_id"].tolist() == ["e2", "e3"]  # refetched, not the stale view
+    print("  - Rows Located By Id Success")
+
+    assert cli.delete_calendar_event("e3")
+    assert app.update_calendar_event("e3", "2025-07-03", "지워진 일정", "가족 전체", "가족행사")
+    assert "바뀐 일정" in conn.read("Calendar")["title"].tolist()  # full rewrite, no misplaced cells
+    print("  - Stale Snapshot Fallback Success")
+
+def test_user_dict_revalidation():
+    print("\n[Test] Credentials Revalidated Across Processes...")
+    users = pd.DataFrame([{"username": "dad", "name": "아빠", "password": "old-hash", "email": "", "role": "admin"}])
+    conn, (app, cli) = _shared_sheet_managers(Users=users)
+    assert app.get_user_dict()["usernames"]["dad"]["password"] == "old-hash"
+    assert cli.update_user_password("dad", "new-hash")
+    assert app.get_data("Users").iloc[0]["password"] == "old-hash"  # plain cached read still old
+    assert app.get_user_dict()["usernames"]["dad"]["password"] == "new-hash"
+    print("  - Password Change Seen Success")
+
+def test_concurrent_insert():
+    print("\n[Test] Insert-If-Absent Across Processes...")
+    missions = [{"mission_id": f"m{i}", "date": time_utils.get_today_str(), "assignee": "race_child",
+                 "title": f"미션{i}", "status": "Assigned", "rejection_reason": ""} for i in (1, 2)]
+    conn, (app, cron) = _shared_sheet_managers(Missions=pd.DataFrame(columns=list(missions[0])))
+    assert app.get_missions().empty and cron.get_missions().empty  # both caches: no missions yet
+
+    assert app.insert_missing("Missions", missions) == 2
+    assert cron.insert_missing("Missions", missions) == 0  # its cached view was stale
+    assert conn.read("Missions")["mission_id"].tolist() == ["m1", "m2"]
+    print("  - Fresh Id Check Success")
+
+    # Both appended before seeing each other: the doubled id is read once
+    assert app.append_rows("Missions", [{**missions[0], "status": "Approved"}])
+    assert app.update_by_id("Missions", {"m1": {"status": "Pending"}})
+    assert len(conn.read("Missions")) == 3
+    cron.get_data("Missions", ttl=0)
+    seen = cron.get_missions(assignee="race_child")
+    assert seen["mission_id"].tolist() == ["m1", "m2"] and seen.iloc[0]["status"] == "Pending"
+    print("  - Duplicate Read Once Success")
+
+def test_empty_worksheet_cache():
+    print("\n[Test] Empty/Missing Worksheets Are Cached...")
+    conn, (app, _) = _shared_sheet_managers()
+    for _ in range(5):
+        assert app.get_data("Balances").empty  # not created yet
+    assert conn.calls["read"] == 1
+    assert not app.backend.use_fallback
+    print("  - One Read, No Fallback Success")
+
+def test_snapshot_persistence():
+    print("\n[Test] Debounced Snapshots Without Credentials...")
+    import tempfile
+    from modules.storage import SnapshotStore, WorksheetCache
+    with tempfile.TemporaryDirectory() as directory:
+        store = SnapshotStore(directory, save_delay=60)
+        cache = WorksheetCache(store=store)
+        cache.put("ns", "Users", pd.DataFrame([{"username": "dad", "password": "$2b$12$hash"}]))
+        for i in range(20):  # e.g. one append per log_activity
+            cache.put("ns", "Logs", pd.DataFrame({"log_id": [str(n) for n in range(i + 1)]}))
+        assert os.listdir(directory) == []  # nothing written per change
+        store.flush()
+        restored = store.load_all("ns")
+        assert list(restored) == ["Logs"] and len(restored["Logs"][0]) == 20
+        assert len(os.listdir(directory)) == 1
+    print("  - One Write Per Worksheet, Users Kept Off Disk Success")
+
+def test_log_edits():
+    print("\n[Test] Keyed Log Edits...")
+    user = "EditTester"
+    assert db_manager.log_activity(user, "Praise", "정리정돈", 2)
+    assert db_manager.log_activity(user, "Praise", "숙제", 1)
+    view, archived = db_manager.get_logs_for_edit(user, ["Praise"])
+    assert view["log_id"].notna().all() and view["log_id"].is_unique and archived.empty
+
+    edited = view[["log_id", "Timestamp", "Content", "Reward"]].reset_index(drop=True)
+    edited.loc[0, "Reward"] = 5
+    edited = edited.drop(index=1)
+    edited.loc[len(edited) + 1] = [None, None, "설거지", 3]
+    assert db_manager.save_log_edits(view, edited, user, "Praise")
+
+    after, _ = db_manager.get_logs_for_edit(user, ["Praise"])
+    assert sorted(after["Content"]) == ["설거지", "정리정돈"]
+    assert after.loc[after["log_id"] == view["log_id"].iloc[0], "Reward"].astype(int).item() == 5
+    assert int(float(db_manager.get_balance(user)["stamps"])) == 8
+    print("  - Edit/Delete/Add Success")
+
+def test_partitions():
+    print("\n[Test] Monthly Partitions...")
+    user = "ArchiveTester"
+    old_rows = []
+    for ts in ["2025-01-05 10:00:00", "2025-02-07 10:00:00"]:
+        row = db_manager._new_log_row(user, "Praise", "지난 칭찬", 1)
+        row["Timestamp"] = ts
+        old_rows.append(row)
+    assert db_manager.append_rows("Logs", old_rows)
+    assert db_manager.log_activity(user, "Praise", "오늘 칭찬", 1)
+    before = db_manager.get_logs(user_id=user)
+
+    shards = db_manager.archive_closed_months("Logs")
+    assert "Logs_202501" in shards and "Logs_202502" in shards
+    current = db_manager.get_data("Logs")
+    assert not current["Timestamp"].astype(str).str.startswith("2025-0").any()
+    assert db_manager.get_logs(user_id=user)["log_id"].tolist() == before["log_id"].tolist()
+    january = db_manager.get_logs(user_id=user, date_range=("2025-01-01", "2025-01-31"))
+    assert january["Content"].tolist() == ["지난 칭찬"]
+
+    # History editors: current rows stay editable, archived months come back read-only
+    legacy = db_manager._new_log_row(user, "Praise", "아이디 없는 칭찬", 1)
+    legacy["log_id"] = ""
+    assert db_manager.append_rows("Logs", [legacy])
+    writes = _backend_calls("write", "append", "apply_delta")
+    editable, archived = db_manager.get_logs_for_edit(user, ["Praise"])
+    assert _backend_calls("write", "append", "apply_delta") == writes  # reading writes nothing
+    assert editable["Content"].tolist() == ["오늘 칭찬"]
+    assert archived["Content"].tolist() == ["지난 칭찬", "지난 칭찬", "아이디 없는 칭찬"]
+    assert db_manager.rebuild_balances(users=[user])  # write path: the id-less row gets an id
+    editable, archived = db_manager.get_logs_for_edit(user, ["Praise"])
+    assert editable["Content"].tolist() == ["오늘 칭찬", "아이디 없는 칭찬"] and len(archived) == 2
+    print("  - Archive/Range Read Success")
+
+def test_backfill_shards():
+    print("\n[Test] Reward Column Backfill Covers Shards...")
+    import importlib.util
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "scripts", "migration",
+                        "backfill_reward_columns.py")
+    spec = importlib.util.spec_from_file_location("backfill_reward_columns", path)
+    backfill = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(backfill)
+
+    user = "BackfillTester"
+    rows = []
+    for ts in ["2025-03-05 10:00:00", time_utils.get_current_time_str()]:
+        row = db_manager._new_log_row(user, "Praise", "도장: 칭찬도장", 2)
+        row["Timestamp"] = ts
+        rows.append(row)  # written as before the structured columns existed (blank)
+    assert db_manager.append_rows("Logs", rows)
+    assert "Logs_202503" in db_manager.archive_closed_months("Logs")
+
+    assert backfill.main(["--apply"]) == 0
+    for sheet in ["Logs_202503", "Logs"]:
+        mine = db_manager.get_data(sheet, ttl=0)
+        mine = mine[mine["User"] == user]
+        assert len(mine) == 1 and mine["item_kind"].tolist() == ["stamp"], (sheet, mine)
+    assert db_manager.verify_balances().empty
+    print("  - Shard And Current Partition Annotated Success")
+
+def test_wallet_window():
+    print("\n[Test] Wallet Reads Balances Since Settlement...")
+    from modules.logic_processor import logic
+    import modules.wallet as wallet
+    user = "WindowTester"
+    old = db_manager._new_log_row(user, "Praise", "도장: 칭찬도장", 3)
+    old["Timestamp"] = "2025-01-05 10:00:00"
+    assert db_manager.append_rows("Logs", [old])
+    db_manager.archive_closed_months("Logs")
+    assert db_manager.log_activity(user, "Settlement", "용돈 정산 지급", 300)
+    assert db_manager.log_activity(user, "Praise", "도장: 칭찬도장", 2)
+
+    ranges = []
+    get_logs = db_manager.get_logs
+    db_manager.get_logs = lambda user_id=None, date_range=None: (
+        ranges.append(date_range) or get_logs(user_id=user_id, date_range=date_range))
+    try:
+        summary = logic.get_wallet(user)
+    finally:
+        del db_manager.get_logs
+    assert ranges == [(time_utils.get_today_str(), None)], ranges
+    full = wallet.summarize(db_manager.get_logs(user_id=user), db_manager.get_settings())
+    assert (summary.stamps, summary.money) == (full.stamps, full.money) == (2, full.money)
+    assert summary.stamp_logs["Content"].tolist() == ["도장: 칭찬도장"]
+    assert logic.calculate_assets(user) == (full.money, 0)
+    assert db_manager.verify_balances().empty
+    print("  - Tail Read Success")
+
+def test_mission_hot_cold():
+    print("\n[Test] Missions Hot/Cold Split...")
+    import uuid
+    missions = db_manager.get_missions()
+    old = [{"mission_id": str(uuid.uuid4()), "date": "2025-03-0" + str(day), "assignee": "cold_child",
+            "title": "지난 미션", "status": status, "rejection_reason": ""}
+           for day, status in [(1, "Approved"), (2, "Pending")]]
+    assert db_manager.update_data("Missions", pd.concat([missions, pd.DataFrame(old)], ignore_index=True))
+
+    assert "Missions_202503" in db_manager.archive_missions()
+    active = db_manager.get_missions(assignee="cold_child")
+    assert active["status"].tolist() == ["Pending"]
+    assert db_manager.get_missions(status="Pending", assignee="cold_child")["date"].tolist() == ["2025-03-02"]
+    archived = db_manager.get_missions(assignee="cold_child", date="2025-03-01")
+    assert archived["status"].tolist() == ["Approved"]
+    print("  - Archive/Query Success")
+
+def test_mission_history():
+    print("\n[Test] Mission History Across Shards...")
+    import uuid
+    from modules.mission import MissionManager
+    recent = {"mission_id": str(uuid.uuid4()), "date": time_utils.get_today_str(), "assignee": "cold_child",
+              "title": "오늘 미션", "status": "Rejected", "rejection_reason": "다시"}
+    assert db_manager.append_rows("Missions", [recent])
+
+    # cold_child's 2025-03-01 Approved mission was archived by test_mission_hot_cold
+    editable, archived = MissionManager().get_history("cold_child")
+    assert editable["mission_id"].tolist() == [recent["mission_id"]]
+    assert archived["date"].tolist() == ["2025-03-01"] and archived["status"].tolist() == ["Approved"]
+    assert "Pending" not in set(editable["status"]) | set(archived["status"])
+    print("  - Archived History Success")
+
+def test_id_lookup():
+    print("\n[Test] Id Lookups...")
+    assert db_manager.add_calendar_event("2025-06-01", "Lookup Event", "가족 전체", "가족행사")
+    df = db_manager.get_calendar()
+    event_id = df[df["title"] == "Lookup Event"].iloc[0]["event_id"]
+
+    _, first = db_manager._indexed("Calendar")
+    _, again = db_manager._indexed("Calendar")
+    assert first is again  # reused until the worksheet changes
+
+    assert db_manager.update_by_id("Calendar", {event_id: {"title": "Lookup Event 2"}})
+    rows = db_manager.get_rows_by_id("Calendar", [event_id, "missing-id"])
+    assert list(rows.index) == [str(event_id)] and rows.iloc[0]["title"] == "Lookup Event 2"
+    assert not db_manager.update_by_id("Calendar", {"missing-id": {"title": "x"}})
+    assert db_manager.delete_by_id("Calendar", [event_id])
+    assert db_manager.get_rows_by_id("Calendar", [event_id]).empty
+    print("  - Update/Delete By Id Success")
+
+def test_mission_generation():
+    print("\n[Test] Idempotent Mission Generation...")
+    from modules.mission.mission_generator import MissionGenerator
+    child = "gen_child"
+    assert db_manager.add_mission_definition("양치하기", "Routine", "월,화,수,목,금,토,일", child)
+    generator = MissionGenerator()
+    generator.ensure_todays_missions(child)
+    first = db_manager.get_missions(assignee=child)
+    assert len(first) == 1
+
+    db_manager.update_by_id("Missions", {first.iloc[0]["mission_id"]: {"status": "Approved"}})
+    generator.ensure_todays_missions(child)  # another session
+    again = db_manager.get_missions(assignee=child)
+    assert again["mission_id"].tolist() == first["mission_id"].tolist()
+    assert again.iloc[0]["status"] == "Approved"
+    print("  - No Duplicates Success")
+
+def test_daily_generation():
+    print("\n[Test] Daily Generation For All Children...")
+    from modules.mission import scheduler
+    assert db_manager.add_mission_definition("일기 쓰기", "Routine", "월,화,수,목,금,토,일", "gen_child2")
+    assert scheduler.run_daily_generation() >= 1
+    assert scheduler.generated_for() == time_utils.get_today_str()
+    assert scheduler.run_daily_generation() == 0  # marker: nothing to do
+    assert scheduler.run_daily_generation(force=True) == 0  # ids already there
+    assert len(db_manager.get_missions(assignee="gen_child2")) == 1
+    assert 0 <= scheduler.seconds_until_midnight() <= 24 * 3600
+    print("  - Marker/Idempotency Success")
+
+def test_bulk_generation():
+    print("\n[Test] Bulk Generation / Backfill...")
+    from modules.mission import MissionGenerator
+    assert db_manager.add_mission_definition("수영", "Routine", "화,목", "bulk_child1")
+    assert db_manager.add_mission_definition("피아노", "Routine", "월,화,수,목,금,토,일", "bulk_child2")
+    generator = MissionGenerator()
+    children = ["bulk_child1", "bulk_child2"]
+    # 2026-03-02(월) ~ 2026-03-08(일): 수영 2일 + 피아노 7일
+    preview = generator.plan(children=children, start="2026-03-02", end="2026-03-08")
+    assert len(preview) == 9
+    assert db_manager.get_missions(assignee=children, date_range=("2026-03-02", "2026-03-08")).empty
+    print("  - Preview Success")
+    assert generator.generate(children=children, start="2026-03-02", end="2026-03-08") == 9
+    assert generator.generate(children=children, start="2026-03-01", end="2026-03-08") == 1  # 03-01 피아노만
+    assert len(generator.plan(children=children, start="2026-03-01", end="2026-03-08")) == 10  # candidates; ids are checked on write
+    assert generator.plan(children=children, start="2026-03-01", end="2026-03-08", skip_existing=True).empty
+    assert len(db_manager.get_missions(assignee="bulk_child1", date_range=("2026-03-01", "2026-03-08"))) == 2
+    print("  - Backfill/Idempotency Success")
+
+def test_generation_two_processes():
+    print("\n[Test] Scheduler Thread And Cron On One Sheet...")
+    from modules.mission import MissionGenerator
+    from modules.mission.mission_generator import MISSION_COLUMNS
+    today = time_utils.get_today_str()
+    defs = pd.DataFrame([{"def_id": f"d{i}", "title": title, "type": "Routine", "frequency": "월,화,수,목,금,토,일",
+                          "assignee": "dup_child", "active": True, "note": ""}
+                         for i, title in enumerate(["줄넘기", "책 읽기"])])
+    conn, (app, cron) = _shared_sheet_managers(MissionDefinitions=defs, Missions=pd.DataFrame(columns=MISSION_COLUMNS))
+    scheduler_side, cron_side = MissionGenerator(db=app), MissionGenerator(db=cron)
+    assert app.get_missions().empty and cron.get_missions().empty  # both planned against an empty sheet
+
+    assert scheduler_side.generate_for_all(today) == 2
+    first = app.get_missions()["mission_id"].tolist()
+    assert app.update_by_id("Missions", {first[0]: {"status": "Pending"}})
+    assert cron_side.generate_for_all(today) == 0
+    assert scheduler_side.generate_for_all(today) == 0
+
+    sheet = conn.read("Missions")
+    assert sheet["mission_id"].tolist() == first and sheet.iloc[0]["status"] == "Pending"
+    print("  - One Set Of Missions Success")
+
 if __name__ == "__main__":
     print("🚀 Starting New Features Test...")
     try:
@@ -81,6 +563,29 @@ if __name__ == "__main__":
         test_reading()
         test_praise()
         test_settings()
+        test_quota_retry()
+        test_quota_accounting()
+        test_prefetch_one_request()
+        test_stale_while_revalidate()
+        test_batch_coalescing()
+        test_metrics_counters()
+        test_revision_in_same_request()
+        test_concurrent_delta()
+        test_user_dict_revalidation()
+        test_concurrent_insert()
+        test_empty_worksheet_cache()
+        test_snapshot_persistence()
+        test_log_edits()
+        test_partitions()
+        test_backfill_shards()
+        test_wallet_window()
+        test_mission_hot_cold()
+        test_mission_history()
+        test_id_lookup()
+        test_mission_generation()
+        test_daily_generation()
+        test_bulk_generation()
+        test_generation_two_processes()
         print("\n✅ All New Features Verified!")
     except Exception as e:
         print(f"\n❌ Test Failed: {e}")
@@ -0,0 +1,85 @@
+import sys
+import io
+import os
+import tempfile
+import pandas as pd
+
+# Force UTF-8 encoding for stdout/stderr
+sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8')
+
+# The module-level db_manager singleton stays offline; the tests below use their own SQLite manager
+os.environ.setdefault("STORAGE_BACKEND", "fake")
+os.environ.setdefault("SNAPSHOT_DIR", "")
+
+# Add project root to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from modules.db_manager import DataManager
+from modules.storage.sqlite_backend import SQLiteBackend
+
+# A throwaway database file; the DataManager only talks to it through the backend API
+DB_PATH = os.path.join(tempfile.mkdtemp(prefix="sqlite_backend_test_"), "family_mission.db")
+manager = DataManager(backend=SQLiteBackend(DB_PATH, key_columns=DataManager.WORKSHEET_KEYS))
+
+def stored(worksheet_name):
+    """What is actually in the database, bypassing the DataManager cache."""
+    return SQLiteBackend(DB_PATH, key_columns=DataManager.WORKSHEET_KEYS).read(worksheet_name)
+
+def test_read_and_select():
+    print("\n[Test] Read / Filtered Select...")
+    events = pd.DataFrame([{"event_id": f"e{i}", "date": f"2025-07-0{i}", "title": f"일정{i}",
+                            "member": "아빠" if i % 2 else "가족 전체", "type": "가족행사"} for i in (1, 2, 3)])
+    assert manager.update_data("Calendar", events)
+    assert manager.get_calendar()["event_id"].tolist() == ["e1", "e2", "e3"]
+    assert manager._select("Calendar", member="아빠")["event_id"].tolist() == ["e1", "e3"]
+    assert manager._select("Calendar", event_id=["e2", "e3"], member="아빠")["event_id"].tolist() == ["e3"]
+    assert manager._select("Missing").empty
+    print("  - Read/Select Success")
+
+def test_append():
+    print("\n[Test] Append...")
+    assert manager.add_calendar_event("2025-07-04", "추가 일정", "가족 전체", "가족행사")
+    assert stored("Calendar")["title"].tolist() == ["일정1", "일정2", "일정3", "추가 일정"]
+    assert manager.get_calendar()["title"].iloc[-1] == "추가 일정"
+    print("  - Append Success")
+
+def test_keyed_update_delete():
+    print("\n[Test] Keyed Update / Delete...")
+    assert manager.update_by_id("Calendar", {"e2": {"title": "바뀐 일정"}})
+    assert manager.delete_by_id("Calendar", ["e1"])
+    sheet = stored("Calendar").set_index("event_id")
+    assert list(sheet.index[:2]) == ["e2", "e3"] and len(sheet) == 3
+    assert sheet.loc["e2", "title"] == "바뀐 일정" and sheet.loc["e3", "title"] == "일정3"
+    assert manager.get_calendar()["event_id"].tolist() == sheet.index.tolist()
+    print("  - Update/Delete By Id Success")
+
+def test_balances_upsert():
+    print("\n[Test] Balances Upsert...")
+    assert manager.log_activity("SqliteTester", "Praise", "도장: 칭찬도장", 2)
+    assert manager.log_activity("SqliteTester", "Praise", "도장: 칭찬도장", 1)
+    assert manager.log_activity("OtherTester", "Praise", "도장: 칭찬도장", 4)
+    balances = stored("Balances")
+    assert sorted(balances["User"]) == ["OtherTester", "SqliteTester"]  # one row per child
+    assert int(float(manager.get_balance("SqliteTester")["stamps"])) == 3
+    assert int(float(balances.set_index("User").loc["OtherTester", "stamps"])) == 4
+
+    assert manager._upsert_rows("Balances", "User", [{"User": "SqliteTester", "stamps": 9}])
+    balances = stored("Balances").set_index("User")
+    assert len(balances) == 2 and int(float(balances.loc["SqliteTester", "stamps"])) == 9
+    assert manager.rebuild_balances()
+    assert manager.verify_balances().empty
+    print("  - Upsert/Rebuild Success")
+
+if __name__ == "__main__":
+    print("🚀 Starting SQLite Backend Test...")
+    try:
+        test_read_and_select()
+        test_append()
+        test_keyed_update_delete()
+        test_balances_upsert()
+        print("\n✅ SQLite Backend Verified!")
+    except Exception as e:
+        print(f"\n❌ Test Failed: {e}")
+        import traceback
+        traceback.print_exc()
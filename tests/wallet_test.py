@@ -0,0 +1,231 @@
+import sys
+import io
+import os
+import time
+import pandas as pd
+
+# Force UTF-8 encoding for stdout
+sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+
+# Add project root to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import modules.wallet as wallet
+
+SETTINGS = pd.DataFrame([
+    {"category": "Stamp", "item_name": "참 잘했어요", "value": 600, "target_child": "All"},
+    {"category": "Stamp", "item_name": "칭찬도장", "value": 100, "target_child": None},
+    {"category": "Stamp", "item_name": "칭찬도장", "value": 200, "target_child": "son2"},
+    {"category": "Coupon", "item_name": "게임쿠폰 20분", "value": 20, "target_child": "All"},
+])
+
+def make_logs(rows):
+    return pd.DataFrame(rows, columns=["Timestamp", "User", "Type", "Content", "Reward"])
+
+def test_summary():
+    print("\n[Test] Wallet Summary...")
+    logs = make_logs([
+        ["2026-01-01 09:00:00", "큰보물", "Mission", "도장: 참 잘했어요", 1],
+        ["2026-01-02 09:00:00", "큰보물", "Settlement", "용돈 정산 지급", 600],
+        ["2026-01-03 09:00:00", "큰보물", "Mission", "도장: 참 잘했어요", 2],
+        ["2026-01-03 10:00:00", "큰보물", "Praise", "도장: 칭찬도장 (칭찬: 동생을 도와...)", 1],
+        ["2026-01-03 11:00:00", "큰보물", "Mission", "도장: 모르는 도장", "1,000"],
+        ["2026-01-03 12:00:00", "큰보물", "Mission", "도장: 참 잘했어요", "abc"],
+        ["2026-01-04 09:00:00", "큰보물", "Coupon", "쿠폰: 게임쿠폰 20분", 3],
+        ["2026-01-04 10:00:00", "큰보물", "CouponUsed", "쿠폰: 게임쿠폰 20분", -2],
+        ["2026-01-04 11:00:00", "큰보물", "CouponUsed", "쿠폰: 없는쿠폰", -1],
+    ])
+    summary = wallet.summarize(logs, SETTINGS, child_id="son1")
+    # 2*600 + 1*100 + 1000*100 (unknown stamp -> default 100); the unparsable row is skipped
+    assert summary.stamps == 1003, summary.stamps
+    assert summary.money == 1200 + 100 + 100000, summary.money
+    assert summary.coupons == 1, summary.coupons
+    assert len(summary.active_logs) == 7
+    print("  - Totals Success")
+
+    # Child-specific price overrides the 'All' price
+    assert wallet.summarize(logs, SETTINGS, child_id="son2").money == 1200 + 200 + 100000
+    print("  - Child Override Success")
+
+    empty = wallet.summarize(make_logs([]), SETTINGS)
+    assert (empty.stamps, empty.money, empty.coupons) == (0, 0, 0)
+    print("  - Empty Success")
+
+def test_resolver():
+    print("\n[Test] Stamp Price Resolver...")
+    resolver = wallet.get_resolver(SETTINGS, "son2")
+    assert resolver.price("칭찬도장") == 200
+    assert resolver.price("칭찬도장 (칭찬: 숙제)") == 200      # text before '('
+    assert resolver.price("참 잘했어요!!") == 600              # registered prefix
+    assert resolver.price("모르는 도장") == wallet.DEFAULT_STAMP_PRICE
+    assert resolver.options == ["참 잘했어요", "칭찬도장"]
+    print("  - Lookup Success")
+
+    # Same Settings content -> same compiled resolver; changed prices -> rebuilt
+    assert wallet.get_resolver(SETTINGS.copy(), "son2") is resolver
+    changed = SETTINGS.copy()
+    changed.loc[0, "value"] = 700
+    assert wallet.get_resolver(changed, "son2").price("참 잘했어요") == 700
+    print("  - Settings Version Success")
+
+    # When several registered names are prefixes, the first registered one wins
+    first = wallet.StampPriceResolver({"참": 1, "참 잘": 2})
+    assert first.price("참 잘했어요 (S)") == 1
+    print("  - Prefix Order Success")
+
+def test_coupon_inventory():
+    print("\n[Test] Coupon Inventory (FIFO)...")
+    logs = make_logs([
+        ["2026-01-05 09:00:00", "큰보물", "Coupon", "쿠폰: 게임쿠폰 20분", 2],
+        ["2026-01-01 09:00:00", "큰보물", "Coupon", "쿠폰: 게임쿠폰 20분", 1],
+        ["2026-01-03 09:00:00", "큰보물", "Coupon", "쿠폰: TV 30분", ""],
+        ["2026-01-06 09:00:00", "큰보물", "CouponUsed", "쿠폰: 게임쿠폰 20분", -2],
+    ])
+    inventory = wallet.summarize(logs, SETTINGS).inventory
+    # The two oldest 게임쿠폰 (01-01 x1, then one of 01-05) were used
+    assert inventory.lots.values.tolist() == [
+        ["TV 30분", "2026-01-03 09:00:00", 1],
+        ["게임쿠폰 20분", "2026-01-05 09:00:00", 1],
+    ], inventory.lots.values.tolist()
+    assert inventory.total == 2
+    assert inventory.minutes() == 50
+    assert inventory.minutes({"게임쿠폰 20분": 1}) == 20
+    rows = inventory.usage_rows("큰보물", {"게임쿠폰 20분": 1})
+    assert rows[0]["reward"] == -1 and rows[0]["content"] == "쿠폰: 게임쿠폰 20분"
+    try:
+        inventory.usage_rows("큰보물", {"게임쿠폰 20분": 2})
+        assert False, "over-redeem should fail"
+    except ValueError:
+        pass
+    print("  - FIFO Success")
+
+def test_checkpoint():
+    print("\n[Test] Balance Checkpoint...")
+    rows = []
+    for i in range(300):
+        day = f"2026-02-{i // 20 + 1:02d} {i % 20:02d}:00:00"
+        if i % 7 == 0:
+            rows.append([day, "큰보물", "Coupon", "쿠폰: 게임쿠폰 20분", 2])
+        elif i % 11 == 0:
+            rows.append([day, "큰보물", "CouponUsed", "쿠폰: 게임쿠폰 20분", -1])
+        elif i == 150:
+            rows.append([day, "큰보물", "Settlement", "용돈 정산 지급", 1000])
+        else:
+            rows.append([day, "큰보물", "Mission", "도장: 칭찬도장", 1])
+    logs = make_logs(rows).assign(log_id=[f"log-{i}" for i in range(len(rows))])
+    full = wallet.summarize(logs, SETTINGS, child_id="son2")
+
+    for cut in (100, 150, 151, 200, 300):
+        head = logs.iloc[:cut]
+        cp = wallet.carry_forward(head, wallet.get_resolver(SETTINGS, "son2"))
+        cp = wallet.balances.from_row(wallet.balances.to_row("큰보물", cp))
+        resumed = wallet.summarize(logs, SETTINGS, child_id="son2", checkpoint=cp)
+        assert (resumed.stamps, resumed.money, resumed.coupons) == (full.stamps, full.money, full.coupons), cut
+        assert resumed.inventory.lots.values.tolist() == full.inventory.lots.values.tolist(), cut
+        assert len(resumed.stamp_logs) == len(full.stamp_logs), cut
+    print("  - Resume Success")
+
+    # Only the logs since the checkpoint's settlement are needed
+    assert cp.since == "log-150" and wallet.checkpoint.window_start(cp) == "2026-02-08"
+    window = logs[logs["Timestamp"] >= wallet.checkpoint.window_start(cp)].reset_index(drop=True)
+    more = make_logs([["2026-02-16 09:00:00", "큰보물", "Mission", "도장: 칭찬도장", 1]]).assign(log_id="log-300")
+    extended = pd.concat([logs, more], ignore_index=True)
+    resumed = wallet.summarize(pd.concat([window, more], ignore_index=True), SETTINGS, child_id="son2",
+                               checkpoint=cp)
+    expected = wallet.summarize(extended, SETTINGS, child_id="son2")
+    assert (resumed.stamps, resumed.money, resumed.coupons) == (expected.stamps, expected.money, expected.coupons)
+    assert resumed.stamp_logs["log_id"].tolist() == expected.stamp_logs["log_id"].tolist()
+    print("  - Window Success")
+
+    # The checkpoint's last log was deleted -> checkpoint ignored
+    assert wallet.checkpoint.locate(cp, window.iloc[:-1]) is None
+    edited = logs.drop(index=len(logs) - 1).reset_index(drop=True)
+    stale = wallet.summarize(edited, SETTINGS, child_id="son2", checkpoint=cp)
+    assert stale.coupons == wallet.summarize(edited, SETTINGS, child_id="son2").coupons
+    print("  - Invalidation Success")
+
+def test_balances():
+    print("\n[Test] Incremental Balances...")
+    resolver = wallet.get_resolver(SETTINGS, "son1")
+    logs = make_logs([
+        ["2026-03-01 09:00:00", "큰보물", "Mission", "도장: 참 잘했어요", 1],
+        ["2026-03-01 10:00:00", "큰보물", "Coupon", "쿠폰: 게임쿠폰 20분", 2],
+        ["2026-03-02 09:00:00", "큰보물", "Settlement", "용돈 정산 지급", 600],
+        ["2026-03-02 10:00:00", "큰보물", "Praise", "도장: 칭찬도장", 2],
+        ["2026-03-03 09:00:00", "큰보물", "CouponUsed", "쿠폰: 게임쿠폰 20분", -1],
+    ]).assign(log_id=["b0", "b1", "b2", "b3", "b4"])
+    # Fold the logs in one row at a time, as log_activity does
+    row = None
+    for i in range(len(logs)):
+        row = wallet.balances.advance("큰보물", row, logs.iloc[:i], logs.iloc[i:i + 1], resolver)
+    full = wallet.summarize(logs, SETTINGS, child_id="son1")
+    assert (row["stamps"], row["money"], row["coupons"]) == (full.stamps, full.money, full.coupons), row
+    assert row == {**wallet.balances.rebuild("큰보물", logs, resolver), "Timestamp": row["Timestamp"]}
+    assert wallet.balances.verify(pd.DataFrame([row]), logs, lambda user: resolver).empty
+    print("  - Fold Success")
+
+    # Only the logs from the row's last log on are needed to fold new ones in
+    checkpoint = wallet.balances.from_row(row)
+    assert wallet.checkpoint.tail_start(checkpoint) == "2026-03-03"
+    more = make_logs([["2026-03-04 09:00:00", "큰보물", "Mission", "도장: 참 잘했어요", 1]]).assign(log_id="b5")
+    tail = logs[logs["Timestamp"] >= "2026-03-03"]
+    folded = wallet.balances.advance("큰보물", row, tail, more, resolver)
+    assert folded["money"] == full.money + 600 and folded["since"] == "b2" and folded["last_log"] == "b5"
+    print("  - Tail Fold Success")
+
+    # A row whose last log is gone cannot be folded; the caller rebuilds it
+    stale = {**row, "money": 1}
+    assert wallet.balances.advance("큰보물", stale, logs.iloc[:-1], more, resolver) is None
+    assert not wallet.balances.verify(pd.DataFrame([stale]), logs, lambda user: resolver).empty
+    print("  - Repair Success")
+
+def test_structured_columns():
+    print("\n[Test] Structured Reward Columns...")
+    logs = make_logs([
+        ["2026-04-01 09:00:00", "큰보물", "Praise", "도장: 칭찬도장 (칭찬: 설거지...)", 1],
+        ["2026-04-01 10:00:00", "큰보물", "Coupon", "쿠폰: 게임쿠폰 20분", 1],
+    ])
+    annotated = wallet.annotate_logs(logs, lambda user: wallet.get_resolver(SETTINGS, "son2"))
+    assert annotated["item_kind"].tolist() == ["stamp", "coupon"]
+    assert annotated["unit_price_at_grant"].tolist() == [200, ""]
+    print("  - Annotate Success")
+
+    # Prices stay at their grant-time value when Settings change later
+    repriced = SETTINGS.assign(value=1)
+    assert wallet.summarize(annotated, repriced, child_id="son2").money == 200
+    assert wallet.summarize(logs, repriced, child_id="son2").money == 1
+    print("  - Grant Price Success")
+
+def test_large_ledger():
+    print("\n[Test] Wallet Summary (50k logs)...")
+    rows = []
+    for i in range(50000):
+        if i % 10 == 0:
+            rows.append(["2026-01-01", "큰보물", "Coupon", "쿠폰: 게임쿠폰 20분", 1])
+        else:
+            rows.append(["2026-01-01", "큰보물", "Mission", f"도장: 참 잘했어요 ({i % 50})", 1])
+    logs = make_logs(rows)
+    started = time.perf_counter()
+    summary = wallet.summarize(logs, SETTINGS)
+    elapsed = time.perf_counter() - started
+    assert summary.stamps == 45000
+    assert summary.money == 45000 * 600
+    assert summary.coupons == 5000
+    assert summary.inventory.counts["게임쿠폰 20분"] == 5000
+    print(f"  - {elapsed * 1000:.0f}ms")
+
+if __name__ == "__main__":
+    print("🚀 Starting Wallet Test...")
+    try:
+        test_summary()
+        test_resolver()
+        test_coupon_inventory()
+        test_checkpoint()
+        test_balances()
+        test_structured_columns()
+        test_large_ledger()
+        print("\n✅ Wallet Verified!")
+    except Exception as e:
+        print(f"\n❌ Test Failed: {e}")
+        import traceback
+        traceback.print_exc()